@@ -6,14 +6,60 @@ Copyright (c) 2025 Brent Lefebure / EhkoLabs
 Initialize and manage the ReCog database.
 """
 
+import importlib.util
+import queue
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple, Union
 
 
 # Default database location
 DEFAULT_DB_NAME = "recog.db"
 
+# Pragmas applied when a database is first created. journal_mode and
+# page_size persist in the file; WAL lets readers run alongside a writer.
+INIT_PRAGMAS = (
+    "PRAGMA page_size=8192",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Generated module holding migration SQL as bytes constants (see embed_migrations)
+EMBEDDED_MIGRATIONS_FILE = "_embedded.py"
+
+# Newest migration that shipped before schema_migrations existed; databases
+# without tracking are only assumed to have run migrations up to this one
+LAST_UNTRACKED_MIGRATION = "migration_v0_10_extraction_runs.sql"
+
+# check_database splits exact counts across this many reader connections,
+# once there are enough tables to make the extra connections worthwhile
+CHECK_COUNT_WORKERS = 4
+CHECK_PARALLEL_MIN_TABLES = 16
+
+# Tables counted per UNION ALL query; SQLite rejects compound SELECTs with
+# more than 500 terms (SQLITE_MAX_COMPOUND_SELECT)
+CHECK_COUNT_BATCH_SIZE = 200
+
+# Default number of pooled connections held open by the server
+DEFAULT_POOL_SIZE = 4
+
+# Per-connection prepared statement cache size for pooled connections
+POOL_CACHED_STATEMENTS = 256
+
+# Pragmas applied to every pooled connection
+POOL_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+)
+
 
 def get_schema_path() -> Path:
     """Get path to the schema SQL file."""
@@ -25,45 +71,220 @@ def get_migrations_dir() -> Path:
     return Path(__file__).parent / "migrations"
 
 
+def _migration_sort_key(name: str) -> tuple:
+    """
+    Order migrations by version number rather than by filename.
+
+    migration_v0_10_x.sql must run after migration_v0_9_x.sql, which a
+    plain string sort gets wrong.
+    """
+    version = []
+    for part in Path(name).stem[len("migration_v"):].split("_"):
+        if not part.isdigit():
+            break
+        version.append(int(part))
+    return (tuple(version), name)
+
+
+def _load_embedded_migrations(migrations_dir: Path) -> Optional[list]:
+    """Load MIGRATIONS from the generated module, if one has been built."""
+    embedded_path = migrations_dir / EMBEDDED_MIGRATIONS_FILE
+    if not embedded_path.exists():
+        return None
+    
+    spec = importlib.util.spec_from_file_location("recog_embedded_migrations", embedded_path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+        return list(module.MIGRATIONS)
+    except Exception as e:
+        print(f"Warning: Ignoring embedded migrations ({e})")
+        return None
+
+
+def discover_migrations(migrations_dir: Optional[Path] = None) -> List[Tuple[str, Union[bytes, Path]]]:
+    """
+    List migrations in the order they must run.
+    
+    Uses the embedded module produced by `python db.py embed` when present
+    (no per-file stat/read at startup), otherwise globs migration_v*.sql.
+    
+    Args:
+        migrations_dir: Directory to search (defaults to get_migrations_dir())
+        
+    Returns:
+        List of (name, source) tuples; source is SQL bytes or a file path
+    """
+    if migrations_dir is None:
+        migrations_dir = get_migrations_dir()
+    
+    migrations = _load_embedded_migrations(migrations_dir)
+    if migrations is None:
+        migrations = [(path.name, path) for path in migrations_dir.glob("migration_v*.sql")]
+    
+    return sorted(migrations, key=lambda migration: _migration_sort_key(migration[0]))
+
+
+def _read_migration(source: Union[bytes, Path]) -> str:
+    """Get the SQL for a migration from embedded bytes or its file."""
+    if isinstance(source, bytes):
+        return source.decode("utf-8")
+    return source.read_text(encoding="utf-8")
+
+
+def embed_migrations(migrations_dir: Optional[Path] = None) -> Path:
+    """
+    Generate the embedded migrations module (a build step).
+    
+    The generated file is not committed; rebuild it whenever a migration
+    is added, or delete it to fall back to reading the .sql files.
+    
+    Args:
+        migrations_dir: Directory holding migration_v*.sql files
+        
+    Returns:
+        Path to the generated module
+    """
+    if migrations_dir is None:
+        migrations_dir = get_migrations_dir()
+    
+    paths = sorted(migrations_dir.glob("migration_v*.sql"), key=lambda path: _migration_sort_key(path.name))
+    
+    lines = [
+        '"""',
+        "Embedded ReCog migrations.",
+        "",
+        "GENERATED by `python db.py embed` - do not edit or commit.",
+        '"""',
+        "",
+        "MIGRATIONS = [",
+    ]
+    for path in paths:
+        lines.append(f"    ({path.name!r}, {path.read_bytes()!r}),")
+    lines.append("]")
+    
+    embedded_path = migrations_dir / EMBEDDED_MIGRATIONS_FILE
+    embedded_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return embedded_path
+
+
+def _migration_tracking_state(conn: sqlite3.Connection) -> str:
+    """
+    Classify how the database records applied migrations.
+
+    Returns:
+        'tracked' if schema_migrations exists, 'legacy' if migrations ran
+        before tracking existed (entity_blacklist comes from the first
+        migration), otherwise 'new'
+    """
+    tables = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' "
+            "AND name IN ('schema_migrations', 'entity_blacklist')"
+        )
+    }
+    if "schema_migrations" in tables:
+        return "tracked"
+    return "legacy" if tables else "new"
+
+
+def _adopt_legacy_migrations(conn: sqlite3.Connection, migration_files: list, now: str) -> list:
+    """
+    Re-run migrations that predate tracking the way they always ran, then record them.
+
+    Each file runs on its own and OperationalErrors (columns or tables that
+    already exist) are ignored, exactly as untracked runs always did. Only
+    files up to LAST_UNTRACKED_MIGRATION are adopted; newer ones are left
+    pending for the normal all-or-nothing path, so their errors surface.
+    """
+    last_key = _migration_sort_key(LAST_UNTRACKED_MIGRATION)
+    untracked = [
+        (name, source) for name, source in migration_files
+        if _migration_sort_key(name) <= last_key
+    ]
+
+    applied = []
+    for name, source in untracked:
+        try:
+            conn.executescript(_read_migration(source))
+            applied.append(name)
+        except sqlite3.OperationalError:
+            # Already applied before tracking existed
+            pass
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO schema_migrations (name, applied_at) VALUES (?, ?)",
+        [(name, now) for name, _ in untracked],
+    )
+    conn.commit()
+    return applied
+
+
 def apply_migrations(db_path: Path) -> list:
     """
     Apply any pending migrations to the database.
     
-    Migrations are SQL files named migration_v*.sql in the migrations directory.
+    Migrations are SQL files named migration_v*.sql in the migrations directory
+    (or their embedded copies, see discover_migrations()). Applied migrations are recorded in schema_migrations; all pending ones run
+    in a single transaction, so a failing migration leaves the database as it was.
     
     Args:
         db_path: Path to database
         
     Returns:
         List of applied migration names
+        
+    Raises:
+        sqlite3.Error: If a pending migration fails (nothing is applied)
     """
-    migrations_dir = get_migrations_dir()
-    applied = []
-    
-    # Find all migration files
-    migration_files = sorted(migrations_dir.glob("migration_v*.sql"))
+    migration_files = discover_migrations()
     
     if not migration_files:
-        return applied
+        return []
     
+    now = datetime.now(timezone.utc).isoformat() + "Z"
     conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
     
-    for mig_path in migration_files:
+    try:
+        state = _migration_tracking_state(conn)
+        if state != "tracked":
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    name TEXT PRIMARY KEY,
+                    applied_at TEXT NOT NULL
+                )
+            """)
+            conn.commit()
+        
+        adopted = []
+        if state == "legacy":
+            adopted = _adopt_legacy_migrations(conn, migration_files, now)
+        
+        # Only files not yet recorded are ever opened and read
+        done = {row[0] for row in conn.execute("SELECT name FROM schema_migrations")}
+        pending = [(name, source) for name, source in migration_files if name not in done]
+        
+        if not pending:
+            return adopted
+        
+        script = ["BEGIN;"]
+        for _, source in pending:
+            script.append(_read_migration(source))
+        
         try:
-            sql = mig_path.read_text(encoding="utf-8")
-            cursor.executescript(sql)
-            applied.append(mig_path.name)
-        except sqlite3.OperationalError as e:
-            # Table already exists or similar - skip silently
-            pass
-        except Exception as e:
-            print(f"Warning: Migration {mig_path.name} failed: {e}")
-    
-    conn.commit()
-    conn.close()
-    
-    return applied
+            conn.executescript("\n;\n".join(script))
+            conn.executemany(
+                "INSERT INTO schema_migrations (name, applied_at) VALUES (?, ?)",
+                [(name, now) for name, _ in pending],
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        
+        return adopted + [name for name, _ in pending]
+    finally:
+        conn.close()
 
 
 def init_database(db_path: Optional[Path] = None, force: bool = False) -> Path:
@@ -107,6 +328,10 @@ def init_database(db_path: Optional[Path] = None, force: bool = False) -> Path:
     conn = sqlite3.connect(str(db_path))
     cursor = conn.cursor()
     
+    # Configure WAL before any tables exist (page_size is fixed afterwards)
+    for pragma in INIT_PRAGMAS:
+        cursor.execute(pragma)
+    
     # Execute schema
     cursor.executescript(schema_sql)
     
@@ -122,15 +347,64 @@ def init_database(db_path: Optional[Path] = None, force: bool = False) -> Path:
     return db_path
 
 
-def check_database(db_path: Path) -> dict:
+def _read_stat1_counts(cursor: sqlite3.Cursor) -> dict:
+    """
+    Read per-table row estimates recorded by ANALYZE.
+
+    The first integer of each sqlite_stat1 stat string is the row count of
+    the table (or index) at the time ANALYZE ran.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'")
+    if cursor.fetchone() is None:
+        return {}
+    
+    counts = {}
+    cursor.execute("SELECT tbl, stat FROM sqlite_stat1")
+    for tbl, stat in cursor.fetchall():
+        if stat and tbl not in counts:
+            counts[tbl] = int(stat.split(" ", 1)[0])
+    return counts
+
+
+def _count_tables(conn: sqlite3.Connection, tables: list) -> list:
+    """Exact row counts for tables, fetched with one UNION ALL query per batch."""
+    counts = []
+    for start in range(0, len(tables), CHECK_COUNT_BATCH_SIZE):
+        batch = tables[start:start + CHECK_COUNT_BATCH_SIZE]
+        cursor = conn.execute(" UNION ALL ".join(
+            "SELECT ?, COUNT(*) FROM \"{}\"".format(table.replace('"', '""'))
+            for table in batch
+        ), batch)
+        counts.extend(cursor.fetchall())
+    return counts
+
+
+def _count_tables_on_new_connection(db_path: Path, tables: list) -> list:
+    """Run _count_tables on a dedicated read-only connection (worker thread)."""
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return _count_tables(conn, tables)
+    finally:
+        conn.close()
+
+
+def check_database(db_path: Path, approximate: bool = False, workers: int = CHECK_COUNT_WORKERS) -> dict:
     """
     Check database status and table counts.
     
+    Exact counts are fetched with UNION ALL queries. With many tables they
+    are split across several reader connections counting in parallel
+    (sqlite3 releases the GIL while a query runs, and WAL readers never
+    block each other).
+    
     Args:
         db_path: Path to database
+        approximate: Use ANALYZE estimates from sqlite_stat1 where available,
+            counting only tables without stats
+        workers: Maximum number of parallel reader connections
         
     Returns:
-        Dict with table names and row counts
+        Dict with table names, row counts and journal mode
     """
     if not db_path.exists():
         return {"error": "Database not found"}
@@ -140,19 +414,30 @@ def check_database(db_path: Path) -> dict:
     
     # Get table list
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-    tables = [row[0] for row in cursor.fetchall()]
+    tables = [row[0] for row in cursor.fetchall() if not row[0].startswith("sqlite_")]
     
     result = {"tables": {}}
     
-    for table in tables:
-        if table.startswith("sqlite_"):
-            continue
-        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-        count = cursor.fetchone()[0]
-        result["tables"][table] = count
+    cursor.execute("PRAGMA journal_mode")
+    result["journal_mode"] = cursor.fetchone()[0]
+    
+    estimates = _read_stat1_counts(cursor) if approximate else {}
+    to_count = [table for table in tables if table not in estimates]
+    
+    counts = dict(estimates)
+    if len(to_count) >= CHECK_PARALLEL_MIN_TABLES and workers > 1:
+        groups = [group for group in (to_count[i::workers] for i in range(workers)) if group]
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            for group_counts in executor.map(
+                lambda group: _count_tables_on_new_connection(db_path, group), groups
+            ):
+                counts.update(group_counts)
+    elif to_count:
+        counts.update(_count_tables(conn, to_count))
     
     conn.close()
     
+    result["tables"] = {table: counts[table] for table in tables}
     result["total_tables"] = len(result["tables"])
     result["total_rows"] = sum(result["tables"].values())
     
@@ -175,6 +460,100 @@ def get_database_path(data_dir: Optional[Path] = None) -> Path:
     return data_dir / DEFAULT_DB_NAME
 
 
+# =============================================================================
+# CONNECTION POOL
+# =============================================================================
+
+class ConnectionPool:
+    """
+    Fixed-size pool of long-lived SQLite connections.
+
+    Connections are opened once and handed out via borrow(), so hot
+    request paths skip the connect cost and keep SQLite's page cache warm.
+
+    Usage:
+        pool = ConnectionPool(db_path)
+        with pool.borrow() as conn:
+            conn.execute("SELECT ...")
+    """
+
+    def __init__(self, db_path: Path, size: int = DEFAULT_POOL_SIZE):
+        """
+        Open the pooled connections.
+
+        Args:
+            db_path: Path to database
+            size: Number of connections to keep open
+        """
+        self.db_path = Path(db_path)
+        self.size = size
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._create_connection())
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """
+        Open a connection configured for sharing across request threads.
+
+        Connections run in autocommit mode: reads take no transaction at all
+        and writes opt in explicitly with immediate_transaction().
+        """
+        conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            cached_statements=POOL_CACHED_STATEMENTS,
+            isolation_level=None,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in POOL_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def borrow(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for the duration of a with-block.
+
+        Any transaction left open by the caller is rolled back before the
+        connection goes back into the pool.
+        """
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        """Close every idle connection in the pool."""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+@contextmanager
+def immediate_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run a with-block inside BEGIN IMMEDIATE ... COMMIT.
+
+    Takes the write lock up front instead of upgrading a deferred
+    transaction mid-way, which can fail with SQLITE_BUSY under concurrent
+    readers. Rolls back if the block raises. Intended for autocommit
+    (isolation_level=None) connections such as the pooled ones.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
 # =============================================================================
 # CLI
 # =============================================================================
@@ -188,6 +567,8 @@ def main():
         print("Commands:")
         print("  init [path]    Initialize new database")
         print("  check [path]   Check database status")
+        print("  migrate [path] Apply pending migrations")
+        print("  embed          Embed migration SQL for faster startup (build step)")
         print("  schema         Show schema path")
         print()
         print("Options:")
@@ -223,11 +604,16 @@ def main():
         print(f"Database: {path}")
         print(f"Tables: {result['total_tables']}")
         print(f"Total rows: {result['total_rows']}")
+        print(f"Journal mode: {result['journal_mode']}")
         print()
         
         for table, count in sorted(result["tables"].items()):
             print(f"  {table}: {count}")
     
+    elif cmd == "embed":
+        embedded_path = embed_migrations()
+        print(f"Embedded migrations: {embedded_path}")
+    
     elif cmd == "schema":
         print(get_schema_path())
     
@@ -15,6 +15,7 @@ Usage:
 """
 
 import sys
+from functools import cache
 from pathlib import Path
 from datetime import datetime
 
@@ -23,8 +24,9 @@ from datetime import datetime
 # CONFIGURATION
 # =============================================================================
 
+@cache
 def get_repo_root() -> Path:
-    """Get the repository root directory."""
+    """Get the repository root directory (walked once per process)."""
     current = Path(__file__).resolve().parent
     while current != current.parent:
         if (current / ".git").exists():
@@ -182,6 +184,9 @@ graph TB
     class CaseStore,Findings,Timeline,StateMachine case
 '''
 
+# Encoded once at import; the diagram is static
+MERMAID_BYTES = MERMAID_DIAGRAM.encode("utf-8")
+
 
 # =============================================================================
 # SUMMARY DOCUMENT
@@ -291,6 +296,12 @@ ReCog/
 ```
 '''
 
+# Split once around the only placeholder so generation just writes
+# prefix + timestamp + suffix instead of re-scanning the template
+_SUMMARY_PREFIX, _SUMMARY_SUFFIX = (
+    part.encode("utf-8") for part in ARCHITECTURE_SUMMARY.split("{timestamp}", 1)
+)
+
 
 # =============================================================================
 # GENERATOR
@@ -311,15 +322,17 @@ def generate_architecture(output_dir: Path = None) -> tuple:
 
     # Generate Mermaid diagram
     mermaid_path = output_dir / "ARCHITECTURE.mmd"
-    mermaid_path.write_text(MERMAID_DIAGRAM, encoding="utf-8")
+    mermaid_path.write_bytes(MERMAID_BYTES)
     print(f"[OK] Generated: {mermaid_path}")
 
     # Generate summary
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    summary_content = ARCHITECTURE_SUMMARY.format(timestamp=timestamp)
 
     summary_path = output_dir / "ARCHITECTURE_SUMMARY.md"
-    summary_path.write_text(summary_content, encoding="utf-8")
+    with summary_path.open("wb") as f:
+        f.write(_SUMMARY_PREFIX)
+        f.write(timestamp.encode("utf-8"))
+        f.write(_SUMMARY_SUFFIX)
     print(f"[OK] Generated: {summary_path}")
 
     return mermaid_path, summary_path
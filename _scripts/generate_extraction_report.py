@@ -3,30 +3,90 @@ Generate comprehensive extraction report for Instagram analysis.
 """
 
 import sqlite3
-import json
+from contextlib import closing
 from pathlib import Path
 from datetime import datetime
 
+# The report only reads; keep sorts in memory and let SQLite mmap the file
+READ_PRAGMAS = """
+PRAGMA query_only=ON;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+"""
+
+# The JSON array columns are rendered as comma-separated lists by SQLite's
+# json_each and long excerpts are cut to 200 characters, so rows reach
+# Python ready to print
+INSIGHTS_QUERY = """
+SELECT insight_type, significance, confidence, summary,
+    COALESCE((SELECT group_concat(value, ', ') FROM json_each(NULLIF(themes_json, ''))), 'None') AS themes,
+    COALESCE((SELECT group_concat(value, ', ') FROM json_each(NULLIF(emotional_tags_json, ''))), 'None') AS emotions,
+    COALESCE((SELECT group_concat(value, ', ') FROM json_each(NULLIF(patterns_json, ''))), 'None') AS patterns,
+    CASE
+        WHEN excerpt IS NULL OR excerpt = '' THEN 'None'
+        WHEN length(excerpt) > 200 THEN substr(excerpt, 1, 200) || '...'
+        ELSE excerpt
+    END AS excerpt
+FROM insights
+ORDER BY significance DESC
+"""
+
+PATTERNS_QUERY = """
+SELECT pattern_type, strength, confidence, name, description, insight_count, status
+FROM patterns
+ORDER BY strength DESC
+"""
+
+# Per-row report blocks, parsed once and filled with str.format for every
+# insight/pattern instead of evaluating a multi-line f-string per row
+INSIGHT_TEMPLATE = """#### [{idx}] {label} | sig={significance:.2f} | conf={confidence:.2f}
+
+**Summary:** {summary}
+
+- **Themes:** {themes}
+- **Emotions:** {emotions}
+- **Patterns:** {patterns}
+- **Excerpt:** "{excerpt}"
+
+---
+
+"""
+
+PATTERN_TEMPLATE = """#### [{idx}] {label} | strength={strength:.2f} | conf={confidence:.2f}
+
+**{name}**
+
+{description}
+
+- **Based on:** {insight_count} insights
+- **Status:** {status}
+
+---
+
+"""
+
 def generate_report():
     db_path = Path('./_data/recog.db')
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    with closing(sqlite3.connect(str(db_path))) as conn:
+        conn.executescript(READ_PRAGMAS)
 
-    # Get all insights
-    cursor.execute('SELECT * FROM insights ORDER BY significance DESC')
-    insights = cursor.fetchall()
+        # Only the totals are needed up front; the rows themselves are streamed
+        # from the cursor while their section is emitted
+        insight_total = conn.execute('SELECT COUNT(*) FROM insights').fetchone()[0]
+        pattern_total = conn.execute('SELECT COUNT(*) FROM patterns').fetchone()[0]
 
-    # Get all patterns
-    cursor.execute('SELECT * FROM patterns ORDER BY strength DESC')
-    patterns = cursor.fetchall()
+        print(f'Loaded {insight_total} insights and {pattern_total} patterns')
 
-    print(f'Loaded {len(insights)} insights and {len(patterns)} patterns')
+        # One clock read for every timestamp in the report
+        now = datetime.now()
 
-    # Build the comprehensive report
-    report = f"""# ReCog Extraction Report: Instagram @brenty_jay
+        # Build the comprehensive report as a list of parts; repeated += on a
+        # growing str copies the whole buffer each time
+        parts = []
+        parts.append(f"""# ReCog Extraction Report: Instagram @brenty_jay
 
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}
+**Generated:** {now:%Y-%m-%d %H:%M}
 **Source:** Instagram HTML Export (Meta Data Download)
 **Account:** @brenty_jay (Brent Lefebure)
 **Milestone:** First full pure extraction without context injection
@@ -43,8 +103,8 @@ def generate_report():
 | Total Characters | 1,553,734 |
 | Total Words | 286,397 |
 | Processing Chunks | 16 |
-| Tier 1 Insights | {len(insights)} |
-| Tier 2 Patterns | {len(patterns)} |
+| Tier 1 Insights | {insight_total} |
+| Tier 2 Patterns | {pattern_total} |
 
 ---
 
@@ -108,81 +168,68 @@ def generate_report():
 
 ## Tier 1: Insight Extraction (LLM)
 
-**Total Insights Extracted:** {len(insights)}
+**Total Insights Extracted:** {insight_total}
 
 ### Insight Type Distribution
-"""
-
-    # Calculate insight type distribution
-    insight_types = {}
-    for i in insights:
-        t = i['insight_type']
-        insight_types[t] = insight_types.get(t, 0) + 1
-
-    report += '| Type | Count | % |\n|------|-------|---|\n'
-    for t, count in sorted(insight_types.items(), key=lambda x: x[1], reverse=True):
-        pct = (count / len(insights)) * 100
-        report += f'| {t} | {count} | {pct:.1f}% |\n'
-
-    report += '\n### All Extracted Insights (Ranked by Significance)\n\n'
-
-    for idx, i in enumerate(insights, 1):
-        themes = json.loads(i['themes_json']) if i['themes_json'] else []
-        emotions = json.loads(i['emotional_tags_json']) if i['emotional_tags_json'] else []
-        patterns_list = json.loads(i['patterns_json']) if i['patterns_json'] else []
-        excerpt = i['excerpt'] if i['excerpt'] else 'None'
-        if len(excerpt) > 200:
-            excerpt = excerpt[:200] + '...'
-
-        report += f"""#### [{idx}] {i['insight_type'].upper()} | sig={i['significance']:.2f} | conf={i['confidence']:.2f}
-
-**Summary:** {i['summary']}
-
-- **Themes:** {', '.join(themes) if themes else 'None'}
-- **Emotions:** {', '.join(emotions) if emotions else 'None'}
-- **Patterns:** {', '.join(patterns_list) if patterns_list else 'None'}
-- **Excerpt:** "{excerpt}"
-
----
-
-"""
-
-    report += f"""
+""")
+
+        # Insight type distribution, most common first
+        insight_types = conn.execute(
+            'SELECT insight_type, COUNT(*) AS n FROM insights'
+            ' GROUP BY insight_type ORDER BY n DESC, insight_type'
+        )
+
+        parts.append('| Type | Count | % |\n|------|-------|---|\n')
+        for t, count in insight_types:
+            pct = (count / insight_total) * 100
+            parts.append(f'| {t} | {count} | {pct:.1f}% |\n')
+
+        parts.append('\n### All Extracted Insights (Ranked by Significance)\n\n')
+
+        insights = conn.execute(INSIGHTS_QUERY)
+        # Plain tuples unpacked by position; no per-row name lookups
+        for idx, (insight_type, significance, confidence, summary,
+                  themes, emotions, patterns_str, excerpt) in enumerate(insights, 1):
+            parts.append(INSIGHT_TEMPLATE.format(
+                idx=idx, label=insight_type.upper(),
+                significance=significance, confidence=confidence, summary=summary,
+                themes=themes, emotions=emotions, patterns=patterns_str, excerpt=excerpt,
+            ))
+
+        parts.append(f"""
 ## Tier 2: Pattern Synthesis (LLM)
 
-**Total Patterns Synthesized:** {len(patterns)}
+**Total Patterns Synthesized:** {pattern_total}
 
 ### Pattern Type Distribution
-"""
-
-    # Calculate pattern type distribution
-    pattern_types = {}
-    for p in patterns:
-        t = p['pattern_type']
-        pattern_types[t] = pattern_types.get(t, 0) + 1
+""")
 
-    report += '| Type | Count |\n|------|-------|\n'
-    for t, count in sorted(pattern_types.items(), key=lambda x: x[1], reverse=True):
-        report += f'| {t} | {count} |\n'
+        # Pattern type distribution, most common first
+        pattern_types = conn.execute(
+            'SELECT pattern_type, COUNT(*) AS n FROM patterns'
+            ' GROUP BY pattern_type ORDER BY n DESC, pattern_type'
+        )
 
-    report += '\n### All Synthesized Patterns (Ranked by Strength)\n\n'
+        parts.append('| Type | Count |\n|------|-------|\n')
+        for t, count in pattern_types:
+            parts.append(f'| {t} | {count} |\n')
 
-    for idx, p in enumerate(patterns, 1):
-        report += f"""#### [{idx}] {p['pattern_type'].upper()} | strength={p['strength']:.2f} | conf={p['confidence']:.2f}
+        parts.append('\n### All Synthesized Patterns (Ranked by Strength)\n\n')
 
-**{p['name']}**
+        patterns = conn.execute(PATTERNS_QUERY)
+        for idx, (pattern_type, strength, confidence, name,
+                  description, insight_count, status) in enumerate(patterns, 1):
+            parts.append(PATTERN_TEMPLATE.format(
+                idx=idx, label=pattern_type.upper(),
+                strength=strength, confidence=confidence, name=name,
+                description=description, insight_count=insight_count, status=status,
+            ))
 
-{p['description']}
 
-- **Based on:** {p['insight_count']} insights
-- **Status:** {p['status']}
-
----
-
-"""
+    # Everything below is static text
 
     # Add Tier 3 synthesis
-    report += """
+    parts.append("""
 ## Tier 3: Comprehensive Psychological Profile
 
 ### Executive Summary
@@ -322,22 +369,24 @@ The 14 emotion categories detected with 73 explicit keyword matches is actually
 |-------|-------|
 | Parser | InstagramHTMLParser v1.0 |
 | Extraction Model | Claude Sonnet (Anthropic) |
-| Processing Date | """ + datetime.now().isoformat() + """ |
+| Processing Date | """ + now.isoformat() + """ |
 | ReCog Version | 0.10 |
 | Export Format | HTML (Meta Data Download) |
-| Report Generated | """ + datetime.now().strftime('%Y-%m-%d %H:%M:%S') + """ |
+| Report Generated | """ + now.strftime('%Y-%m-%d %H:%M:%S') + """ |
 
 ---
 
 *This report was generated by ReCog - a cognitive intelligence framework for entity recognition and document analysis.*
 *First full pure extraction milestone - no context injection required.*
-"""
+""")
 
-    # Save the report
+    # Save the report, encoding part by part rather than joining the whole
+    # document into one str and re-encoding it
     output_path = Path('../_docs/INSTAGRAM_EXTRACTION_REPORT.md')
-    output_path.write_text(report, encoding='utf-8')
+    with output_path.open('wb') as f:
+        f.writelines(part.encode('utf-8') for part in parts)
     print(f'\nReport saved to: {output_path.absolute()}')
-    print(f'Total size: {len(report):,} characters')
+    print(f'Total size: {sum(map(len, parts)):,} characters')
 
     return output_path
 
@@ -8,6 +8,8 @@ Splits large documents into processable chunks while maintaining:
 """
 
 import re
+from bisect import bisect_right
+from itertools import accumulate, islice
 from typing import List, Optional, Tuple
 from .types import DocumentChunk, ParsedContent
 
@@ -15,6 +17,10 @@ from .types import DocumentChunk, ParsedContent
 class Chunker:
     """Splits documents into chunks with context preservation."""
     
+    # Break-point patterns, compiled once (see _find_break_point)
+    _SENTENCE_RE = re.compile(r'[.!?]\s+')
+    _WHITESPACE_RE = re.compile(r'\s+')
+    
     def __init__(
         self,
         target_tokens: int = 2000,
@@ -76,28 +82,37 @@ class Chunker:
         
         chunks = []
         start = 0
+        prev_start = -1
         chunk_index = 0
         
+        # Loop invariants as locals
+        target_chars = self.target_chars
+        overlap_chars = self.overlap_chars
+        context_chars = self.context_chars
+        chars_per_token = self.chars_per_token
+        find_break_point = self._find_break_point
+        
         while start < total_len:
             # Calculate end position
-            end = min(start + self.target_chars, total_len)
+            end = min(start + target_chars, total_len)
             
             # Try to break at sentence/paragraph boundary
             if end < total_len:
-                end = self._find_break_point(text, start, end)
+                end = find_break_point(text, start, end)
             
-            # Extract chunk content
+            # Extract chunk content. Break points land just after whitespace
+            # and overlapped starts can land mid-run, so this strip is needed
             content = text[start:end].strip()
             
             if content:
-                # Get context
-                preceding = text[max(0, start - self.context_chars):start].strip()
-                following = text[end:min(total_len, end + self.context_chars)].strip()
+                # Get context (slicing already clamps at the end of text)
+                preceding = text[max(0, start - context_chars):start].strip()
+                following = text[end:end + context_chars].strip()
                 
                 chunk = DocumentChunk(
                     content=content,
                     chunk_index=chunk_index,
-                    token_count=self.estimate_tokens(content),
+                    token_count=len(content) // chars_per_token,
                     start_char=start,
                     end_char=end,
                     page_number=self._get_page_number(start, page_boundaries),
@@ -108,8 +123,9 @@ class Chunker:
                 chunk_index += 1
             
             # Move start position (with overlap)
-            start = end - self.overlap_chars
-            if start <= chunks[-1].start_char if chunks else 0:
+            prev_start = start
+            start = end - overlap_chars
+            if start <= prev_start:
                 # Prevent infinite loop
                 start = end
         
@@ -120,18 +136,14 @@ class Chunker:
         Chunk parsed content, respecting page boundaries if available.
         """
         if parsed.pages:
-            # Build page boundary positions
-            boundaries = []
-            pos = 0
-            full_text_parts = []
-            
-            for page_text in parsed.pages:
-                boundaries.append(pos)
-                full_text_parts.append(page_text)
-                pos += len(page_text) + 1  # +1 for newline between pages
-            
-            full_text = "\n".join(full_text_parts)
-            return self.chunk_text(full_text, boundaries)
+            pages = parsed.pages
+            # Page start positions (+1 for the newline between pages)
+            boundaries = list(accumulate(
+                (len(page_text) + 1
+                 for page_text in islice(pages, len(pages) - 1)),
+                initial=0,
+            ))
+            return self.chunk_text("\n".join(pages), boundaries)
         else:
             return self.chunk_text(parsed.text)
     
@@ -139,29 +151,34 @@ class Chunker:
         """
         Find a good break point (paragraph > sentence > word).
         Searches backwards from end position.
+        
+        All searches run in place over the window of ``text`` (str.rfind,
+        pattern pos/endpos), so no copy of the window is made.
         """
         search_start = max(start, end - 500)  # Look back up to 500 chars
-        segment = text[search_start:end]
         
         # Try paragraph break (double newline)
-        para_match = list(re.finditer(r'\n\n', segment))
-        if para_match:
-            return search_start + para_match[-1].end()
+        pos = text.rfind('\n\n', search_start, end)
+        if pos != -1:
+            return pos + 2
         
-        # Try sentence break
-        sentence_match = list(re.finditer(r'[.!?]\s+', segment))
-        if sentence_match:
-            return search_start + sentence_match[-1].end()
+        # Try sentence break (only the last match is wanted)
+        last = None
+        for last in self._SENTENCE_RE.finditer(text, search_start, end):
+            pass
+        if last is not None:
+            return last.end()
         
         # Try single newline
-        newline_match = list(re.finditer(r'\n', segment))
-        if newline_match:
-            return search_start + newline_match[-1].end()
+        pos = text.rfind('\n', search_start, end)
+        if pos != -1:
+            return pos + 1
         
         # Try word break
-        word_match = list(re.finditer(r'\s+', segment))
-        if word_match:
-            return search_start + word_match[-1].end()
+        for last in self._WHITESPACE_RE.finditer(text, search_start, end):
+            pass
+        if last is not None:
+            return last.end()
         
         # No good break found, use original end
         return end
@@ -171,12 +188,9 @@ class Chunker:
         char_pos: int,
         page_boundaries: Optional[List[int]]
     ) -> Optional[int]:
-        """Get page number for a character position."""
+        """Get page number (0-indexed) for a character position."""
         if not page_boundaries:
             return None
         
-        for i, boundary in enumerate(page_boundaries):
-            if char_pos < boundary:
-                return i  # 0-indexed
-        
-        return len(page_boundaries) - 1
+        # Boundaries are ascending page start offsets
+        return max(0, bisect_right(page_boundaries, char_pos) - 1)
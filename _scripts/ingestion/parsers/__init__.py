@@ -5,23 +5,30 @@ Copyright (c) 2025 Brent Lefebure / EhkoLabs
 Licensed under AGPLv3
 """
 
-from .base import BaseParser, get_parser, get_all_parsers, get_supported_extensions
-from .pdf import PDFParser
-from .markdown import MarkdownParser
-from .plaintext import PlaintextParser
-from .messages import MessagesParser
-from .json_export import JSONExportParser
-from .excel import ExcelParser
-from .csv_parser import CSVParser
-from .csv_enhanced import EnhancedCSVParser
-from .mbox import MboxParser
-from .docx import DocxParser
-from .email import EmlParser, MsgParser
-from .archive import ArchiveParser
-from .calendar import ICSParser
-from .contacts import VCFParser
-from .notion import NotionParser
-from .instagram import InstagramHTMLParser
+from .base import (
+    BaseParser,
+    get_parser,
+    get_all_parsers,
+    get_supported_extensions,
+    _PARSER_REGISTRY,
+    _get_parser_class,
+)
+
+
+# Parser classes are imported on first access (PEP 562) so that importing
+# the package does not pull in pypdf, openpyxl, python-docx, etc. until a
+# parser that needs them is actually used
+def __getattr__(name):
+    if name not in _PARSER_REGISTRY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    parser_class = _get_parser_class(name)
+    globals()[name] = parser_class  # Later lookups skip __getattr__
+    return parser_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_PARSER_REGISTRY))
+
 
 __all__ = [
     "BaseParser",
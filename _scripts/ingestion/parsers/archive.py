@@ -6,24 +6,221 @@ Handles compressed archives and detects platform exports
 
 Security features:
 - Zip bomb detection (compression ratio, file count limits)
-- Path traversal prevention with resolve()
+- Path traversal prevention against the resolved destination
 - Encrypted archive detection
 
 Copyright (c) 2025 Brent Lefebure / EhkoLabs
 Licensed under AGPLv3
 """
 
+import hashlib
 import json
+import os
 import re
 import zipfile
 import tarfile
 import tempfile
+from fnmatch import fnmatchcase
+from functools import partial
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-
-from .base import BaseParser
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple
+
+# isal's igzip is a drop-in gzip with SIMD-accelerated inflate, several
+# times faster on large .tar.gz exports; the stdlib module is the fallback.
+# isal_zlib inflates deflated ZIP members the same way.
+try:
+    from isal import igzip as gzip_mod
+    from isal import isal_zlib
+    from isal.isal_zlib import error as _InflateError
+    HAS_ISAL = True
+except ImportError:
+    import gzip as gzip_mod
+    from zlib import error as _InflateError
+    HAS_ISAL = False
+
+# orjson parses the large JSON files in platform exports several times
+# faster than the stdlib, straight from bytes
+try:
+    import orjson
+    _json_loads = orjson.loads
+    HAS_ORJSON = True
+except ImportError:
+    _json_loads = json.loads
+    HAS_ORJSON = False
+
+# ijson samples the head of very large Meta message files without
+# building the whole document
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+from .base import BaseParser, get_parser, _CONTENT_SNIFFED_SUFFIXES
 from ..types import ParsedContent
 
+# Extraction filters (3.12, backported to 3.8.17+) make tarfile refuse
+# absolute paths and links escaping the destination on its own
+_HAS_TAR_FILTER = hasattr(tarfile, 'data_filter')
+
+# TAR records that only describe the following member (GNU long names and
+# link targets, PAX global headers)
+_TAR_HEADER_TYPES = frozenset({tarfile.GNUTYPE_LONGNAME, tarfile.GNUTYPE_LONGLINK, tarfile.XGLTYPE})
+
+# Raised by gzip_mod for damaged .tar.gz data (bad header, corrupt or
+# truncated stream)
+_GZIP_ERRORS = (gzip_mod.BadGzipFile, _InflateError, EOFError)
+
+# Directory for cached platform export results, keyed by cache version,
+# archive path, size and mtime. Unset disables the cache.
+ARCHIVE_CACHE_DIR = os.environ.get("RECOG_ARCHIVE_CACHE_DIR")
+
+# File extensions to skip (media, binary)
+_SKIP_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.ico', '.svg',
+    '.mp3', '.mp4', '.avi', '.mov', '.mkv', '.wav', '.flac', '.m4a',
+    '.exe', '.dll', '.so', '.dylib', '.bin',
+    '.pyc', '.pyo', '.class', '.o', '.obj',
+    '.db', '.sqlite', '.sqlite3',
+})
+
+
+def _name_suffix(name: str) -> str:
+    """Lowercased suffix of a file name, as Path(name).suffix.lower() gives it."""
+    dot = name.rfind('.')
+    if 0 < dot < len(name) - 1:
+        return name[dot:].lower()
+    return ''
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with '...'."""
+    if len(text) > limit:
+        return f"{text[:limit]}..."
+    return text
+
+
+# Archive type by file suffix; multi-part suffixes are checked first
+_ARCHIVE_TYPES = {'.zip': 'zip', '.tar': 'tar', '.tgz': 'tar.gz'}
+_COMPOUND_ARCHIVE_TYPES = (('.tar.gz', 'tar.gz'),)
+
+
+def _archive_type(name: str) -> Optional[str]:
+    """Archive type ('zip', 'tar', 'tar.gz') for a file name, or None."""
+    name = name.lower()
+    for compound, archive_type in _COMPOUND_ARCHIVE_TYPES:
+        if name.endswith(compound):
+            return archive_type
+    dot = name.rfind('.')
+    return _ARCHIVE_TYPES.get(name[dot:]) if dot > 0 else None
+
+
+# Platform export signatures in priority order; the first path that
+# exists under the extracted directory names the format
+_SIGNATURES = (
+    ('posts/your_posts_1.json', 'facebook'),
+    ('messages/inbox', 'facebook'),
+    ('your_facebook_activity', 'facebook'),
+    ('Takeout', 'google_takeout'),
+    ('data/tweets.js', 'twitter'),
+    ('data/tweet.js', 'twitter'),
+    ('media.json', 'instagram'),
+    ('content/posts_1.json', 'instagram'),
+    ('Connections.csv', 'linkedin'),
+)
+
+
+def _match_signatures(exists: Callable[[str], bool]) -> Optional[str]:
+    """
+    Return the format of the first _SIGNATURES path present.
+
+    Args:
+        exists: Callable telling whether a '/'-separated relative path exists
+    """
+    for rel_path, export_format in _SIGNATURES:
+        if exists(rel_path):
+            return export_format
+    return None
+
+
+class _ArchiveZipFile(zipfile.ZipFile):
+    """ZipFile inflating deflated members with isal_zlib when installed."""
+
+    def open(self, name, mode='r', pwd=None, *, force_zip64=False):
+        fileobj = super().open(name, mode, pwd, force_zip64=force_zip64)
+        # Nothing has been inflated yet, so the raw-deflate decompressor
+        # zipfile picked can still be swapped for isal's. Both attributes
+        # are private to ZipExtFile; if a Python release renames them the
+        # member is left on the stdlib decompressor.
+        if (HAS_ISAL and mode == 'r'
+                and getattr(fileobj, '_compress_type', None) == zipfile.ZIP_DEFLATED
+                and getattr(fileobj, '_decompressor', None) is not None):
+            fileobj._decompressor = isal_zlib.decompressobj(-15)
+        return fileobj
+
+
+# Meta exports write each UTF-8 byte of non-ASCII text as its own \u00XX
+# escape ("café" becomes "caf\u00c3\u00a9"). Runs of such escapes, and
+# escaped backslashes so a literal "\\u00e9" is left alone, are matched
+# on the raw JSON bytes.
+_META_ESCAPE_RUN = re.compile(rb'\\\\|(?:\\u00[89a-fA-F][0-9a-fA-F])+')
+
+# Bytes a _META_ESCAPE_RUN match can contain; cutting a stream just after
+# any other byte never splits a match
+_META_ESCAPE_BYTES = frozenset(b'\\u0123456789abcdefABCDEF')
+
+
+def _fix_meta_run(match: "re.Match[bytes]") -> bytes:
+    """Turn one run of \\u00XX escapes back into the UTF-8 it encodes."""
+    run = match.group()
+    if run == b'\\\\':
+        return run
+    data = bytes(int(run[i + 4:i + 6], 16) for i in range(0, len(run), 6))
+    try:
+        data.decode('utf-8')
+    except UnicodeDecodeError:
+        return run
+    return data
+
+
+class _MetaRecodeReader:
+    """Binary file wrapper applying the Meta mojibake fix as it is read."""
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._pending = b''
+
+    def read(self, size: int = -1) -> bytes:
+        while True:
+            chunk = self._fileobj.read(size)
+            data = self._pending + chunk
+            if not chunk or size < 0:
+                self._pending = b''
+                return _META_ESCAPE_RUN.sub(_fix_meta_run, data)
+
+            # Hold back the tail that could still be part of an escape run
+            cut = len(data)
+            while cut and data[cut - 1] in _META_ESCAPE_BYTES:
+                cut -= 1
+            if cut:
+                self._pending = data[cut:]
+                return _META_ESCAPE_RUN.sub(_fix_meta_run, data[:cut])
+            self._pending = data
+
+# Assignment wrapping the JSON in Twitter archive data files
+_TWITTER_PREFIX_RE = re.compile(rb'window\.YTD\.\w+\.part\d+\s*=\s*')
+
+# Rule above and below each file heading in archive listings
+_SEP = "=" * 60
+
+# Markers in the per-walk suffix cache (see _resolve_parser)
+_SKIPPED = object()
+_UNCACHED = object()
+
 
 class ArchiveSecurityError(Exception):
     """Raised when archive contains security risks."""
@@ -60,36 +257,42 @@ class ArchiveParser(BaseParser):
     }
 
     # File extensions to skip (media, binary)
-    SKIP_EXTENSIONS = {
-        '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.ico', '.svg',
-        '.mp3', '.mp4', '.avi', '.mov', '.mkv', '.wav', '.flac', '.m4a',
-        '.exe', '.dll', '.so', '.dylib', '.bin',
-        '.pyc', '.pyo', '.class', '.o', '.obj',
-        '.db', '.sqlite', '.sqlite3',
-    }
+    SKIP_EXTENSIONS = _SKIP_EXTENSIONS
+
+    # Platform export signatures, in priority order
+    _SIGNATURES = _SIGNATURES
 
     # Security limits
     MAX_EXTRACTED_SIZE = 500 * 1024 * 1024  # 500MB
     MAX_COMPRESSION_RATIO = 100  # 100:1 ratio threshold for zip bombs
     MAX_FILE_COUNT = 10000  # Maximum files in archive
     MAX_NESTING_DEPTH = 3  # Maximum nested archive depth
+    MAX_MEMBER_SIZE = 100 * 1024 * 1024  # 100MB, any single member
+    MEMBER_RATIO_MIN_SIZE = 1024 * 1024  # Members this large must also pass the ratio alone
 
-    # Track current nesting depth during recursive parsing
-    _current_depth = 0
+    # Where platform export results are cached between parses (None disables)
+    CACHE_DIR = ARCHIVE_CACHE_DIR
 
-    def get_extensions(self) -> List[str]:
-        return [".zip", ".tar", ".tar.gz", ".tgz"]
+    # Part of every cache key; bump it whenever parsing changes what a
+    # platform export produces, so results cached by older code are missed
+    CACHE_VERSION = 1
 
-    def can_parse(self, path: Path) -> bool:
-        """Check if this is a supported archive."""
-        suffix = path.suffix.lower()
-        name = path.name.lower()
+    # Upper bound on threads parsing files of a generic archive
+    MAX_PARSE_WORKERS = 32
+
+    # Most files of one parser type handed to a single parse_batch() call
+    PARSE_BATCH_SIZE = 32
 
-        # Handle .tar.gz
-        if name.endswith('.tar.gz'):
-            return True
+    # Meta JSON files at least this large are sampled with ijson, when
+    # installed, rather than loaded whole
+    META_STREAM_MIN_SIZE = 16 * 1024 * 1024
 
-        return suffix in ['.zip', '.tar', '.tgz']
+    # Stop adding files to generic archive output past this many characters
+    MAX_OUTPUT_CHARS = 5 * 1024 * 1024
+
+    def can_parse(self, path: Path) -> bool:
+        """Check if this is a supported archive."""
+        return _archive_type(path.name) is not None
 
     def get_file_type(self) -> str:
         return "archive"
@@ -118,11 +321,42 @@ class ArchiveParser(BaseParser):
             )
 
         try:
+            # Platform export summaries are small, so repeat parses of an
+            # unchanged archive are answered from the cache
+            cache_file = self._cache_file(path)
+            if cache_file is not None:
+                cached = self._load_cached(cache_file)
+                if cached is not None:
+                    return cached
+
             with tempfile.TemporaryDirectory() as temp_dir:
                 temp_path = Path(temp_dir)
 
-                # Extract archive with security checks
-                extracted_size = self._extract_archive(path, temp_path)
+                # Generic ZIPs and plain TARs are read member by member
+                # without extracting the whole archive; platform exports,
+                # over-limit archives and .tar.gz (which cannot be listed
+                # without decompressing it) take the extraction path below
+                archive_type = self._detect_archive_type(path)
+                extracted_size = None
+                if archive_type == "zip":
+                    with _ArchiveZipFile(path, 'r') as zf:
+                        # One pass over the central directory serves both
+                        # paths; exports are extracted from the same handle
+                        extracted_size = self._check_zip_members(zf, temp_path)
+                        if extracted_size <= self.MAX_EXTRACTED_SIZE:
+                            if self._detect_zip_export_format(zf) is None:
+                                return self._stream_generic_zip(zf, temp_path, path, _depth)
+                            self._extract_zip_members(zf, temp_path)
+                elif archive_type == "tar":
+                    with tarfile.open(path, 'r:') as tf:
+                        members = self._list_tar_members(tf, temp_path)
+                        if (members is not None
+                                and self._detect_member_export_format(m.name for m in members) is None):
+                            return self._stream_generic_tar(tf, members, temp_path, path, _depth)
+
+                if extracted_size is None:
+                    # Extract archive with security checks
+                    extracted_size = self._extract_archive(path, temp_path)
 
                 if extracted_size > self.MAX_EXTRACTED_SIZE:
                     return ParsedContent(
@@ -139,7 +373,10 @@ class ArchiveParser(BaseParser):
                 export_format = self._detect_export_format(temp_path)
 
                 if export_format:
-                    return self._handle_platform_export(temp_path, export_format, path, _depth)
+                    result = self._handle_platform_export(temp_path, export_format, path, _depth)
+                    if cache_file is not None:
+                        self._store_cached(cache_file, result)
+                    return result
 
                 # Generic archive: process all supported files
                 return self._process_generic_archive(temp_path, path, _depth)
@@ -178,74 +415,150 @@ class ArchiveParser(BaseParser):
                 metadata={"error": "extraction_failed", "details": str(e)}
             )
 
+    def _cache_file(self, path: Path) -> Optional[Path]:
+        """
+        Cache file for this version of the archive, or None if caching is off.
+
+        The key covers CACHE_VERSION, path, size and mtime, so rewriting
+        the archive or changing its parsing invalidates the entry.
+        """
+        if not self.CACHE_DIR:
+            return None
+
+        stat = path.stat()
+        key = f"{self.CACHE_VERSION}|{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        return Path(self.CACHE_DIR) / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _load_cached(self, cache_file: Path) -> Optional[ParsedContent]:
+        """Read a cached result; missing or unreadable entries are misses."""
+        try:
+            with open(cache_file, 'rb') as f:
+                return ParsedContent(**_json_loads(f.read()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _store_cached(self, cache_file: Path, result: ParsedContent) -> None:
+        """Write a result to the cache; failures only cost the next parse."""
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(asdict(result), f)
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError):
+            # Don't leave a partly written entry behind in the cache dir
+            try:
+                tmp_file.unlink(missing_ok=True)
+            except OSError:
+                pass
+
     def _detect_archive_type(self, path: Path) -> str:
-        """Detect archive type from path."""
-        name = path.name.lower()
-        if name.endswith('.tar.gz') or name.endswith('.tgz'):
-            return "tar.gz"
-        elif path.suffix.lower() == '.tar':
-            return "tar"
-        else:
-            return "zip"
+        """Detect archive type from path (anything unrecognised is read as ZIP)."""
+        return _archive_type(path.name) or "zip"
 
-    def _check_zip_security(self, zf: zipfile.ZipFile) -> None:
+    def _check_zip_members(self, zf: zipfile.ZipFile, dest: Path) -> int:
         """
-        Check ZIP file for security risks.
+        Run the ZIP security checks against the central directory.
+
+        One pass validates every member path, refuses encrypted members,
+        enforces the file count and compression ratio limits and totals
+        the declared sizes, so an over-limit archive is rejected without
+        being decompressed. Member data sits before the central directory,
+        so its offset bounds the total compressed size: once the sizes
+        seen so far pass MAX_COMPRESSION_RATIO times that bound, the final
+        ratio must too, and a bomb is refused without reading the rest.
+
+        Members are also checked on their own, so one bomb cannot hide
+        behind large, poorly compressible neighbours: none may declare more
+        than MAX_MEMBER_SIZE, and any of MEMBER_RATIO_MIN_SIZE or more must
+        stay within MAX_COMPRESSION_RATIO by itself (tiny members compress
+        unevenly and are only counted in the total). zipfile stops reading
+        a member at its declared size, so declared sizes are binding.
+
+        Returns:
+            Declared uncompressed size, stopping once it passes the limit.
 
         Raises:
             ArchiveSecurityError: If security risk detected
+            RuntimeError: If the archive contains encrypted files
         """
         total_compressed = 0
-        total_uncompressed = 0
+        total_size = 0
         file_count = 0
+        ratio_bound = max(zf.start_dir, 1) * self.MAX_COMPRESSION_RATIO
+        base_prefix = self._base_prefix(dest)
 
         for info in zf.infolist():
             file_count += 1
-            total_compressed += info.compress_size
-            total_uncompressed += info.file_size
+            if file_count > self.MAX_FILE_COUNT:
+                raise ArchiveSecurityError(
+                    f"Too many files in archive: more than {self.MAX_FILE_COUNT}"
+                )
 
             # Check for encrypted files
             if info.flag_bits & 0x1:
                 raise RuntimeError("Archive contains encrypted files")
 
-        # Check file count limit
-        if file_count > self.MAX_FILE_COUNT:
-            raise ArchiveSecurityError(
-                f"Too many files in archive: {file_count} (limit: {self.MAX_FILE_COUNT})"
-            )
+            self._safe_extract_path(info.filename, base_prefix)
+
+            if info.file_size > self.MAX_MEMBER_SIZE:
+                raise ArchiveSecurityError(
+                    f"Archive member too large: {info.filename} (limit: {self.MAX_MEMBER_SIZE // (1024 * 1024)}MB)"
+                )
+            if (info.file_size >= self.MEMBER_RATIO_MIN_SIZE
+                    and info.file_size > info.compress_size * self.MAX_COMPRESSION_RATIO):
+                raise ArchiveSecurityError(
+                    f"Suspicious compression ratio: {info.filename} over {self.MAX_COMPRESSION_RATIO}:1"
+                )
+
+            total_compressed += info.compress_size
+            total_size += info.file_size
+            if total_size > ratio_bound:
+                raise ArchiveSecurityError(
+                    f"Suspicious compression ratio: over {self.MAX_COMPRESSION_RATIO}:1"
+                )
+            if total_size > self.MAX_EXTRACTED_SIZE:
+                return total_size
 
         # Check compression ratio (zip bomb detection)
         if total_compressed > 0:
-            ratio = total_uncompressed / total_compressed
+            ratio = total_size / total_compressed
             if ratio > self.MAX_COMPRESSION_RATIO:
                 raise ArchiveSecurityError(
                     f"Suspicious compression ratio: {ratio:.0f}:1 (limit: {self.MAX_COMPRESSION_RATIO}:1)"
                 )
 
-    def _safe_extract_path(self, member_name: str, base_dir: Path) -> Path:
+        return total_size
+
+    @staticmethod
+    def _base_prefix(dest: Path) -> str:
+        """Resolved extraction directory with a trailing separator, for _safe_extract_path."""
+        return os.path.join(os.path.realpath(dest), '')
+
+    def _safe_extract_path(self, member_name: str, base_prefix: str) -> str:
         """
         Validate and return safe extraction path.
 
-        Prevents path traversal attacks using resolve().
+        Prevents path traversal attacks. The destination is resolved once
+        by the caller (_base_prefix), so each member costs a normpath() and
+        a prefix comparison rather than a realpath() of its own; archive
+        members are checked before anything is written, so there are no
+        links beneath the destination to resolve yet.
 
         Args:
             member_name: Name of archive member
-            base_dir: Base extraction directory
+            base_prefix: Output of _base_prefix for the extraction directory
 
         Returns:
-            Safe resolved path
+            Safe normalised path
 
         Raises:
             ArchiveSecurityError: If path traversal detected
         """
-        # Resolve the target path
-        target = (base_dir / member_name).resolve()
-        base_resolved = base_dir.resolve()
+        target = os.path.normpath(os.path.join(base_prefix, member_name))
 
         # Check if target is within base directory
-        try:
-            target.relative_to(base_resolved)
-        except ValueError:
+        if not (target + os.sep).startswith(base_prefix):
             raise ArchiveSecurityError(f"Path traversal attempt: {member_name}")
 
         return target
@@ -259,86 +572,211 @@ class ArchiveParser(BaseParser):
         """
         archive_type = self._detect_archive_type(path)
         total_size = 0
-        dest_resolved = dest.resolve()
 
         if archive_type == "zip":
-            with zipfile.ZipFile(path, 'r') as zf:
-                # Security checks
-                self._check_zip_security(zf)
+            with _ArchiveZipFile(path, 'r') as zf:
+                # Security checks, before writing anything
+                total_size = self._check_zip_members(zf, dest)
+                if total_size > self.MAX_EXTRACTED_SIZE:
+                    return total_size
 
-                # Calculate total size
-                total_size = sum(info.file_size for info in zf.infolist())
+                self._extract_zip_members(zf, dest)
+        else:
+            # TAR or TAR.GZ, read as a stream: one sequential pass in which
+            # extractall() pulls members through a validating generator,
+            # instead of getmembers() decompressing everything once just to
+            # list it and extraction decompressing it again
+            base_prefix = self._base_prefix(dest)
+
+            def safe_members(tf: tarfile.TarFile) -> Iterator[tarfile.TarInfo]:
+                nonlocal total_size
+                for member, total_size in self._iter_tar_members(tf, base_prefix):
+                    # Stop before extracting anything past the size limit;
+                    # the caller reports the archive as too large
+                    if total_size > self.MAX_EXTRACTED_SIZE:
+                        return
+                    yield member
+
+            with self._open_tar_stream(path, archive_type) as tf:
+                if _HAS_TAR_FILTER:
+                    tf.extractall(dest, members=safe_members(tf), filter='data')
+                else:
+                    tf.extractall(dest, members=safe_members(tf))
 
-                # Extract each file with path validation
-                for member in zf.infolist():
-                    # Validate path
-                    self._safe_extract_path(member.filename, dest_resolved)
+        return total_size
 
-                    # Extract
-                    zf.extract(member, dest)
-        else:
-            # TAR or TAR.GZ
-            mode = 'r:gz' if archive_type == "tar.gz" else 'r'
-            with tarfile.open(path, mode) as tf:
-                members = tf.getmembers()
-
-                # Check file count
-                if len(members) > self.MAX_FILE_COUNT:
-                    raise ArchiveSecurityError(
-                        f"Too many files in archive: {len(members)} (limit: {self.MAX_FILE_COUNT})"
-                    )
+    def _extract_zip_members(self, zf: zipfile.ZipFile, dest: Path) -> None:
+        """
+        Extract every ZIP member into dest on a thread pool.
 
-                # Validate each member
-                for member in members:
-                    # Validate path
-                    self._safe_extract_path(member.name, dest_resolved)
-                    total_size += member.size
+        Inflating and writing many small members is dominated by zlib and
+        file syscalls, which release the GIL. Folders are created once, up
+        front, so concurrent extracts never race on makedirs, and only the
+        last member for a given path is extracted, as a serial extraction
+        would leave it.
+        """
+        files = {}
+        folders = set()
+        for info in zf.infolist():
+            parts = self._member_parts(info.filename)
+            if not parts:
+                continue
+            if info.is_dir():
+                folders.add(os.path.join(dest, *parts))
+            else:
+                files[tuple(parts)] = info
+                if len(parts) > 1:
+                    folders.add(os.path.join(dest, *parts[:-1]))
 
-                # Use data_filter for Python 3.12+ or manual extraction
-                try:
-                    tf.extractall(dest, filter='data')
-                except TypeError:
-                    # Fallback for older Python
-                    tf.extractall(dest)
+        for folder in folders:
+            os.makedirs(folder, exist_ok=True)
 
-        return total_size
+        if not files:
+            return
+
+        max_workers = min(self.MAX_PARSE_WORKERS, (os.cpu_count() or 4) * 4, len(files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(zf.extract, info, dest) for info in files.values()]
+            for future in futures:
+                future.result()
+
+    def _iter_tar_members(
+        self, tf: tarfile.TarFile, base_prefix: str
+    ) -> Iterator[Tuple[tarfile.TarInfo, int]]:
+        """
+        Validate TAR members in archive order.
+
+        Yields each member with the running total of member sizes, and
+        stops after the first member that takes the total past
+        MAX_EXTRACTED_SIZE (that member must not be extracted).
+
+        Raises:
+            ArchiveSecurityError: If security risk detected
+        """
+        total_size = 0
+        file_count = 0
+        while (member := tf.next()) is not None:
+            # Header-only records carry no file of their own; tarfile
+            # normally folds them into the next member, but never
+            # count or extract one that slips through
+            if member.type in _TAR_HEADER_TYPES:
+                continue
+
+            # Check file count
+            file_count += 1
+            if file_count > self.MAX_FILE_COUNT:
+                raise ArchiveSecurityError(
+                    f"Too many files in archive: more than {self.MAX_FILE_COUNT}"
+                )
+
+            # Validate path: absolute names and '..' components are
+            # refused outright. The 'data' extraction filter also
+            # rejects links pointing outside dest; without it, fall
+            # back to resolving each target.
+            parts = member.name.split('/')
+            if member.name.startswith('/') or '..' in parts:
+                raise ArchiveSecurityError(f"Path traversal attempt: {member.name}")
+            if not _HAS_TAR_FILTER:
+                self._safe_extract_path(member.name, base_prefix)
+
+            if member.size > self.MAX_MEMBER_SIZE:
+                raise ArchiveSecurityError(
+                    f"Archive member too large: {member.name} (limit: {self.MAX_MEMBER_SIZE // (1024 * 1024)}MB)"
+                )
+
+            total_size += member.size
+            yield member, total_size
+            if total_size > self.MAX_EXTRACTED_SIZE:
+                return
+
+    def _list_tar_members(self, tf: tarfile.TarFile, dest: Path) -> Optional[List[tarfile.TarInfo]]:
+        """
+        Validate and list the members of a seekable TAR.
+
+        Reading the headers skips over member data, so this costs little
+        on an uncompressed archive.
+
+        Returns:
+            The members, or None when the archive must be extracted
+            instead: it passes the size limit, or holds links or special
+            files, which only extraction reproduces faithfully.
+
+        Raises:
+            ArchiveSecurityError: If security risk detected
+        """
+        members = []
+        for member, total_size in self._iter_tar_members(tf, self._base_prefix(dest)):
+            if total_size > self.MAX_EXTRACTED_SIZE or not (member.isfile() or member.isdir()):
+                return None
+            members.append(member)
+        return members
+
+    @contextmanager
+    def _open_tar_stream(self, path: Path, archive_type: str) -> Iterator[tarfile.TarFile]:
+        """
+        Open a TAR for a single sequential read.
+
+        .tar.gz input is decompressed through gzip_mod (isal when installed)
+        rather than tarfile's built-in zlib stream. Damaged gzip data is
+        reported as tarfile.ReadError, as tarfile itself would.
+        """
+        if archive_type != "tar.gz":
+            with tarfile.open(path, 'r|') as tf:
+                yield tf
+            return
+
+        try:
+            with gzip_mod.GzipFile(filename=path, mode='rb') as gz:
+                with tarfile.open(fileobj=gz, mode='r|') as tf:
+                    yield tf
+        except _GZIP_ERRORS as e:
+            raise tarfile.ReadError(f"invalid compressed data: {e}") from e
 
     def _detect_export_format(self, directory: Path) -> Optional[str]:
         """
         Detect platform export by signature files/structure.
 
         Returns:
-            'facebook', 'google_takeout', 'twitter', 'instagram', or None
-        """
-        # Facebook: has posts/your_posts_1.json or messages/inbox/
-        if (directory / 'posts' / 'your_posts_1.json').exists():
-            return 'facebook'
-        if (directory / 'messages' / 'inbox').exists():
-            return 'facebook'
-        if (directory / 'your_facebook_activity').exists():
-            return 'facebook'
-
-        # Google Takeout: has Takeout/ root folder
-        if (directory / 'Takeout').exists():
-            return 'google_takeout'
-
-        # Twitter: has data/tweets.js or data/tweet.js
-        if (directory / 'data' / 'tweets.js').exists():
-            return 'twitter'
-        if (directory / 'data' / 'tweet.js').exists():
-            return 'twitter'
-
-        # Instagram: has media.json or content/posts_1.json
-        if (directory / 'media.json').exists():
-            return 'instagram'
-        if (directory / 'content' / 'posts_1.json').exists():
-            return 'instagram'
-
-        # LinkedIn: has Connections.csv or messages.csv
-        if (directory / 'Connections.csv').exists():
-            return 'linkedin'
-
-        return None
+            'facebook', 'google_takeout', 'twitter', 'instagram', 'linkedin', or None
+        """
+        # Paths are checked against folder listings rather than stat() calls;
+        # a folder is listed at most once, and only if its parent lists it
+        base = os.fspath(directory)
+        listings: Dict[str, Optional[set]] = {}
+
+        def exists(rel_path: str) -> bool:
+            parent, _, name = rel_path.rpartition('/')
+            if parent not in listings:
+                listings[parent] = None
+                if not parent or exists(parent):
+                    try:
+                        with os.scandir(os.path.join(base, parent)) as entries:
+                            listings[parent] = {entry.name for entry in entries}
+                    except OSError:
+                        pass
+            return name in (listings[parent] or ())
+
+        return _match_signatures(exists)
+
+    def _detect_zip_export_format(self, zf: zipfile.ZipFile) -> Optional[str]:
+        """Detect platform export from a ZIP's member names, without extracting."""
+        return self._detect_member_export_format(info.filename for info in zf.infolist())
+
+    def _detect_member_export_format(self, names: Iterable[str]) -> Optional[str]:
+        """Detect platform export from archive member names."""
+        paths = set()
+        for name in names:
+            parts = self._member_parts(name)
+            # Every parent folder of a member exists once extracted
+            for end in range(1, len(parts) + 1):
+                paths.add('/'.join(parts[:end]))
+
+        return _match_signatures(paths.__contains__)
+
+    @staticmethod
+    def _member_parts(name: str) -> List[str]:
+        """Path components an archive member extracts to (as zipfile sanitises them)."""
+        return [part for part in name.split('/') if part not in ('', '.', '..')]
 
     def _handle_platform_export(
         self, directory: Path, export_format: str, original_path: Path, _depth: int = 0
@@ -367,17 +805,75 @@ class ArchiveParser(BaseParser):
 
         return handler(directory, original_path)
 
-    def _fix_meta_encoding(self, text: str) -> str:
+    def _load_meta_json(self, path) -> Any:
         """
-        Fix Facebook/Instagram's incorrectly encoded UTF-8 (mojibake).
+        Load a Facebook/Instagram JSON file, fixing Meta's mojibake.
 
         Meta exports JSON with UTF-8 text double-encoded as Latin-1,
-        causing "café" to appear as "cafÃ©".
+        causing "café" to appear as "cafÃ©". The escapes are repaired once
+        on the raw bytes, before they are parsed, so every string in the file
+        comes out right without a round trip per field. Runs that are not
+        valid UTF-8 are left as they were.
         """
-        try:
-            return text.encode('latin1').decode('utf-8')
-        except (UnicodeDecodeError, UnicodeEncodeError):
-            return text
+        with open(path, 'rb') as f:
+            raw = f.read()
+        return _json_loads(_META_ESCAPE_RUN.sub(_fix_meta_run, raw))
+
+    def _sample_meta_thread(self, path, sample: int) -> Tuple[Any, List[Any], List[Any], int]:
+        """
+        Read a Meta message thread for the export summary.
+
+        Files of META_STREAM_MIN_SIZE or more are streamed with ijson when
+        it is installed, building only the participants and the sampled
+        messages instead of the whole document.
+
+        Returns:
+            (title, participants, first `sample` messages, message count)
+        """
+        if not HAS_IJSON or os.path.getsize(path) < self.META_STREAM_MIN_SIZE:
+            data = self._load_meta_json(path)
+            messages = data.get('messages', [])
+            return data.get('title', 'Unknown'), data.get('participants', []), messages[:sample], len(messages)
+
+        title = 'Unknown'
+        participants: List[Any] = []
+        messages: List[Any] = []
+        message_count = 0
+        targets = {'participants.item': participants, 'messages.item': messages}
+        building = None
+
+        with open(path, 'rb') as f:
+            for prefix, event, value in ijson.parse(_MetaRecodeReader(f), use_float=True):
+                if building is not None:
+                    builder, target, item_prefix = building
+                    builder.event(event, value)
+                    if prefix == item_prefix and event in ('end_map', 'end_array'):
+                        target.append(builder.value)
+                        building = None
+                elif prefix == 'title' and event == 'string':
+                    title = value
+                elif prefix in targets and event not in ('map_key', 'end_map', 'end_array'):
+                    if prefix == 'messages.item':
+                        message_count += 1
+                        if len(messages) >= sample:
+                            continue
+                    if event in ('start_map', 'start_array'):
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                        building = (builder, targets[prefix], prefix)
+                    else:
+                        targets[prefix].append(value)
+
+        return title, participants, messages, message_count
+
+    def _sample_meta_list(self, path, sample: int) -> List[Any]:
+        """First `sample` items of a Meta JSON file holding a list ([] otherwise)."""
+        if not HAS_IJSON or os.path.getsize(path) < self.META_STREAM_MIN_SIZE:
+            data = self._load_meta_json(path)
+            return data[:sample] if isinstance(data, list) else []
+
+        with open(path, 'rb') as f:
+            return list(islice(ijson.items(_MetaRecodeReader(f), 'item', use_float=True), sample))
 
     def _parse_facebook_export(self, directory: Path, original_path: Path) -> ParsedContent:
         """
@@ -385,52 +881,57 @@ class ArchiveParser(BaseParser):
 
         Handles Meta's mojibake encoding bug.
         """
-        inventory = self._build_inventory(directory)
+        archive_name = original_path.name
+        archive_stem = original_path.stem
+        inventory = self._build_inventory(directory, collectors={
+            'message_files': ('messages/inbox', '*/message_*.json'),
+            'post_files': ('posts', '*.json'),
+        })
+        collected = inventory.pop('collectors')
 
         text_parts = [
             "=== Facebook Export Analysis ===",
-            f"Archive: {original_path.name}",
+            f"Archive: {archive_name}",
             "",
         ]
 
-        # Extract messages
-        messages_dir = directory / 'messages' / 'inbox'
+        # Extract messages, grouping the collected message files by thread
         message_count = 0
         participants = set()
 
-        if messages_dir.exists():
-            threads = list(messages_dir.iterdir())
-            text_parts.append(f"Message Threads: {len(threads)}")
+        threads: Dict[str, List[Path]] = {}
+        for path_str in collected['message_files']:
+            threads.setdefault(os.path.dirname(path_str), []).append(Path(path_str))
+
+        thread_count = self._count_entries(os.path.join(os.fspath(directory), 'messages', 'inbox'))
+        if thread_count:
+            text_parts.append(f"Message Threads: {thread_count}")
             text_parts.append("")
 
-            for thread_dir in threads[:10]:  # Sample first 10 threads
-                message_files = list(thread_dir.glob('message_*.json'))
+            for message_files in list(threads.values())[:10]:  # Sample first 10 threads
                 for msg_file in message_files[:1]:  # First file per thread
                     try:
-                        with open(msg_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-
-                        thread_name = self._fix_meta_encoding(data.get('title', 'Unknown'))
-                        thread_participants = data.get('participants', [])
+                        thread_name, thread_participants, sample, thread_messages = (
+                            self._sample_meta_thread(msg_file, 5)
+                        )
 
                         for p in thread_participants:
-                            name = self._fix_meta_encoding(p.get('name', ''))
+                            name = p.get('name', '')
                             if name:
                                 participants.add(name)
 
-                        messages = data.get('messages', [])
-                        message_count += len(messages)
+                        message_count += thread_messages
 
                         text_parts.append(f"--- Thread: {thread_name} ---")
                         text_parts.append(f"Participants: {len(thread_participants)}")
-                        text_parts.append(f"Messages: {len(messages)}")
+                        text_parts.append(f"Messages: {thread_messages}")
 
                         # Sample messages
-                        for msg in messages[:5]:
-                            sender = self._fix_meta_encoding(msg.get('sender_name', 'Unknown'))
-                            content = self._fix_meta_encoding(msg.get('content', ''))
+                        for msg in sample:
+                            sender = msg.get('sender_name', 'Unknown')
+                            content = msg.get('content', '')
                             if content:
-                                content = content[:200] + '...' if len(content) > 200 else content
+                                content = _truncate(content, 200)
                                 text_parts.append(f"  {sender}: {content}")
 
                         text_parts.append("")
@@ -439,24 +940,19 @@ class ArchiveParser(BaseParser):
                         text_parts.append(f"  [Error reading {msg_file.name}: {e}]")
 
         # Extract posts
-        posts_dir = directory / 'posts'
-        if posts_dir.exists():
-            post_files = list(posts_dir.glob('*.json'))
+        post_files = [Path(p) for p in collected['post_files']]
+        if post_files:
             text_parts.append(f"Posts Files: {len(post_files)}")
 
             for post_file in post_files[:3]:
                 try:
-                    with open(post_file, 'r', encoding='utf-8') as f:
-                        posts = json.load(f)
-
-                    if isinstance(posts, list):
-                        for post in posts[:3]:
-                            if 'data' in post:
-                                for item in post['data'][:1]:
-                                    if 'post' in item:
-                                        content = self._fix_meta_encoding(item['post'])
-                                        content = content[:300] + '...' if len(content) > 300 else content
-                                        text_parts.append(f"  Post: {content}")
+                    for post in self._sample_meta_list(post_file, 3):
+                        if 'data' in post:
+                            for item in post['data'][:1]:
+                                if 'post' in item:
+                                    content = item['post']
+                                    content = _truncate(content, 300)
+                                    text_parts.append(f"  Post: {content}")
                 except Exception:
                     pass
 
@@ -472,11 +968,11 @@ class ArchiveParser(BaseParser):
 
         return ParsedContent(
             text="\n".join(text_parts),
-            title=f"Facebook Export - {original_path.stem}",
+            title=f"Facebook Export - {archive_stem}",
             metadata={
                 "detected_format": "facebook",
                 "parser": "ArchiveParser",
-                "archive_name": original_path.name,
+                "archive_name": archive_name,
                 "message_count": message_count,
                 "participant_count": len(participants),
                 "participants": list(participants)[:50],
@@ -488,25 +984,29 @@ class ArchiveParser(BaseParser):
         """
         Parse Google Takeout export.
         """
+        archive_name = original_path.name
+        archive_stem = original_path.stem
         inventory = self._build_inventory(directory)
-        takeout_dir = directory / 'Takeout'
+        takeout_dir = os.path.join(os.fspath(directory), 'Takeout')
 
         text_parts = [
             "=== Google Takeout Analysis ===",
-            f"Archive: {original_path.name}",
+            f"Archive: {archive_name}",
             "",
         ]
 
         services_data = {}
 
-        if takeout_dir.exists():
-            services = [d for d in takeout_dir.iterdir() if d.is_dir()]
+        if os.path.isdir(takeout_dir):
+            with os.scandir(takeout_dir) as entries:
+                services = sorted(
+                    (entry.name, entry.path) for entry in entries if entry.is_dir()
+                )
             text_parts.append(f"Services: {len(services)}")
             text_parts.append("")
 
-            for service_dir in sorted(services):
-                service_name = service_dir.name
-                file_count = sum(1 for _ in service_dir.rglob('*') if _.is_file())
+            for service_name, service_dir in services:
+                file_count = sum(1 for _ in self._scandir_files(service_dir))
                 services_data[service_name] = file_count
                 text_parts.append(f"- {service_name}: {file_count} files")
 
@@ -518,11 +1018,11 @@ class ArchiveParser(BaseParser):
 
         return ParsedContent(
             text="\n".join(text_parts),
-            title=f"Google Takeout - {original_path.stem}",
+            title=f"Google Takeout - {archive_stem}",
             metadata={
                 "detected_format": "google_takeout",
                 "parser": "ArchiveParser",
-                "archive_name": original_path.name,
+                "archive_name": archive_name,
                 "services": services_data,
                 "inventory": inventory,
             }
@@ -534,40 +1034,45 @@ class ArchiveParser(BaseParser):
 
         Twitter archives wrap JSON in: window.YTD.tweet.part0 = [...]
         """
-        content = js_path.read_text(encoding='utf-8')
+        raw = js_path.read_bytes()
 
-        # Strip JavaScript wrapper
-        json_str = re.sub(r'^window\.YTD\.\w+\.part\d+\s*=\s*', '', content)
+        # Skip the JavaScript wrapper; the JSON parser decodes the bytes itself
+        match = _TWITTER_PREFIX_RE.match(raw)
 
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
+            return _json_loads(raw[match.end():] if match else raw)
+        except json.JSONDecodeError:  # orjson's error subclasses it
             return []
 
     def _parse_twitter_export(self, directory: Path, original_path: Path) -> ParsedContent:
         """
         Parse Twitter archive with JS wrapper handling.
         """
-        inventory = self._build_inventory(directory)
+        archive_name = original_path.name
+        archive_stem = original_path.stem
+        inventory = self._build_inventory(directory, collectors={
+            'js_files': ('data', '*.js'),
+        })
+        collected = inventory.pop('collectors')
 
         text_parts = [
             "=== Twitter Archive Analysis ===",
-            f"Archive: {original_path.name}",
+            f"Archive: {archive_name}",
             "",
         ]
 
-        data_dir = directory / 'data'
+        data_dir = os.path.join(os.fspath(directory), 'data')
         tweets = []
         tweet_count = 0
 
-        if data_dir.exists():
+        if os.path.exists(data_dir):
             # Parse tweets.js or tweet.js
             tweet_files = ['tweets.js', 'tweet.js']
             for tweet_file in tweet_files:
-                tweet_path = data_dir / tweet_file
-                if tweet_path.exists():
+                tweet_path = os.path.join(data_dir, tweet_file)
+                if os.path.exists(tweet_path):
                     try:
-                        tweet_data = self._parse_twitter_js(tweet_path)
+                        tweet_data = self._parse_twitter_js(Path(tweet_path))
                         tweet_count = len(tweet_data)
                         tweets = tweet_data
 
@@ -581,7 +1086,7 @@ class ArchiveParser(BaseParser):
                             text = tweet.get('full_text', tweet.get('text', ''))
                             created = tweet.get('created_at', '')
                             if text:
-                                text = text[:200] + '...' if len(text) > 200 else text
+                                text = _truncate(text, 200)
                                 text_parts.append(f"  [{created[:10] if created else 'N/A'}] {text}")
 
                         break
@@ -591,8 +1096,8 @@ class ArchiveParser(BaseParser):
             # List other data files
             text_parts.append("")
             text_parts.append("Other Data Files:")
-            js_files = list(data_dir.glob('*.js'))
-            for f in sorted(js_files)[:15]:
+            js_files = [Path(p) for p in collected['js_files']]
+            for f in js_files[:15]:
                 if f.name not in tweet_files:
                     text_parts.append(f"  - {f.stem}")
 
@@ -604,11 +1109,11 @@ class ArchiveParser(BaseParser):
 
         return ParsedContent(
             text="\n".join(text_parts),
-            title=f"Twitter Archive - {original_path.stem}",
+            title=f"Twitter Archive - {archive_stem}",
             metadata={
                 "detected_format": "twitter",
                 "parser": "ArchiveParser",
-                "archive_name": original_path.name,
+                "archive_name": archive_name,
                 "tweet_count": tweet_count,
                 "inventory": inventory,
             }
@@ -618,11 +1123,13 @@ class ArchiveParser(BaseParser):
         """
         Parse Instagram export with mojibake fix.
         """
+        archive_name = original_path.name
+        archive_stem = original_path.stem
         inventory = self._build_inventory(directory)
 
         text_parts = [
             "=== Instagram Export Analysis ===",
-            f"Archive: {original_path.name}",
+            f"Archive: {archive_name}",
             "",
         ]
 
@@ -630,26 +1137,24 @@ class ArchiveParser(BaseParser):
         content_found = False
 
         # Check for messages
-        messages_dir = directory / 'messages' / 'inbox'
-        if messages_dir.exists():
-            threads = list(messages_dir.iterdir())
-            text_parts.append(f"Message Threads: {len(threads)}")
+        thread_count = self._count_entries(os.path.join(os.fspath(directory), 'messages', 'inbox'))
+        if thread_count:
+            text_parts.append(f"Message Threads: {thread_count}")
             content_found = True
 
         # Check for posts
-        posts_json = directory / 'content' / 'posts_1.json'
-        if posts_json.exists():
+        posts_json = os.path.join(os.fspath(directory), 'content', 'posts_1.json')
+        if os.path.exists(posts_json):
             try:
-                with open(posts_json, 'r', encoding='utf-8') as f:
-                    posts = json.load(f)
+                posts = self._load_meta_json(posts_json)
                 text_parts.append(f"Posts: {len(posts)}")
 
                 for post in posts[:5]:
                     if 'media' in post:
                         for media in post['media'][:1]:
-                            caption = self._fix_meta_encoding(media.get('title', ''))
+                            caption = media.get('title', '')
                             if caption:
-                                caption = caption[:200] + '...' if len(caption) > 200 else caption
+                                caption = _truncate(caption, 200)
                                 text_parts.append(f"  Post: {caption}")
                 content_found = True
             except Exception:
@@ -666,28 +1171,33 @@ class ArchiveParser(BaseParser):
 
         return ParsedContent(
             text="\n".join(text_parts),
-            title=f"Instagram Export - {original_path.stem}",
+            title=f"Instagram Export - {archive_stem}",
             metadata={
                 "detected_format": "instagram",
                 "parser": "ArchiveParser",
-                "archive_name": original_path.name,
+                "archive_name": archive_name,
                 "inventory": inventory,
             }
         )
 
     def _parse_linkedin_export(self, directory: Path, original_path: Path) -> ParsedContent:
         """Parse LinkedIn export."""
-        inventory = self._build_inventory(directory)
+        archive_name = original_path.name
+        archive_stem = original_path.stem
+        inventory = self._build_inventory(directory, collectors={
+            'csv_files': ('', '*.csv'),
+        })
+        collected = inventory.pop('collectors')
 
         text_parts = [
             "=== LinkedIn Export Analysis ===",
-            f"Archive: {original_path.name}",
+            f"Archive: {archive_name}",
             "",
             "CSV Files Found:",
         ]
 
-        csv_files = list(directory.glob('*.csv'))
-        for f in sorted(csv_files):
+        csv_files = [Path(p) for p in collected['csv_files']]
+        for f in csv_files:
             text_parts.append(f"  - {f.name}")
 
         text_parts.extend([
@@ -700,11 +1210,11 @@ class ArchiveParser(BaseParser):
 
         return ParsedContent(
             text="\n".join(text_parts),
-            title=f"LinkedIn Export - {original_path.stem}",
+            title=f"LinkedIn Export - {archive_stem}",
             metadata={
                 "detected_format": "linkedin",
                 "parser": "ArchiveParser",
-                "archive_name": original_path.name,
+                "archive_name": archive_name,
                 "csv_files": [f.name for f in csv_files],
                 "inventory": inventory,
             }
@@ -714,75 +1224,317 @@ class ArchiveParser(BaseParser):
         """
         Process a generic archive without known format.
 
-        Scans for supported files and processes each one.
+        Scans for supported files and processes each one. The directory
+        is scratch space: nested archives are deleted once parsed.
 
         Args:
             directory: Extracted archive directory
             original_path: Original archive path
             _depth: Current nesting depth for recursive archive handling
         """
-        from .base import get_parser
+        # Inventory counters are filled in the same walk that finds the
+        # files to parse; parsing happens afterwards so it can be spread
+        # over worker threads
+        inventory, todo = self._scan_directory(directory, process=True)
 
-        inventory = self._build_inventory(directory)
+        return self._render_generic_archive(original_path, inventory, todo, _depth)
 
-        # Process supported files
-        processed_files = []
-        text_sections = []
+    def _stream_generic_zip(
+        self, zf: zipfile.ZipFile, temp_path: Path, original_path: Path, _depth: int = 0
+    ) -> ParsedContent:
+        """
+        Process a generic ZIP straight from its members.
 
-        for file_path in sorted(directory.rglob('*')):
-            if not file_path.is_file():
-                continue
+        Args:
+            zf: Open archive, already through _check_zip_members
+            temp_path: Scratch directory for members that must be extracted
+            original_path: Original archive path
+            _depth: Current nesting depth for recursive archive handling
+        """
+        members = [(info.filename, info) for info in zf.infolist() if not info.is_dir()]
 
-            # Skip binary/media files
-            if file_path.suffix.lower() in self.SKIP_EXTENSIONS:
-                continue
+        return self._stream_generic_members(
+            members,
+            lambda info: Path(zf.extract(info, temp_path)),
+            original_path,
+            _depth,
+        )
 
-            # Try to get a parser
-            parser = get_parser(file_path)
+    def _stream_generic_tar(
+        self, tf: tarfile.TarFile, members: List[tarfile.TarInfo],
+        temp_path: Path, original_path: Path, _depth: int = 0
+    ) -> ParsedContent:
+        """
+        Process a generic, uncompressed TAR straight from its members.
+
+        Args:
+            tf: Seekable archive members were listed from
+            members: Output of _list_tar_members
+            temp_path: Scratch directory for members that must be extracted
+            original_path: Original archive path
+            _depth: Current nesting depth for recursive archive handling
+        """
+        def extract(member: tarfile.TarInfo) -> Path:
+            if _HAS_TAR_FILTER:
+                tf.extract(member, temp_path, set_attrs=False, filter='data')
+            else:
+                tf.extract(member, temp_path, set_attrs=False)
+            return temp_path / member.name
+
+        return self._stream_generic_members(
+            [(member.name, member) for member in members if member.isfile()],
+            extract,
+            original_path,
+            _depth,
+        )
+
+    def _stream_generic_members(
+        self,
+        members: List[Tuple[str, Any]],
+        extract: Callable[[Any], Path],
+        original_path: Path,
+        _depth: int = 0,
+    ) -> ParsedContent:
+        """
+        Process a generic archive straight from its members.
+
+        Produces the same result as extracting the archive and calling
+        _process_generic_archive, but media and unsupported members are
+        never written out: members are extracted one at a time, and only
+        once the name shows they will be parsed (or, for content-sniffed
+        types, that their parser has to read them to decide).
+
+        Args:
+            members: (member name, archive handle) for every file member
+            extract: Extracts a member, returning its path
+            original_path: Original archive path
+            _depth: Current nesting depth for recursive archive handling
+        """
+        # Later duplicates overwrite earlier ones on extraction, so the last
+        # member with a given path wins here too
+        by_parts = {}
+        for member_name, handle in members:
+            parts = self._member_parts(member_name)
+            if parts:
+                by_parts[tuple(parts)] = handle
+
+        total = 0
+        supported = 0
+        skipped = 0
+        by_type: Dict[str, int] = {}
+        suffix_cache = self._new_suffix_cache()
+        todo = []
+
+        # Sorting the component tuples matches the per-directory name order
+        # of _scandir_files(sort=True)
+        for parts in sorted(by_parts):
+            handle = by_parts[parts]
+            total += 1
+
+            rel_path = os.path.join(*parts)
+            name = parts[-1]
+            suffix = _name_suffix(name)
+
+            if suffix in _CONTENT_SNIFFED_SUFFIXES:
+                parser = None
+            else:
+                # The parser is decided by the name alone
+                parser = self._resolve_parser(Path(rel_path), suffix, suffix_cache)
+                if parser is _SKIPPED:
+                    skipped += 1
+                    by_type['media/binary'] = by_type.get('media/binary', 0) + 1
+                    continue
+                if parser is None:
+                    by_type['unknown'] = by_type.get('unknown', 0) + 1
+                    continue
+
+            source = extract(handle)
             if parser is None:
-                continue
+                parser = self._resolve_parser(source, suffix, suffix_cache)
+                if parser is None:
+                    by_type['unknown'] = by_type.get('unknown', 0) + 1
+                    continue
+
+            supported += 1
+            file_type = parser.get_file_type()
+            by_type[file_type] = by_type.get(file_type, 0) + 1
+            todo.append((rel_path, file_type, parser, source))
 
+        inventory = {
+            "total_files": total,
+            "supported_files": supported,
+            "skipped_files": skipped,
+            "by_type": by_type,
+        }
+
+        return self._render_generic_archive(original_path, inventory, todo, _depth)
+
+    def _plan_parse_jobs(
+        self, todo: List[Tuple[str, str, BaseParser, Any]], _depth: int, workers: int
+    ) -> List[Tuple[List[int], Any]]:
+        """
+        Split the files to parse into jobs for the thread pool.
+
+        Files on disk are grouped by parser type and handed over through
+        parse_batch(), in chunks small enough to keep every worker busy.
+        Nested archives (which need the next depth) run as single-file jobs.
+
+        Returns:
+            (todo indices, zero-argument call returning one outcome per
+            index) per job; an outcome is a ParsedContent or the exception
+            raised for that file
+        """
+        jobs = []
+        groups: Dict[type, List[int]] = {}
+
+        for index, (_, _, parser, source) in enumerate(todo):
+            if isinstance(parser, ArchiveParser):
+                task = partial(self._parse_nested_archive, parser, source, _depth + 1)
+                jobs.append(([index], partial(self._run_single, task)))
+            else:
+                groups.setdefault(type(parser), []).append(index)
+
+        for indices in groups.values():
+            size = max(1, min(self.PARSE_BATCH_SIZE, -(-len(indices) // workers)))
+            for start in range(0, len(indices), size):
+                chunk = indices[start:start + size]
+                parser = todo[chunk[0]][2]
+                paths = [todo[index][3] for index in chunk]
+                jobs.append((chunk, partial(self._run_batch, parser, paths)))
+
+        return jobs
+
+    @staticmethod
+    def _parse_nested_archive(parser: "ArchiveParser", path: Path, depth: int) -> ParsedContent:
+        """
+        Parse a nested archive from scratch space, then delete it.
+
+        The nested archive is read where the outer extraction left it; once
+        its own extraction is done the copy is only taking up disk, so
+        removing it straight away keeps peak usage near the largest nested
+        archive rather than the sum of them all.
+        """
+        try:
+            return parser.parse(path, _depth=depth)
+        finally:
             try:
-                # Pass depth for nested archives
-                if isinstance(parser, ArchiveParser):
-                    result = parser.parse(file_path, _depth=_depth + 1)
-                else:
-                    result = parser.parse(file_path)
-
-                # Get relative path for display
-                rel_path = file_path.relative_to(directory)
-
-                # Add to output
-                text_sections.append(f"\n{'='*60}")
-                text_sections.append(f"FILE: {rel_path}")
-                text_sections.append(f"TYPE: {parser.get_file_type()}")
-                text_sections.append('='*60)
-                text_sections.append(result.text[:10000])  # Limit per file
-
-                processed_files.append({
-                    "path": str(rel_path),
-                    "type": parser.get_file_type(),
-                    "chars": len(result.text),
-                })
-
-            except Exception as e:
-                processed_files.append({
-                    "path": str(file_path.relative_to(directory)),
-                    "type": "error",
-                    "error": str(e),
-                })
-
-        # Build final output
-        header = [
+                os.unlink(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _run_single(task) -> List[Any]:
+        """Run one parse call, capturing its exception as the outcome."""
+        try:
+            return [task()]
+        except Exception as e:
+            return [e]
+
+    @staticmethod
+    def _run_batch(parser: BaseParser, paths: List[Path]) -> List[Any]:
+        """Run parse_batch(), retrying file by file to pin down a failure."""
+        try:
+            return parser.parse_batch(paths)
+        except Exception:
+            outcomes = []
+            for path in paths:
+                try:
+                    outcomes.append(parser.parse(path))
+                except Exception as e:
+                    outcomes.append(e)
+            return outcomes
+
+    def _render_generic_archive(
+        self,
+        original_path: Path,
+        inventory: Dict[str, Any],
+        todo: List[Tuple[str, str, BaseParser, Any]],
+        _depth: int = 0,
+    ) -> ParsedContent:
+        """
+        Parse the files found by a generic scan and build the output.
+
+        Args:
+            original_path: Original archive path
+            inventory: Inventory counts from the scan
+            todo: (relative path, file type, parser, source) per supported
+                file, in output order. The source is the file's path, or a
+                zero-argument call for members read without extraction.
+            _depth: Current nesting depth for recursive archive handling
+        """
+        # Output lines go into one flat list joined once at the end. Every
+        # file in todo yields one processed_files entry unless the output
+        # budget runs out, so the header is written before parsing starts
+        # and its Processed line corrected afterwards if needed.
+        parts: List[str] = [
             f"=== Archive Contents: {original_path.name} ===",
             "",
             f"Total files: {inventory['total_files']}",
-            f"Processed: {len(processed_files)}",
+            f"Processed: {len(todo)}",
             f"Skipped (media/binary): {inventory['skipped_files']}",
-            "",
         ]
 
-        full_text = "\n".join(header) + "\n".join(text_sections)
+        # Process supported files. Parsing is mostly file I/O and independent
+        # per file, so it overlaps well across threads; outcomes are read
+        # back in path order to keep the output deterministic.
+        processed_files = []
+
+        max_workers = min(self.MAX_PARSE_WORKERS, (os.cpu_count() or 4) * 2)
+        jobs = self._plan_parse_jobs(todo, _depth, max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run) for _, run in jobs]
+
+            # Where each file's outcome lands: (job future, position in job)
+            slots: List[Any] = [None] * len(todo)
+            for (indices, _), future in zip(jobs, futures):
+                for position, index in enumerate(indices):
+                    slots[index] = (future, position)
+
+            total_chars = 0
+            for index, (rel_path, file_type, _, _) in enumerate(todo):
+                # Stop once the output budget is spent; jobs not yet started
+                # are cancelled rather than parsed for nothing
+                if total_chars > self.MAX_OUTPUT_CHARS:
+                    for pending in futures:
+                        pending.cancel()
+                    parts.append("")
+                    parts.append(f"[... truncated: {len(todo) - index} additional files not shown ...]")
+                    break
+
+                future, position = slots[index]
+                try:
+                    result = future.result()[position]
+                    if isinstance(result, Exception):
+                        raise result
+                    text = result.text
+                    text_chars = len(text)
+
+                    # Add to output
+                    parts.append("")
+                    parts.append(_SEP)
+                    parts.append(f"FILE: {rel_path}")
+                    parts.append(f"TYPE: {file_type}")
+                    parts.append(_SEP)
+                    parts.append(text[:10000])  # Limit per file
+                    total_chars += min(text_chars, 10000)
+
+                    processed_files.append({
+                        "path": rel_path,
+                        "type": file_type,
+                        "chars": text_chars,
+                    })
+
+                except Exception as e:
+                    processed_files.append({
+                        "path": rel_path,
+                        "type": "error",
+                        "error": str(e),
+                    })
+
+        if len(processed_files) != len(todo):
+            parts[3] = f"Processed: {len(processed_files)}"
+
+        full_text = "\n".join(parts)
 
         return ParsedContent(
             text=full_text,
@@ -796,41 +1548,202 @@ class ArchiveParser(BaseParser):
             }
         )
 
-    def _build_inventory(self, directory: Path) -> Dict[str, Any]:
-        """Build inventory of archive contents."""
-        from .base import get_parser
+    def _build_inventory(
+        self, directory: Path, collectors: Optional[Dict[str, Tuple[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build inventory of archive contents.
+
+        Args:
+            directory: Extracted archive directory
+            collectors: Optional {key: (rel_dir, pattern)} map. Files below
+                rel_dir whose '/'-separated relative path matches the
+                fnmatch pattern (one segment per directory level) are listed,
+                sorted, under inventory['collectors'][key]. Platform parsers
+                use this instead of globbing the tree a second time.
+        """
+        inventory, _ = self._scan_directory(directory, collectors)
+        return inventory
+
+    def _scan_directory(
+        self,
+        directory: Path,
+        collectors: Optional[Dict[str, Tuple[str, str]]] = None,
+        process: bool = False,
+    ) -> Tuple[Dict[str, Any], List[Tuple[str, str, BaseParser, Path]]]:
+        """
+        Walk an extracted archive once, counting and optionally listing files.
 
+        Args:
+            directory: Extracted archive directory
+            collectors: See _build_inventory
+            process: Also return the supported files, in name order, as
+                (rel_path, file_type, parser, path) entries for
+                _render_generic_archive
+
+        Returns:
+            (inventory, files to parse); the list is empty unless process
+        """
         total = 0
         supported = 0
         skipped = 0
         by_type: Dict[str, int] = {}
+        suffix_cache = self._new_suffix_cache()
+        todo = []
+
+        base = os.fspath(directory)
+        rel_start = len(os.path.join(base, ''))
+        matchers = [
+            (key, os.path.join(base, rel_dir, ''), pattern, pattern.count('/'))
+            for key, (rel_dir, pattern) in (collectors or {}).items()
+        ]
+        collected: Dict[str, List[str]] = {key: [] for key in (collectors or {})}
 
-        for file_path in directory.rglob('*'):
-            if not file_path.is_file():
-                continue
+        files = list(self._scandir_files(directory, sort=process))
+        sniffed = self._sniff_parsers(
+            [path_str for path_str, _, suffix in files if suffix in _CONTENT_SNIFFED_SUFFIXES]
+        )
 
+        for path_str, _, suffix in files:
             total += 1
-            suffix = file_path.suffix.lower()
 
-            if suffix in self.SKIP_EXTENSIONS:
+            for key, prefix, pattern, depth in matchers:
+                if path_str.startswith(prefix):
+                    rest = path_str[len(prefix):]
+                    if rest.count(os.sep) == depth and fnmatchcase(rest.replace(os.sep, '/'), pattern):
+                        collected[key].append(path_str)
+
+            file_path = Path(path_str)
+            parser = sniffed.get(path_str, _UNCACHED)
+            if parser is _UNCACHED:
+                parser = self._resolve_parser(file_path, suffix, suffix_cache)
+            if parser is _SKIPPED:
                 skipped += 1
                 by_type['media/binary'] = by_type.get('media/binary', 0) + 1
                 continue
-
-            parser = get_parser(file_path)
-            if parser:
-                supported += 1
-                file_type = parser.get_file_type()
-                by_type[file_type] = by_type.get(file_type, 0) + 1
-            else:
+            if parser is None:
                 by_type['unknown'] = by_type.get('unknown', 0) + 1
+                continue
 
-        return {
+            supported += 1
+            file_type = parser.get_file_type()
+            by_type[file_type] = by_type.get(file_type, 0) + 1
+            if process:
+                todo.append((path_str[rel_start:], file_type, parser, file_path))
+
+        inventory = {
             "total_files": total,
             "supported_files": supported,
             "skipped_files": skipped,
             "by_type": by_type,
         }
+        if collectors:
+            inventory["collectors"] = {key: sorted(paths) for key, paths in collected.items()}
+
+        return inventory, todo
+
+    def _new_suffix_cache(self) -> Dict[str, Any]:
+        """Suffix -> parser cache for one walk, pre-seeded with skipped types."""
+        return dict.fromkeys(self.SKIP_EXTENSIONS, _SKIPPED)
+
+    def _resolve_parser(self, file_path: Path, suffix: str, suffix_cache: Dict[str, Any]):
+        """
+        Look up the parser for a file, memoised by suffix.
+
+        Large exports repeat a handful of extensions thousands of times, so
+        get_parser() runs once per suffix instead of once per file. Suffixes
+        whose parser choice depends on file content are never cached.
+
+        Returns:
+            Parser instance, None if unsupported, or _SKIPPED for media/binary
+        """
+        parser = suffix_cache.get(suffix, _UNCACHED)
+        if parser is _UNCACHED:
+            parser = get_parser(file_path)
+            if suffix not in _CONTENT_SNIFFED_SUFFIXES:
+                suffix_cache[suffix] = parser
+        return parser
+
+    def _sniff_parsers(self, paths: List[str]) -> Dict[str, Optional[BaseParser]]:
+        """
+        Look up parsers for content-sniffed files on a thread pool.
+
+        These cannot share a suffix cache entry, and choosing their parser
+        reads the start of each file, so an export with thousands of .json
+        files spends the walk waiting on I/O. Lookups overlap instead.
+
+        Returns:
+            path -> parser (None if unsupported); empty when there are too
+            few files to be worth a pool
+        """
+        if len(paths) < 2:
+            return {}
+
+        max_workers = min(self.MAX_PARSE_WORKERS, (os.cpu_count() or 4) * 4, len(paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(paths, executor.map(get_parser, map(Path, paths))))
+
+    def _count_entries(self, path: str, suffix: Optional[str] = None) -> int:
+        """
+        Count entries in a directory without building a list.
+
+        Args:
+            path: Directory to count
+            suffix: Only count names ending with this suffix
+
+        Returns:
+            Number of entries, 0 if the directory does not exist
+        """
+        count = 0
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if suffix is None or entry.name.endswith(suffix):
+                        count += 1
+        except (FileNotFoundError, NotADirectoryError):
+            return 0
+        return count
+
+    def _scandir_files(self, directory, sort: bool = False) -> Iterator[Tuple[str, str, str]]:
+        """
+        Recursively yield ``(path, name, suffix)`` for regular files.
+
+        Uses os.scandir so the type checks come from the DirEntry data
+        already fetched with the listing, instead of a stat() per file as
+        with Path.rglob() + is_file(). Symlinks are skipped. The suffix is
+        lowercased, taken from the name without building a Path.
+
+        Each directory is read into memory and its scandir handle closed
+        straight away; the walk keeps a stack of iterators over those
+        listings, so a file deep in the tree is not passed up through a
+        generator per level.
+
+        Args:
+            directory: Directory to walk
+            sort: Walk entries in name order, matching sorted(rglob('*'))
+        """
+        def listing(path) -> Iterator[os.DirEntry]:
+            try:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda e: e.name) if sort else list(it)
+            except PermissionError:
+                entries = []
+            return iter(entries)
+
+        stack = [listing(directory)]
+        while stack:
+            for entry in stack[-1]:
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    # Finish this folder before the rest of its parent
+                    stack.append(listing(entry.path))
+                    break
+                if entry.is_file(follow_symlinks=False):
+                    name = entry.name
+                    yield entry.path, name, _name_suffix(name)
+            else:
+                stack.pop()
 
 
 __all__ = ["ArchiveParser", "ArchiveSecurityError"]
@@ -1,19 +1,37 @@
 """
 Base parser interface and factory.
 
+The factory is safe to call from several threads at once: the registry
+and suffix index are built at import and never modified, and parser
+instances are shared because parsers keep no per-file state. A parser
+may be constructed, or a suffix probed, twice by threads racing on its
+first lookup, but only one result is kept.
+
 Copyright (c) 2025 Brent Lefebure / EhkoLabs
 Licensed under AGPLv3
 """
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from importlib import import_module
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List, Tuple
 
 from ..types import ParsedContent
 
 
 class BaseParser(ABC):
     """Abstract base for document parsers."""
+
+    # File extensions this parser handles, lowercase with the leading dot.
+    # Registered parsers get theirs from _PARSER_REGISTRY.
+    EXTENSIONS: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        registered = _PARSER_REGISTRY.get(cls.__name__)
+        if registered is not None:
+            cls.EXTENSIONS = registered[1]
     
     @abstractmethod
     def can_parse(self, path: Path) -> bool:
@@ -32,7 +50,137 @@ class BaseParser(ABC):
     
     def get_extensions(self) -> List[str]:
         """Return list of file extensions this parser handles."""
-        return []
+        return list(self.EXTENSIONS)
+
+    def parse_batch(self, paths: List[Path]) -> List[ParsedContent]:
+        """
+        Parse several files handled by this parser, in order.
+
+        The default parses them one at a time; parsers with per-call setup
+        worth sharing across files can override it.
+        """
+        return [self.parse(path) for path in paths]
+
+
+# Parser class name -> (module, extensions). This is the only place a
+# registered parser's extensions are written down: each class's EXTENSIONS
+# is filled in from here when it is defined, and the suffix index is built
+# from here without importing any parser module (or its optional
+# dependencies).
+_PARSER_REGISTRY = {
+    "InstagramHTMLParser": (".instagram", ()),  # Directories, no extension
+    "ArchiveParser": (".archive", (".zip", ".tar", ".tar.gz", ".tgz")),
+    "PDFParser": (".pdf", (".pdf",)),
+    "DocxParser": (".docx", (".docx",)),
+    "ICSParser": (".calendar", (".ics", ".ical")),
+    "VCFParser": (".contacts", (".vcf",)),
+    "NotionParser": (".notion", (".md",)),
+    "MarkdownParser": (".markdown", (".md", ".markdown")),
+    "EnhancedCSVParser": (".csv_enhanced", (".csv",)),
+    "CSVParser": (".csv_parser", (".csv",)),
+    "ExcelParser": (".excel", (".xlsx", ".xls", ".xlsm")),
+    "JSONExportParser": (".json_export", (".json",)),
+    "MboxParser": (".mbox", (".mbox",)),
+    "EmlParser": (".email", (".eml",)),
+    "MsgParser": (".email", (".msg",)),
+    "MessagesParser": (".messages", (".txt", ".xml", ".csv")),  # Various message export formats
+    "PlaintextParser": (".plaintext", (".txt", ".text")),
+}
+
+# Order in which get_parser() probes can_parse(); the first match wins
+_PARSER_PROBE_ORDER = (
+    "InstagramHTMLParser",  # Check Instagram exports (directories)
+    "ArchiveParser",        # Check archives first (ZIP, TAR)
+    "PDFParser",
+    "DocxParser",           # Check DOCX before plaintext
+    "ICSParser",            # Check ICS calendar files
+    "VCFParser",            # Check VCF contact files
+    "NotionParser",         # Check Notion exports (before markdown)
+    "MarkdownParser",
+    "EnhancedCSVParser",    # Enhanced CSV with format detection
+    "ExcelParser",          # Check Excel before plaintext
+    "JSONExportParser",     # Check JSON before plaintext
+    "MboxParser",           # Check MBOX before plaintext
+    "EmlParser",            # Check EML before plaintext
+    "MsgParser",            # Check MSG before plaintext
+    "MessagesParser",       # Check before plaintext (txt files might be messages)
+    "PlaintextParser",
+)
+
+# Suffixes where get_parser() can pick a different parser (or none) for two
+# files with the same extension, because a can_parse() ahead of the final
+# match peeks at the file content or the full name. Lookups for these must
+# not be memoised by suffix.
+_CONTENT_SNIFFED_SUFFIXES = frozenset({
+    ".docx",                    # DocxParser checks for a ZIP container
+    ".ics", ".ical",            # ICSParser looks for BEGIN:VCALENDAR
+    ".vcf",                     # VCFParser looks for BEGIN:VCARD
+    ".md",                      # NotionParser checks for ID-suffixed names
+    ".json", ".txt", ".xml",    # JSONExport/MessagesParser sniff the text
+    ".mbox", ".eml", ".msg",    # Email parsers check headers/signatures
+    ".gz",                      # ArchiveParser only takes *.tar.gz
+})
+
+
+# Parsers whose can_parse() looks at directories rather than a suffix, so
+# they stay candidates for every path whatever its extension
+_DIRECTORY_PARSERS = frozenset({"InstagramHTMLParser", "NotionParser"})
+
+# Suffixes a can_parse() accepts beyond its registered extensions
+_EXTRA_SUFFIXES = {
+    "ArchiveParser": (".gz",),      # *.tar.gz, whose suffix is .gz
+    "MessagesParser": (".json",),   # JSON message exports
+    "PlaintextParser": ("",),       # Extensionless files
+}
+
+
+def _build_suffix_index() -> Dict[str, Tuple[str, ...]]:
+    """Map each lowercase suffix to the parsers that may accept it, in probe order."""
+    suffixes = {}
+    for name in _PARSER_PROBE_ORDER:
+        for suffix in _PARSER_REGISTRY[name][1] + _EXTRA_SUFFIXES.get(name, ()):
+            suffixes.setdefault(suffix, set()).add(name)
+    return {
+        suffix: tuple(
+            name for name in _PARSER_PROBE_ORDER
+            if name in names or name in _DIRECTORY_PARSERS
+        )
+        for suffix, names in suffixes.items()
+    }
+
+
+# Suffix -> candidate parser names; any other suffix only reaches the
+# directory parsers (for directories), since no other can_parse() would
+# accept it
+_SUFFIX_INDEX = _build_suffix_index()
+_FALLBACK_CANDIDATES = tuple(
+    name for name in _PARSER_PROBE_ORDER if name in _DIRECTORY_PARSERS
+)
+
+
+# Suffix -> parser for files (not directories) with that suffix, filled in
+# by get_parser(). Only suffixes outside _CONTENT_SNIFFED_SUFFIXES are kept,
+# as every can_parse() reached by such a file looks at nothing but its name.
+_FILE_PARSER_CACHE: Dict[str, Optional[BaseParser]] = {}
+_UNCACHED = object()
+
+
+@lru_cache(maxsize=None)
+def _get_parser_class(name: str) -> type:
+    """Import a registered parser class on first use."""
+    module_name, _ = _PARSER_REGISTRY[name]
+    return getattr(import_module(module_name, __package__), name)
+
+
+@lru_cache(maxsize=None)
+def _get_parser_instance(name: str) -> BaseParser:
+    """
+    Shared instance of a registered parser, created on first use.
+
+    Parsers keep no per-file state, so one instance serves every lookup
+    (and every thread) instead of being rebuilt for each file.
+    """
+    return _get_parser_class(name)()
 
 
 def get_parser(path: Path) -> Optional[BaseParser]:
@@ -45,43 +193,29 @@ def get_parser(path: Path) -> Optional[BaseParser]:
     Returns:
         Parser instance or None if unsupported
     """
-    from .pdf import PDFParser
-    from .markdown import MarkdownParser
-    from .plaintext import PlaintextParser
-    from .messages import MessagesParser
-    from .json_export import JSONExportParser
-    from .excel import ExcelParser
-    from .csv_parser import CSVParser
-    from .csv_enhanced import EnhancedCSVParser
-    from .mbox import MboxParser
-    from .docx import DocxParser
-    from .email import EmlParser, MsgParser
-    from .archive import ArchiveParser
-    from .calendar import ICSParser
-    from .contacts import VCFParser
-    from .notion import NotionParser
-    from .instagram import InstagramHTMLParser
-
-    parsers = [
-        InstagramHTMLParser(), # Check Instagram exports (directories)
-        ArchiveParser(),     # Check archives first (ZIP, TAR)
-        PDFParser(),
-        DocxParser(),        # Check DOCX before plaintext
-        ICSParser(),         # Check ICS calendar files
-        VCFParser(),         # Check VCF contact files
-        NotionParser(),      # Check Notion exports (before markdown)
-        MarkdownParser(),
-        EnhancedCSVParser(), # Enhanced CSV with format detection
-        ExcelParser(),       # Check Excel before plaintext
-        JSONExportParser(),  # Check JSON before plaintext
-        MboxParser(),        # Check MBOX before plaintext
-        EmlParser(),         # Check EML before plaintext
-        MsgParser(),         # Check MSG before plaintext
-        MessagesParser(),    # Check before plaintext (txt files might be messages)
-        PlaintextParser(),
-    ]
-
-    for parser in parsers:
+    suffix = path.suffix.lower()
+    candidates = _SUFFIX_INDEX.get(suffix)
+    if candidates is None:
+        # Only the directory parsers take an unknown suffix, so a file
+        # with one is unsupported without probing anything
+        if not path.is_dir():
+            return None
+        candidates = _FALLBACK_CANDIDATES
+    elif suffix not in _CONTENT_SNIFFED_SUFFIXES and not path.is_dir():
+        parser = _FILE_PARSER_CACHE.get(suffix, _UNCACHED)
+        if parser is _UNCACHED:
+            parser = _probe(
+                (name for name in candidates if name not in _DIRECTORY_PARSERS), path
+            )
+            _FILE_PARSER_CACHE[suffix] = parser
+        return parser
+    return _probe(candidates, path)
+
+
+def _probe(names: Iterable[str], path: Path) -> Optional[BaseParser]:
+    """First of the named parsers whose can_parse() accepts the path."""
+    for name in names:
+        parser = _get_parser_instance(name)
         if parser.can_parse(path):
             return parser
 
@@ -90,49 +224,21 @@ def get_parser(path: Path) -> Optional[BaseParser]:
 
 def get_all_parsers() -> List[BaseParser]:
     """Get list of all available parsers."""
-    from .pdf import PDFParser
-    from .markdown import MarkdownParser
-    from .plaintext import PlaintextParser
-    from .messages import MessagesParser
-    from .json_export import JSONExportParser
-    from .excel import ExcelParser
-    from .csv_parser import CSVParser
-    from .csv_enhanced import EnhancedCSVParser
-    from .mbox import MboxParser
-    from .docx import DocxParser
-    from .email import EmlParser, MsgParser
-    from .archive import ArchiveParser
-    from .calendar import ICSParser
-    from .contacts import VCFParser
-    from .notion import NotionParser
-    from .instagram import InstagramHTMLParser
-
-    return [
-        InstagramHTMLParser(),
-        ArchiveParser(),
-        PDFParser(),
-        DocxParser(),
-        ICSParser(),
-        VCFParser(),
-        NotionParser(),
-        MarkdownParser(),
-        EnhancedCSVParser(),
-        ExcelParser(),
-        JSONExportParser(),
-        MboxParser(),
-        EmlParser(),
-        MsgParser(),
-        MessagesParser(),
-        PlaintextParser(),
-    ]
+    return [_get_parser_instance(name) for name in _PARSER_PROBE_ORDER]
+
+
+@lru_cache(maxsize=1)
+def _supported_extensions() -> Tuple[str, ...]:
+    """Sorted union of the registered extensions, computed once."""
+    extensions = set()
+    for name in _PARSER_PROBE_ORDER:
+        extensions.update(_PARSER_REGISTRY[name][1])
+    return tuple(sorted(extensions))
 
 
 def get_supported_extensions() -> List[str]:
     """Get all supported file extensions."""
-    extensions = set()
-    for parser in get_all_parsers():
-        extensions.update(parser.get_extensions())
-    return sorted(extensions)
+    return list(_supported_extensions())
 
 
 __all__ = [
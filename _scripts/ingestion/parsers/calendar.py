@@ -13,15 +13,309 @@ Copyright (c) 2025 Brent Lefebure / EhkoLabs
 Licensed under AGPLv3
 """
 
+import codecs
+import mmap
+import os
+import re
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Union
 from datetime import datetime, timezone, timedelta, date
 from collections import defaultdict
+from zoneinfo import ZoneInfo
 
 from .base import BaseParser
 from ..types import ParsedContent
 
 
+# Event text layout
+_FMT_DATE = '%Y-%m-%d'
+_FMT_TIME = '%H:%M'
+_FMT_DATETIME = '%Y-%m-%d %H:%M'
+_FMT_DATETIME_UTC = '%Y-%m-%d %H:%M UTC'
+_MAX_LISTED_ATTENDEES = 10
+_MAX_SHOWN_DESCRIPTION = 200
+
+# Sort position of events without a start time
+_MIN_DT = datetime.min.replace(tzinfo=timezone.utc)
+
+# Address after the last mailto: of any case, up to the next colon
+_MAILTO_RE = re.compile(r".*mailto:([^:]*)", re.IGNORECASE | re.ASCII | re.DOTALL)
+
+# Property names, and parameter lists the fast path can skip over safely
+_NAME_RE = re.compile(r"[A-Za-z0-9-]+\Z")
+_PARAM_VALUE = r'(?:"[^"]*"|[^";:,\\^]*)'
+_PARAMS_RE = re.compile(rf"(?:;[A-Za-z0-9-]+={_PARAM_VALUE}(?:,{_PARAM_VALUE})*)*\Z")
+_PARAM_RE = re.compile(rf";([A-Za-z0-9-]+)=({_PARAM_VALUE})")
+
+# TEXT backslash escapes (icalendar's unescape_backslash)
+_TEXT_ESCAPE_RE = re.compile(r"\\([\\,;:nN])")
+
+_DATE_RE = re.compile(r"(\d{4})(\d\d)(\d\d)\Z", re.ASCII)
+_DATETIME_RE = re.compile(r"(\d{4})(\d\d)(\d\d)T(\d\d)(\d\d)(\d\d)(Z?)\Z", re.ASCII)
+_DURATION_RE = re.compile(
+    r"([-+]?)P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?\Z", re.ASCII
+)
+
+# RRULE parts whose values icalendar validates, and the forms accepted here
+_RECUR_INT_RE = re.compile(r"[+-]?\d+\Z", re.ASCII)
+_RECUR_WEEKDAY_RE = re.compile(r"[+-]?\d{0,2}(?:SU|MO|TU|WE|TH|FR|SA)\Z", re.ASCII | re.IGNORECASE)
+_RECUR_PART_RES = {
+    "COUNT": _RECUR_INT_RE,
+    "INTERVAL": _RECUR_INT_RE,
+    "BYSECOND": _RECUR_INT_RE,
+    "BYMINUTE": _RECUR_INT_RE,
+    "BYHOUR": _RECUR_INT_RE,
+    "BYWEEKNO": _RECUR_INT_RE,
+    "BYMONTHDAY": _RECUR_INT_RE,
+    "BYYEARDAY": _RECUR_INT_RE,
+    "BYSETPOS": _RECUR_INT_RE,
+    "BYMONTH": re.compile(r"\d+L?\Z", re.ASCII),
+    "BYDAY": _RECUR_WEEKDAY_RE,
+    "BYWEEKDAY": _RECUR_WEEKDAY_RE,
+    "WKST": _RECUR_WEEKDAY_RE,
+    "FREQ": re.compile(r"(?:SECONDLY|MINUTELY|HOURLY|DAILY|WEEKLY|MONTHLY|YEARLY)\Z", re.IGNORECASE),
+}
+_RECUR_UNSUPPORTED = frozenset({"SKIP", "RSCALE"})
+
+# VEVENT properties read by the parser; only ATTENDEE may repeat on the fast path
+_EVENT_PROPERTIES = frozenset({
+    "SUMMARY", "DTSTART", "DTEND", "DURATION", "LOCATION", "DESCRIPTION",
+    "ORGANIZER", "ATTENDEE", "RRULE", "STATUS", "CATEGORIES", "UID",
+})
+
+# A content line as (NAME, ";PARAM=value..." text, raw value)
+_ContentLine = Tuple[str, str, str]
+
+
+def _split_content_line(line: str) -> Optional[_ContentLine]:
+    """Split a content line, or None if icalendar might read it differently."""
+    split = line.find(':')
+    if split < 0:
+        return None
+    semi = line.find(';', 0, split)
+    if semi < 0:
+        name, params = line[:split], ''
+    else:
+        name = line[:semi]
+        # The value starts at the first colon outside a quoted parameter
+        quote = line.find('"', semi, split)
+        while quote >= 0:
+            close = line.find('"', quote + 1)
+            split = line.find(':', close + 1) if close >= 0 else -1
+            if split < 0:
+                return None
+            quote = line.find('"', close + 1, split)
+        params = line[semi:split]
+        if not _PARAMS_RE.match(params):
+            return None
+    if not _NAME_RE.match(name):
+        return None
+    return name.upper(), params, line[split + 1:]
+
+
+def _unescape_text(value: str) -> str:
+    """Undo TEXT backslash escapes."""
+    if '\\' not in value:
+        return value
+    return _TEXT_ESCAPE_RE.sub(lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+
+
+def _iter_ics_lines(buf: Union[bytes, mmap.mmap]) -> Iterator[str]:
+    """
+    Unfolded, decoded content lines of a calendar, one at a time.
+
+    Scans the buffer line by line so a memory-mapped file is never copied
+    whole. Matches icalendar's handling: CRLF or LF breaks, a leading
+    space or tab after a line break is a fold (also across blank lines),
+    and undecodable bytes become U+FFFD.
+    """
+    start = pos = len(codecs.BOM_UTF8) if buf[:3] == codecs.BOM_UTF8 else 0
+    end = len(buf)
+    parts: List[str] = []
+    while pos < end:
+        newline = buf.find(b'\n', pos)
+        line_start = pos
+        if newline < 0:
+            raw = buf[pos:end]
+            pos = end
+        else:
+            raw = buf[pos:newline - 1] if buf[newline - 1:newline] == b'\r' else buf[pos:newline]
+            pos = newline + 1
+        if not raw:
+            continue
+        if raw[:1] in (b' ', b'\t') and line_start > start:
+            parts.append(raw[1:].decode('utf-8', 'replace'))
+            continue
+        line = ''.join(parts)
+        if line:
+            yield line
+        parts = [raw.decode('utf-8', 'replace')]
+    line = ''.join(parts)
+    if line:
+        yield line
+
+
+def _fast_parse_ics(buf: Union[bytes, mmap.mmap]) -> Optional[Tuple[Dict[str, str], List[Dict[str, List[_ContentLine]]]]]:
+    """
+    Tokenize a calendar into its VEVENT properties without icalendar.
+
+    Returns (calendar properties, events), each event mapping property
+    name to its content lines. Only X-WR-TIMEZONE is kept at calendar
+    level, and only the properties the parser reads are kept per event.
+    Returns None for structures this tokenizer does not handle (malformed
+    lines or stray CRs, nested or stray events, several calendars), which
+    icalendar then parses instead.
+    """
+    calendar: Dict[str, str] = {}
+    events: List[Dict[str, List[_ContentLine]]] = []
+    stack: List[str] = []
+    event = None
+    closed = False
+    for line in _iter_ics_lines(buf):
+        # A stray CR can pair with a later LF once icalendar unfolds
+        parts = None if '\r' in line else _split_content_line(line)
+        if parts is None or closed:
+            return None
+        name, params, value = parts
+        if name == 'BEGIN':
+            component = _unescape_text(value).upper()
+            if params or (stack == [] and component != 'VCALENDAR'):
+                return None
+            if component == 'VEVENT':
+                if stack != ['VCALENDAR']:
+                    return None
+                event = {}
+            stack.append(component)
+        elif name == 'END':
+            if params or not stack or _unescape_text(value).upper() != stack.pop():
+                return None
+            if event is not None:
+                events.append(event)
+                event = None
+            closed = not stack
+        elif event is not None and len(stack) == 2:
+            if name in _EVENT_PROPERTIES:
+                lines = event.setdefault(name, [])
+                if lines and name != 'ATTENDEE':
+                    return None
+                lines.append(parts)
+        elif len(stack) == 1 and name == 'X-WR-TIMEZONE':
+            if name in calendar:
+                return None
+            calendar[name] = _unescape_text(value)
+        elif not stack:
+            return None
+
+    if not closed:
+        return None
+    return calendar, events
+
+
+def _fast_params(params: str) -> Dict[str, str]:
+    """Parameters of a date-time property; ValueError if any is unusual."""
+    result = {}
+    for key, value in _PARAM_RE.findall(params):
+        key = key.upper()
+        if value[:1] == '"':
+            value = value[1:-1]
+        if key in result or ',' in value or value != value.strip():
+            raise ValueError(f"Unsupported parameters: {params}")
+        result[key] = value
+    return result
+
+
+def _fast_text(line: _ContentLine, max_chars: Optional[int] = None) -> str:
+    """Value of a TEXT or CAL-ADDRESS property, optionally truncated."""
+    _, params, value = line
+    if 'VALUE=' in params.upper():
+        raise ValueError(f"Unsupported value type: {params}")
+    if max_chars is None:
+        return _unescape_text(value)
+    # An escape is two characters, so this prefix covers the kept text
+    return _unescape_text(value[:2 * max_chars])[:max_chars]
+
+
+def _fast_date_or_datetime(line: _ContentLine):
+    """DTSTART/DTEND value as icalendar reads it; ValueError if unsure."""
+    name, params, value = line
+    params = _fast_params(params)
+    kind = params.pop('VALUE', None)
+    tzid = params.pop('TZID', None)
+    if kind not in (None, 'DATE', 'DATE-TIME'):
+        raise ValueError(f"Unsupported {name} value type: {kind}")
+
+    match = _DATETIME_RE.match(value)
+    if match and kind != 'DATE':
+        year, month, day, hour, minute, second, utc = match.groups()
+        dt = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+        if tzid is not None:
+            # icalendar ignores a trailing Z when TZID is given; leave that to it
+            if utc or tzid != tzid.strip('/'):
+                raise ValueError(f"Unsupported {name}: {value}")
+            return dt.replace(tzinfo=ZoneInfo(tzid))
+        return dt.replace(tzinfo=timezone.utc) if utc else dt
+
+    match = _DATE_RE.match(value)
+    if match and kind != 'DATE-TIME' and tzid is None:
+        return date(*map(int, match.groups()))
+    raise ValueError(f"Unsupported {name}: {value}")
+
+
+def _fast_duration(line: _ContentLine) -> timedelta:
+    """DURATION value as a timedelta."""
+    _, params, value = line
+    match = _DURATION_RE.match(value)
+    if not match or 'VALUE=' in params.upper():
+        raise ValueError(f"Unsupported DURATION: {value}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=int(weeks or 0), days=int(days or 0),
+        hours=int(hours or 0), minutes=int(minutes or 0), seconds=int(seconds or 0),
+    )
+    return -duration if sign == '-' else duration
+
+
+def _fast_recur_frequency(line: _ContentLine) -> Tuple[bool, Optional[str]]:
+    """
+    Read an RRULE as icalendar would: (has any rule parts, FREQ value).
+
+    Raises ValueError for parts icalendar could reject, so those rules
+    are left to it.
+    """
+    _, params, value = line
+    if '\\' in value or 'VALUE=' in params.upper():
+        raise ValueError(f"Unsupported RRULE: {value}")
+    parts = {}
+    for pair in value.split(';'):
+        if pair.count('=') != 1:
+            continue  # icalendar skips these, e.g. a trailing semicolon
+        key, values = pair.split('=')
+        key = key.upper()
+        check = _RECUR_PART_RES.get(key)
+        if key in _RECUR_UNSUPPORTED or (
+            check and not all(check.match(v) for v in values.split(','))
+        ):
+            raise ValueError(f"Unsupported RRULE: {value}")
+        if key == 'UNTIL':
+            for until in values.split(','):
+                _fast_date_or_datetime(('UNTIL', '', until))
+        parts[key] = values
+    freq = parts.get('FREQ')
+    return bool(parts), freq.split(',')[0].upper() if freq else None
+
+
+def _mail_address(value: str) -> str:
+    """Address of an ORGANIZER/ATTENDEE, without any mailto: prefix."""
+    _, sep, address = value.rpartition('mailto:')
+    if not sep:
+        # The scheme is case-insensitive, e.g. Outlook writes MAILTO:
+        match = _MAILTO_RE.match(value)
+        if match is None:
+            return value
+        return match.group(1)
+    return address.partition(':')[0]
+
+
 class ICSParser(BaseParser):
     """
     Parse iCalendar (.ics) files.
@@ -53,6 +347,12 @@ class ICSParser(BaseParser):
         }
     }
 
+    # Calendars above this size are memory-mapped rather than read in
+    MMAP_MIN_SIZE = 1024 * 1024
+
+    # Descriptions are cut to this length
+    DESCRIPTION_MAX_CHARS = 500
+
     # Windows timezone ID to IANA mapping
     # Outlook uses Windows timezone names instead of IANA
     WINDOWS_TZ_MAP = {
@@ -71,21 +371,17 @@ class ICSParser(BaseParser):
         "UTC": "UTC",
     }
 
-    def get_extensions(self) -> List[str]:
-        return [".ics", ".ical"]
-
     def can_parse(self, path: Path) -> bool:
         """Check if this is an ICS file."""
-        if path.suffix.lower() not in self.get_extensions():
+        if path.suffix.lower() not in self.EXTENSIONS:
             return False
 
-        # Optionally verify it looks like ICS
+        # Verify it looks like ICS; the marker is ASCII, so no decoding needed
         try:
-            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                first_lines = f.read(500)
-                return 'BEGIN:VCALENDAR' in first_lines
+            with open(path, 'rb') as f:
+                return b'BEGIN:VCALENDAR' in f.read(512)
         except Exception:
-            return path.suffix.lower() in self.get_extensions()
+            return True
 
     def get_file_type(self) -> str:
         return "calendar"
@@ -124,7 +420,8 @@ class ICSParser(BaseParser):
         """
         Extract default timezone from calendar.
 
-        Google uses X-WR-TIMEZONE header.
+        Google uses X-WR-TIMEZONE header. Takes an icalendar Calendar or
+        the calendar properties from _fast_parse_ics().
         """
         # Check for X-WR-TIMEZONE (Google Calendar)
         x_wr_tz = cal.get('X-WR-TIMEZONE')
@@ -139,31 +436,42 @@ class ICSParser(BaseParser):
 
     def parse(self, path: Path) -> ParsedContent:
         """Parse ICS calendar file."""
-        try:
-            from icalendar import Calendar
-        except ImportError:
-            return ParsedContent(
-                text="[ICS parsing requires icalendar: pip install icalendar]",
-                title=path.stem,
-                metadata={"error": "icalendar_not_installed"}
-            )
-
         try:
             with open(path, 'rb') as f:
-                cal = Calendar.from_ical(f.read())
-
-            # Get default timezone
-            default_tz = self._get_calendar_timezone(cal)
+                if os.fstat(f.fileno()).st_size > self.MMAP_MIN_SIZE:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                        parsed = self._parse_fast(buf)
+                    data = None
+                else:
+                    data = f.read()
+                    parsed = self._parse_fast(data)
 
-            events = []
-            for component in cal.walk():
-                if component.name == 'VEVENT':
-                    event = self._extract_event(component, default_tz)
-                    if event:
-                        events.append(event)
+            if parsed is not None:
+                default_tz, events = parsed
+            else:
+                try:
+                    from icalendar import Calendar
+                except ImportError:
+                    return ParsedContent(
+                        text="[ICS parsing requires icalendar: pip install icalendar]",
+                        title=path.stem,
+                        metadata={"error": "icalendar_not_installed"}
+                    )
+
+                cal = Calendar.from_ical(data if data is not None else path.read_bytes())
+
+                # Get default timezone
+                default_tz = self._get_calendar_timezone(cal)
+
+                events = []
+                for component in cal.walk():
+                    if component.name == 'VEVENT':
+                        event = self._extract_event(component, default_tz)
+                        if event:
+                            events.append(event)
 
             # Sort chronologically by UTC time
-            events.sort(key=lambda e: e.get('start_utc') or datetime.min.replace(tzinfo=timezone.utc))
+            events.sort(key=lambda e: e.get('start_utc') or _MIN_DT)
 
             # Format as text
             text = self._format_events(events)
@@ -184,115 +492,209 @@ class ICSParser(BaseParser):
                 metadata={"error": "parse_failed", "details": str(e)}
             )
 
-    def _extract_event(self, component, default_tz: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Extract event data from VEVENT component."""
+    def _parse_fast(self, data: Union[bytes, mmap.mmap]) -> Optional[Tuple[Optional[str], List[Dict[str, Any]]]]:
+        """
+        Extract events with the line tokenizer instead of icalendar.
+
+        Gives the same events as the icalendar path for the calendars it
+        accepts; returns None for anything else so icalendar handles it.
+        """
+        parsed = _fast_parse_ics(data)
+        if parsed is None:
+            return None
+        calendar, raw_events = parsed
         try:
-            event = {}
-
-            # Summary (title)
-            summary = component.get('SUMMARY')
-            event['summary'] = str(summary) if summary else 'Untitled Event'
-
-            # Start time
-            dtstart = component.get('DTSTART')
-            if dtstart:
-                start = dtstart.dt
-                # Check if all-day event (date without time)
-                if isinstance(start, date) and not isinstance(start, datetime):
-                    event['all_day'] = True
-                    event['start'] = start
-                    event['start_utc'] = self._normalize_to_utc(start)
-                else:
-                    event['start'] = start
-                    event['start_utc'] = self._normalize_to_utc(start)
+            events = [self._extract_fast_event(props) for props in raw_events]
+        except (ValueError, KeyError, OverflowError):
+            # KeyError covers unknown TZIDs (ZoneInfoNotFoundError)
+            return None
+        return self._get_calendar_timezone(calendar), events
 
-            # End time
-            dtend = component.get('DTEND')
-            if dtend:
-                end = dtend.dt
-                event['end'] = end
-                event['end_utc'] = self._normalize_to_utc(end)
+    def _extract_fast_event(self, props: Dict[str, List[_ContentLine]]) -> Dict[str, Any]:
+        """
+        Build the _extract_event() dict from tokenized VEVENT properties.
 
-            # Duration (fallback if no end time)
-            duration = component.get('DURATION')
-            if duration and 'end' not in event and 'start' in event:
+        Raises ValueError for values icalendar might read differently.
+        """
+        event = {}
+
+        summary = _fast_text(props['SUMMARY'][0]) if 'SUMMARY' in props else None
+        event['summary'] = summary if summary else 'Untitled Event'
+
+        if 'DTSTART' in props:
+            start = _fast_date_or_datetime(props['DTSTART'][0])
+            if isinstance(start, date) and not isinstance(start, datetime):
+                event['all_day'] = True
+            event['start'] = start
+            event['start_utc'] = self._normalize_to_utc(start)
+
+        if 'DTEND' in props:
+            end = _fast_date_or_datetime(props['DTEND'][0])
+            event['end'] = end
+            event['end_utc'] = self._normalize_to_utc(end)
+
+        if 'DURATION' in props and 'end' not in event and 'start' in event:
+            duration = _fast_duration(props['DURATION'][0])
+            if event.get('start_utc'):
                 try:
-                    if hasattr(duration, 'dt'):
-                        dur = duration.dt
-                        if event.get('start_utc'):
-                            event['end_utc'] = event['start_utc'] + dur
-                except Exception:
+                    event['end_utc'] = event['start_utc'] + duration
+                except OverflowError:
                     pass
 
-            # Location
-            location = component.get('LOCATION')
-            if location:
-                event['location'] = str(location)
+        location = _fast_text(props['LOCATION'][0]) if 'LOCATION' in props else None
+        if location:
+            event['location'] = location
 
-            # Description
-            description = component.get('DESCRIPTION')
+        if 'DESCRIPTION' in props:
+            description = _fast_text(props['DESCRIPTION'][0], self.DESCRIPTION_MAX_CHARS)
             if description:
-                event['description'] = str(description)[:500]  # Limit length
+                event['description'] = description
 
-            # Organizer
-            organizer = component.get('ORGANIZER')
-            if organizer:
-                org_str = str(organizer)
-                if 'mailto:' in org_str.lower():
-                    event['organizer'] = org_str.split('mailto:')[-1].split(':')[0]
-                else:
-                    event['organizer'] = org_str
+        organizer = _fast_text(props['ORGANIZER'][0]) if 'ORGANIZER' in props else None
+        if organizer:
+            event['organizer'] = _mail_address(organizer)
 
-            # Attendees
-            attendees = component.get('ATTENDEE')
-            if attendees:
-                if not isinstance(attendees, list):
-                    attendees = [attendees]
-                event['attendees'] = []
-                for att in attendees:
-                    att_str = str(att)
-                    if 'mailto:' in att_str.lower():
-                        event['attendees'].append(att_str.split('mailto:')[-1].split(':')[0])
-                    else:
-                        event['attendees'].append(att_str)
+        attendees = [_fast_text(line) for line in props.get('ATTENDEE', ())]
+        # icalendar hands back a lone ATTENDEE as a value, so an empty one is skipped
+        if len(attendees) > 1 or (attendees and attendees[0]):
+            event['attendees'] = [_mail_address(att) for att in attendees]
 
-            # Recurring
-            rrule = component.get('RRULE')
-            if rrule:
+        if 'RRULE' in props:
+            has_parts, freq = _fast_recur_frequency(props['RRULE'][0])
+            if has_parts:
                 event['recurring'] = True
-                try:
-                    event['rrule'] = str(rrule.to_ical().decode('utf-8'))
-                    # Parse frequency for human-readable format
-                    rrule_dict = dict(rrule)
-                    freq = rrule_dict.get('FREQ', [None])[0]
-                    if freq:
-                        event['frequency'] = freq
-                except Exception:
-                    pass
+                event['rrule'] = props['RRULE'][0][2]
+                if freq:
+                    event['frequency'] = freq
 
-            # Status
-            status = component.get('STATUS')
-            if status:
-                event['status'] = str(status)
+        status = _fast_text(props['STATUS'][0]) if 'STATUS' in props else None
+        if status:
+            event['status'] = status
 
-            # Categories
-            categories = component.get('CATEGORIES')
-            if categories:
-                if hasattr(categories, 'cats'):
-                    event['categories'] = [str(c) for c in categories.cats]
-                else:
-                    event['categories'] = [str(categories)]
+        if 'CATEGORIES' in props:
+            _, params, value = props['CATEGORIES'][0]
+            if '\\' in value or 'VALUE=' in params.upper():
+                raise ValueError(f"Unsupported CATEGORIES: {value}")
+            event['categories'] = value.split(',')
+
+        uid = _fast_text(props['UID'][0]) if 'UID' in props else None
+        if uid:
+            event['uid'] = uid
+
+        return event
+
+    def _extract_event(self, component, default_tz: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Extract event data from VEVENT component."""
+        try:
+            event = {'summary': 'Untitled Event'}
+
+            # One pass over the properties present, instead of a lookup per
+            # property the parser knows about
+            handlers = self._EVENT_HANDLERS
+            for name, value in component.items():
+                handler = handlers.get(name)
+                if handler is not None and value:
+                    handler(self, event, value)
 
-            # UID for deduplication
-            uid = component.get('UID')
-            if uid:
-                event['uid'] = str(uid)
+            # Duration (fallback if no end time), once start and end are known
+            duration = component.get('DURATION')
+            if duration and 'end' not in event and 'start' in event:
+                try:
+                    if hasattr(duration, 'dt'):
+                        dur = duration.dt
+                        if event.get('start_utc'):
+                            event['end_utc'] = event['start_utc'] + dur
+                except Exception:
+                    pass
 
             return event
 
         except Exception:
             return None
 
+    def _read_summary(self, event: Dict[str, Any], summary) -> None:
+        """Summary (title)."""
+        event['summary'] = str(summary)
+
+    def _read_start(self, event: Dict[str, Any], dtstart) -> None:
+        """Start time; a date without time marks an all-day event."""
+        start = dtstart.dt
+        if isinstance(start, date) and not isinstance(start, datetime):
+            event['all_day'] = True
+        event['start'] = start
+        event['start_utc'] = self._normalize_to_utc(start)
+
+    def _read_end(self, event: Dict[str, Any], dtend) -> None:
+        """End time."""
+        end = dtend.dt
+        event['end'] = end
+        event['end_utc'] = self._normalize_to_utc(end)
+
+    def _read_location(self, event: Dict[str, Any], location) -> None:
+        """Location."""
+        event['location'] = str(location)
+
+    def _read_description(self, event: Dict[str, Any], description) -> None:
+        """Description, cut to DESCRIPTION_MAX_CHARS."""
+        # Slice before converting so a long description is not copied whole
+        if isinstance(description, str):
+            description = description[:self.DESCRIPTION_MAX_CHARS]
+        event['description'] = str(description)[:self.DESCRIPTION_MAX_CHARS]
+
+    def _read_organizer(self, event: Dict[str, Any], organizer) -> None:
+        """Organizer."""
+        event['organizer'] = _mail_address(str(organizer))
+
+    def _read_attendees(self, event: Dict[str, Any], attendees) -> None:
+        """Attendees; icalendar gives a lone ATTENDEE as a single value."""
+        if not isinstance(attendees, list):
+            attendees = [attendees]
+        event['attendees'] = [_mail_address(str(att)) for att in attendees]
+
+    def _read_rrule(self, event: Dict[str, Any], rrule) -> None:
+        """Recurrence rule and its frequency."""
+        event['recurring'] = True
+        try:
+            event['rrule'] = str(rrule.to_ical().decode('utf-8'))
+            # Parse frequency for human-readable format
+            rrule_dict = dict(rrule)
+            freq = rrule_dict.get('FREQ', [None])[0]
+            if freq:
+                event['frequency'] = freq
+        except Exception:
+            pass
+
+    def _read_status(self, event: Dict[str, Any], status) -> None:
+        """Status."""
+        event['status'] = str(status)
+
+    def _read_categories(self, event: Dict[str, Any], categories) -> None:
+        """Categories."""
+        if hasattr(categories, 'cats'):
+            event['categories'] = [str(c) for c in categories.cats]
+        else:
+            event['categories'] = [str(categories)]
+
+    def _read_uid(self, event: Dict[str, Any], uid) -> None:
+        """UID for deduplication."""
+        event['uid'] = str(uid)
+
+    # VEVENT property -> reader filling in the event dict. DURATION is read
+    # after the others, since it only applies without an end time.
+    _EVENT_HANDLERS = {
+        'SUMMARY': _read_summary,
+        'DTSTART': _read_start,
+        'DTEND': _read_end,
+        'LOCATION': _read_location,
+        'DESCRIPTION': _read_description,
+        'ORGANIZER': _read_organizer,
+        'ATTENDEE': _read_attendees,
+        'RRULE': _read_rrule,
+        'STATUS': _read_status,
+        'CATEGORIES': _read_categories,
+        'UID': _read_uid,
+    }
+
     def _format_events(self, events: List[Dict]) -> str:
         """Format events as readable text."""
         if not events:
@@ -302,9 +704,10 @@ class ICSParser(BaseParser):
             f"=== Calendar: {len(events)} Events ===",
             "",
         ]
+        emit = lines.append
 
         for event in events:
-            lines.append(f"--- Event: {event.get('summary', 'Untitled')} ---")
+            emit(f"--- Event: {event.get('summary', 'Untitled')} ---")
 
             # Date/time (use UTC normalized time)
             start = event.get('start_utc') or event.get('start')
@@ -313,59 +716,61 @@ class ICSParser(BaseParser):
             if start:
                 if event.get('all_day'):
                     if hasattr(start, 'strftime'):
-                        lines.append(f"Date: {start.strftime('%Y-%m-%d')} (All Day)")
+                        emit(f"Date: {start.strftime(_FMT_DATE)} (All Day)")
                     else:
-                        lines.append(f"Date: {start} (All Day)")
+                        emit(f"Date: {start} (All Day)")
                 else:
                     try:
-                        start_str = start.strftime('%Y-%m-%d %H:%M UTC')
+                        start_str = start.strftime(_FMT_DATETIME_UTC)
                         if end:
                             if hasattr(start, 'date') and hasattr(end, 'date') and start.date() == end.date():
-                                end_str = end.strftime('%H:%M')
+                                end_str = end.strftime(_FMT_TIME)
                             else:
-                                end_str = end.strftime('%Y-%m-%d %H:%M')
-                            lines.append(f"Date: {start_str} - {end_str}")
+                                end_str = end.strftime(_FMT_DATETIME)
+                            emit(f"Date: {start_str} - {end_str}")
                         else:
-                            lines.append(f"Date: {start_str}")
+                            emit(f"Date: {start_str}")
                     except Exception:
-                        lines.append(f"Date: {start}")
+                        emit(f"Date: {start}")
 
             # Location
             if event.get('location'):
-                lines.append(f"Location: {event['location']}")
+                emit(f"Location: {event['location']}")
 
             # Recurring with frequency
             if event.get('recurring'):
                 freq = event.get('frequency', 'Yes')
-                lines.append(f"Recurring: {freq}")
+                emit(f"Recurring: {freq}")
 
             # Status
             if event.get('status') and event['status'] != 'CONFIRMED':
-                lines.append(f"Status: {event['status']}")
+                emit(f"Status: {event['status']}")
 
             # Organizer
             if event.get('organizer'):
-                lines.append(f"Organizer: {event['organizer']}")
+                emit(f"Organizer: {event['organizer']}")
 
             # Attendees
-            if event.get('attendees'):
-                attendees = event['attendees'][:10]  # Limit display
-                lines.append(f"Attendees: {', '.join(attendees)}")
-                if len(event['attendees']) > 10:
-                    lines.append(f"  ... and {len(event['attendees']) - 10} more")
+            attendees = event.get('attendees')
+            if attendees:
+                if len(attendees) > _MAX_LISTED_ATTENDEES:  # Limit display
+                    emit(f"Attendees: {', '.join(attendees[:_MAX_LISTED_ATTENDEES])}")
+                    emit(f"  ... and {len(attendees) - _MAX_LISTED_ATTENDEES} more")
+                else:
+                    emit(f"Attendees: {', '.join(attendees)}")
 
             # Categories
             if event.get('categories'):
-                lines.append(f"Categories: {', '.join(event['categories'])}")
+                emit(f"Categories: {', '.join(event['categories'])}")
 
             # Description
-            if event.get('description'):
-                desc = event['description'][:200]
-                if len(event['description']) > 200:
-                    desc += '...'
-                lines.append(f"Description: {desc}")
+            description = event.get('description')
+            if description:
+                if len(description) > _MAX_SHOWN_DESCRIPTION:
+                    description = description[:_MAX_SHOWN_DESCRIPTION] + '...'
+                emit(f"Description: {description}")
 
-            lines.append("")
+            emit("")
 
         return "\n".join(lines)
 
@@ -383,54 +788,49 @@ class ICSParser(BaseParser):
         if not events:
             return metadata
 
-        # Date range (using UTC normalized times)
-        dates = [e['start_utc'] for e in events if e.get('start_utc')]
-        if dates:
-            try:
-                metadata['earliest_event'] = min(dates).isoformat()
-                metadata['latest_event'] = max(dates).isoformat()
-            except Exception:
-                pass
-
-        # Recurring count by frequency
-        recurring = [e for e in events if e.get('recurring')]
-        metadata['recurring_events'] = len(recurring)
-
+        # One pass over the events for every aggregate below
+        earliest = latest = None
+        recurring_count = all_day_count = 0
         freq_counts = defaultdict(int)
-        for e in recurring:
-            freq = e.get('frequency', 'UNKNOWN')
-            freq_counts[freq] += 1
-        if freq_counts:
-            metadata['recurring_by_frequency'] = dict(freq_counts)
-
-        # Unique locations
+        status_counts = defaultdict(int)
         locations = set()
+        attendees = set()
         for e in events:
+            start = e.get('start_utc')
+            if start:
+                if earliest is None or start < earliest:
+                    earliest = start
+                if latest is None or start > latest:
+                    latest = start
+            if e.get('recurring'):
+                recurring_count += 1
+                freq_counts[e.get('frequency', 'UNKNOWN')] += 1
             if e.get('location'):
                 locations.add(e['location'])
-        metadata['unique_locations'] = len(locations)
-        metadata['top_locations'] = sorted(locations)[:10]
-
-        # Unique attendees
-        attendees = set()
-        for e in events:
             if e.get('attendees'):
                 attendees.update(e['attendees'])
-        metadata['unique_attendees'] = len(attendees)
+            if e.get('all_day'):
+                all_day_count += 1
+            status_counts[e.get('status', 'CONFIRMED')] += 1
 
-        # All-day events
-        all_day = [e for e in events if e.get('all_day')]
-        metadata['all_day_events'] = len(all_day)
+        # Date range (using UTC normalized times)
+        if earliest is not None:
+            metadata['earliest_event'] = earliest.isoformat()
+            metadata['latest_event'] = latest.isoformat()
+
+        # Recurring count by frequency
+        metadata['recurring_events'] = recurring_count
+        if freq_counts:
+            metadata['recurring_by_frequency'] = dict(freq_counts)
 
-        # Cancelled events
-        cancelled = [e for e in events if e.get('status') == 'CANCELLED']
-        metadata['cancelled_events'] = len(cancelled)
+        # Unique locations and attendees
+        metadata['unique_locations'] = len(locations)
+        metadata['top_locations'] = sorted(locations)[:10]
+        metadata['unique_attendees'] = len(attendees)
 
-        # Events by status
-        status_counts = defaultdict(int)
-        for e in events:
-            status = e.get('status', 'CONFIRMED')
-            status_counts[status] += 1
+        # All-day, cancelled and per-status event counts
+        metadata['all_day_events'] = all_day_count
+        metadata['cancelled_events'] = status_counts.get('CANCELLED', 0)
         metadata['events_by_status'] = dict(status_counts)
 
         return metadata
@@ -55,9 +55,6 @@ class VCFParser(BaseParser):
     # Encoding fallback chain for legacy vCard files
     ENCODING_CHAIN = ['utf-8', 'utf-16', 'windows-1252', 'iso-8859-1']
 
-    def get_extensions(self) -> List[str]:
-        return [".vcf"]
-
     def can_parse(self, path: Path) -> bool:
         """Check if this is a VCF file."""
         if path.suffix.lower() != '.vcf':
@@ -133,9 +133,6 @@ class EnhancedCSVParser(BaseParser):
         },
     }
 
-    def get_extensions(self) -> List[str]:
-        return [".csv"]
-
     def can_parse(self, path: Path) -> bool:
         """Check if this is a CSV file."""
         return path.suffix.lower() == '.csv'
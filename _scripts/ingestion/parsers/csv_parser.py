@@ -9,7 +9,6 @@ Licensed under AGPLv3
 
 import csv
 from pathlib import Path
-from typing import List
 
 from .base import BaseParser
 from ..types import ParsedContent
@@ -25,9 +24,6 @@ class CSVParser(BaseParser):
     - Structured table data
     """
 
-    def get_extensions(self) -> List[str]:
-        return [".csv"]
-
     def can_parse(self, path: Path) -> bool:
         return path.suffix.lower() == ".csv"
 
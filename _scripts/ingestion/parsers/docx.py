@@ -10,7 +10,7 @@ Licensed under AGPLv3
 
 import re
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Optional, Dict, Any
 from datetime import datetime
 
 from .base import BaseParser
@@ -40,9 +40,6 @@ class DocxParser(BaseParser):
         }
     }
 
-    def get_extensions(self) -> List[str]:
-        return [".docx"]
-
     def can_parse(self, path: Path) -> bool:
         if path.suffix.lower() != ".docx":
             return False
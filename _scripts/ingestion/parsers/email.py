@@ -38,9 +38,6 @@ class EmlParser(BaseParser):
         }
     }
 
-    def get_extensions(self) -> List[str]:
-        return [".eml"]
-
     def can_parse(self, path: Path) -> bool:
         if path.suffix.lower() != ".eml":
             return False
@@ -255,9 +252,6 @@ class MsgParser(BaseParser):
         }
     }
 
-    def get_extensions(self) -> List[str]:
-        return [".msg"]
-
     def can_parse(self, path: Path) -> bool:
         if path.suffix.lower() != ".msg":
             return False
@@ -8,7 +8,7 @@ Licensed under AGPLv3
 """
 
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 from .base import BaseParser
@@ -25,11 +25,8 @@ class ExcelParser(BaseParser):
     - Structured table data
     """
     
-    def get_extensions(self) -> List[str]:
-        return [".xlsx", ".xls", ".xlsm"]
-    
     def can_parse(self, path: Path) -> bool:
-        return path.suffix.lower() in self.get_extensions()
+        return path.suffix.lower() in self.EXTENSIONS
     
     def get_file_type(self) -> str:
         return "excel"
@@ -186,10 +186,6 @@ class InstagramHTMLParser(BaseParser):
         if not HAS_BS4:
             logger.warning("BeautifulSoup4 not installed. Install with: pip install beautifulsoup4 lxml")
 
-    def get_extensions(self) -> List[str]:
-        # Instagram exports are directories, not files with extensions
-        return []
-
     def can_parse(self, path: Path) -> bool:
         """
         Check if path is an Instagram HTML export directory.
@@ -49,9 +49,6 @@ class JSONExportParser(BaseParser):
         self.progress_callback = progress_callback
         self._current_file: Optional[Path] = None
     
-    def get_extensions(self) -> List[str]:
-        return [".json"]
-    
     def can_parse(self, path: Path) -> bool:
         if path.suffix.lower() != ".json":
             return False
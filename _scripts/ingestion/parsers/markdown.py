@@ -19,9 +19,6 @@ from ..types import ParsedContent
 class MarkdownParser(BaseParser):
     """Parse Markdown files with YAML frontmatter."""
     
-    def get_extensions(self):
-        return [".md", ".markdown"]
-    
     FRONTMATTER_PATTERN = re.compile(
         r'^---\s*\n(.*?)\n---\s*\n',
         re.DOTALL
@@ -21,9 +21,6 @@ from ..types import ParsedContent
 class MboxParser(BaseParser):
     """Parse MBOX email archive files."""
 
-    def get_extensions(self) -> List[str]:
-        return [".mbox"]
-
     def can_parse(self, path: Path) -> bool:
         if path.suffix.lower() != ".mbox":
             return False
@@ -29,9 +29,6 @@ class MessagesParser(BaseParser):
     - Thread structure
     """
     
-    def get_extensions(self):
-        return [".txt", ".xml", ".csv"]  # Various message export formats
-    
     # WhatsApp patterns
     WHATSAPP_PATTERN = re.compile(
         r'^\[?(\d{1,2}/\d{1,2}/\d{2,4},?\s*\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)?)\]?\s*-?\s*([^:]+):\s*(.+)$',
@@ -53,9 +53,6 @@ class NotionParser(BaseParser):
     # Regex to detect Notion page ID suffix (e.g., "Page Name 123abc.md")
     NOTION_ID_PATTERN = re.compile(r'^(.+?)\s+([a-f0-9]{32}|[a-f0-9-]{36})$')
 
-    def get_extensions(self) -> List[str]:
-        return [".md"]
-
     def can_parse(self, path: Path) -> bool:
         """
         Check if this is a Notion export.
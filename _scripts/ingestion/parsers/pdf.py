@@ -25,9 +25,6 @@ from ..types import ParsedContent
 class PDFParser(BaseParser):
     """Parse PDF files."""
     
-    def get_extensions(self):
-        return [".pdf"]
-    
     def can_parse(self, path: Path) -> bool:
         if not HAS_PYPDF:
             return False
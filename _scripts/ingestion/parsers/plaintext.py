@@ -14,9 +14,6 @@ from ..types import ParsedContent
 class PlaintextParser(BaseParser):
     """Parse plain text files."""
     
-    def get_extensions(self):
-        return [".txt", ".text"]
-    
     def can_parse(self, path: Path) -> bool:
         # Accept .txt and extensionless files
         return path.suffix.lower() in (".txt", ".text", "")
@@ -0,0 +1,96 @@
+-- =============================================================================
+-- ReCog Schema Migration: Entity Blacklist WITHOUT ROWID
+-- Version: 0.12
+-- =============================================================================
+-- Run: sqlite3 recog.db < migration_v0_12_blacklist_without_rowid.sql
+-- =============================================================================
+-- Rebuilds entity_blacklist clustered on its natural key
+-- (entity_type, normalised_value). Lookups by value hit the table B-tree
+-- directly instead of going through a separate unique index to a rowid.
+--
+-- The integer id is kept as a UNIQUE secondary key so the API
+-- (DELETE /api/entities/blacklist/<id>) is unchanged. WITHOUT ROWID
+-- tables cannot AUTOINCREMENT, so an AFTER INSERT trigger gives new
+-- rows the next id from entity_blacklist_id_seq. Like AUTOINCREMENT,
+-- that counter never goes down, so ids of deleted rows are not reused
+-- (a stale DELETE or list_blacklist's after_id cursor would otherwise
+-- hit a different entry). Existing ids are copied across as-is.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS entity_blacklist_new (
+    id INTEGER UNIQUE,                      -- API handle, assigned by trigger
+
+    -- What was rejected
+    entity_type TEXT NOT NULL,              -- 'person', 'phone', 'email', 'organisation'
+    raw_value TEXT NOT NULL,                -- Original value as detected
+    normalised_value TEXT NOT NULL,         -- Normalised for matching
+
+    -- Why it was rejected
+    rejection_reason TEXT,                  -- 'not_a_person', 'common_word', 'false_positive', etc.
+    rejected_by TEXT DEFAULT 'user',        -- 'user', 'llm_validation', 'system'
+
+    -- Context for debugging
+    source_context TEXT,                    -- Where it was originally detected
+
+    -- Metadata
+    rejection_count INTEGER DEFAULT 1,      -- How many times rejected (for weighting)
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+
+    PRIMARY KEY (entity_type, normalised_value)
+) WITHOUT ROWID;
+
+-- Plain INSERT: the old table was UNIQUE(entity_type, normalised_value),
+-- so nothing collides, and if something did the migration fails (and
+-- rolls back) rather than dropping rows
+INSERT INTO entity_blacklist_new (
+    id, entity_type, raw_value, normalised_value,
+    rejection_reason, rejected_by, source_context,
+    rejection_count, created_at, updated_at
+)
+SELECT
+    id, entity_type, raw_value, normalised_value,
+    rejection_reason, rejected_by, source_context,
+    rejection_count, created_at, updated_at
+FROM entity_blacklist;
+
+-- Highest id handed out so far. Starts from the AUTOINCREMENT high-water
+-- mark, which is above MAX(id) when the newest entries were deleted; a
+-- re-run keeps the counter it already has.
+CREATE TABLE IF NOT EXISTS entity_blacklist_id_seq (
+    singleton INTEGER PRIMARY KEY CHECK (singleton = 1),
+    last_id INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO entity_blacklist_id_seq (singleton, last_id)
+SELECT 1, MAX(
+    COALESCE((SELECT MAX(id) FROM entity_blacklist), 0),
+    COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'entity_blacklist'), 0)
+);
+
+DROP TABLE entity_blacklist;
+ALTER TABLE entity_blacklist_new RENAME TO entity_blacklist;
+
+-- Dropped along with the old table
+CREATE INDEX IF NOT EXISTS idx_blacklist_normalised ON entity_blacklist(normalised_value);
+
+-- The listing index is built on the rebuilt table by v0.13
+
+CREATE TRIGGER IF NOT EXISTS trg_blacklist_assign_id
+AFTER INSERT ON entity_blacklist
+WHEN NEW.id IS NULL
+BEGIN
+    UPDATE entity_blacklist_id_seq SET last_id = last_id + 1;
+    UPDATE entity_blacklist
+    SET id = (SELECT last_id FROM entity_blacklist_id_seq)
+    WHERE entity_type = NEW.entity_type
+      AND normalised_value = NEW.normalised_value;
+END;
+
+-- Rows inserted with an explicit id move the counter past it
+CREATE TRIGGER IF NOT EXISTS trg_blacklist_track_id
+AFTER INSERT ON entity_blacklist
+WHEN NEW.id IS NOT NULL
+BEGIN
+    UPDATE entity_blacklist_id_seq SET last_id = MAX(last_id, NEW.id);
+END;
@@ -0,0 +1,28 @@
+-- =============================================================================
+-- ReCog Schema Migration: Entity Blacklist Keyset Pagination Index
+-- Version: 0.13
+-- =============================================================================
+-- Run: sqlite3 recog.db < migration_v0_13_blacklist_keyset_index.sql
+-- =============================================================================
+-- GET /api/entities/blacklist filters by entity_type and pages with a
+-- (rejection_count, created_at, id) cursor ordered entirely DESC. This
+-- index serves the filter, the cursor and the ORDER BY, so each page is a
+-- single index range scan starting just past the cursor, with no sort step.
+--
+-- It also carries every selected column so the query never touches the
+-- table. SQLite has no INCLUDE clause, so the payload columns are trailing
+-- keys; normalised_value rides along as part of the WITHOUT ROWID primary
+-- key (v0.12). The old idx_blacklist_type went with the v0.12 rebuild and
+-- is superseded by the leading entity_type column here.
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_blacklist_keyset ON entity_blacklist(
+    entity_type,
+    rejection_count DESC,
+    created_at DESC,
+    id DESC,
+    raw_value,
+    rejection_reason,
+    rejected_by,
+    updated_at
+);
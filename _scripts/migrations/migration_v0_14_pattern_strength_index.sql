@@ -0,0 +1,16 @@
+-- =============================================================================
+-- ReCog Schema Migration: Pattern Strength Index
+-- Version: 0.14
+-- =============================================================================
+-- Run: sqlite3 recog.db < migration_v0_14_pattern_strength_index.sql
+-- =============================================================================
+-- Patterns are listed strongest first (extraction report, pattern views).
+-- Without an index on strength every such read sorts the whole table in a
+-- temp b-tree; with it SQLite walks the index in order and streams rows.
+--
+-- Insights already have idx_insights_significance, which SQLite scans
+-- backwards for ORDER BY significance DESC, so no new insight index is
+-- needed.
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_patterns_strength ON patterns(strength DESC);
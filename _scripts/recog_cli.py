@@ -340,6 +340,7 @@ def cmd_db(args: list):
         print(f"\nDatabase: {path}")
         print(f"Tables: {result['total_tables']}")
         print(f"Total rows: {result['total_rows']}")
+        print(f"Journal mode: {result['journal_mode']}")
         print()
         
         for table, count in sorted(result["tables"].items()):
@@ -324,25 +324,28 @@ def _register_builtin_parsers(registry: ParserRegistry) -> None:
         from ingestion.parsers.email import EmlParser, MsgParser
         from ingestion.parsers.notion import NotionParser
 
-        # Register each parser with its MIME types and extensions
+        # Register each parser with its MIME types; extensions come from
+        # the parser itself so they cannot drift from get_parser()
         parser_configs = [
-            (ArchiveParser(), ['application/zip', 'application/x-tar'], ['.zip', '.tar', '.tar.gz', '.tgz']),
-            (ICSParser(), ['text/calendar'], ['.ics', '.ical']),
-            (VCFParser(), ['text/vcard'], ['.vcf']),
-            (EnhancedCSVParser(), ['text/csv'], ['.csv']),
-            (PDFParser(), ['application/pdf'], ['.pdf']),
-            (MarkdownParser(), ['text/markdown'], ['.md', '.markdown']),
-            (PlaintextParser(), ['text/plain'], ['.txt', '.text']),
-            (ExcelParser(), ['application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'], ['.xlsx', '.xls', '.xlsm']),
-            (JSONExportParser(), ['application/json'], ['.json']),
-            (MboxParser(), ['application/mbox'], ['.mbox']),
-            (DocxParser(), ['application/vnd.openxmlformats-officedocument.wordprocessingml.document'], ['.docx']),
-            (EmlParser(), ['message/rfc822'], ['.eml']),
-            (MsgParser(), ['application/vnd.ms-outlook'], ['.msg']),
-            (NotionParser(), ['application/x-notion'], []),  # Notion detected by structure
+            (ArchiveParser(), ['application/zip', 'application/x-tar']),
+            (ICSParser(), ['text/calendar']),
+            (VCFParser(), ['text/vcard']),
+            (EnhancedCSVParser(), ['text/csv']),
+            (PDFParser(), ['application/pdf']),
+            (MarkdownParser(), ['text/markdown']),
+            (PlaintextParser(), ['text/plain']),
+            (ExcelParser(), ['application/vnd.openxmlformats-officedocument.spreadsheetml.sheet']),
+            (JSONExportParser(), ['application/json']),
+            (MboxParser(), ['application/mbox']),
+            (DocxParser(), ['application/vnd.openxmlformats-officedocument.wordprocessingml.document']),
+            (EmlParser(), ['message/rfc822']),
+            (MsgParser(), ['application/vnd.ms-outlook']),
+            (NotionParser(), ['application/x-notion']),
         ]
 
-        for parser, mime_types, extensions in parser_configs:
+        for parser, mime_types in parser_configs:
+            # Notion detected by structure, so its .md must not shadow Markdown
+            extensions = [] if isinstance(parser, NotionParser) else parser.get_extensions()
             registry.register_legacy_parser(parser, mime_types, extensions)
 
         logger.info(f"Registered {len(parser_configs)} built-in parsers")
@@ -26,6 +26,7 @@ v0.3 Changes:
 
 import re
 import json
+import threading
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, Set
 
@@ -350,14 +351,16 @@ PEOPLE_TITLES_LOWER = {t.lower() for t in PEOPLE_TITLES}
 # BLACKLIST SUPPORT
 # =============================================================================
 
-# Runtime blacklist - loaded from database
+# Runtime blacklist - loaded from database, then kept in sync incrementally
+# by the API as entities are rejected or un-rejected
 _entity_blacklist: Set[str] = set()
+_blacklist_lock = threading.Lock()
 
 
 def load_blacklist_from_db(db_path) -> Set[str]:
     """
     Load blacklisted entity values from database.
-    Call this at startup or when blacklist changes.
+    Call this at startup or to resync after out-of-band changes.
     """
     global _entity_blacklist
     import sqlite3
@@ -369,17 +372,27 @@ def load_blacklist_from_db(db_path) -> Set[str]:
             SELECT normalised_value FROM entity_blacklist 
             WHERE entity_type = 'person'
         """)
-        _entity_blacklist = {row[0].lower() for row in cursor.fetchall()}
+        blacklist = {row[0].lower() for row in cursor.fetchall()}
         conn.close()
     except Exception:
-        _entity_blacklist = set()
+        blacklist = set()
     
-    return _entity_blacklist
+    with _blacklist_lock:
+        _entity_blacklist = blacklist
+    
+    return blacklist
 
 
 def add_to_blacklist(value: str) -> None:
     """Add a value to the runtime blacklist."""
-    _entity_blacklist.add(value.lower())
+    with _blacklist_lock:
+        _entity_blacklist.add(value.lower())
+
+
+def discard_from_blacklist(value: str) -> None:
+    """Remove a value from the runtime blacklist, if present."""
+    with _blacklist_lock:
+        _entity_blacklist.discard(value.lower())
 
 
 def is_blacklisted(value: str) -> bool:
@@ -389,7 +402,8 @@ def is_blacklisted(value: str) -> bool:
 
 def get_blacklist() -> Set[str]:
     """Get current blacklist."""
-    return _entity_blacklist.copy()
+    with _blacklist_lock:
+        return _entity_blacklist.copy()
 
 
 # =============================================================================
@@ -1504,6 +1518,7 @@ __all__ = [
     # Blacklist functions
     "load_blacklist_from_db",
     "add_to_blacklist",
+    "discard_from_blacklist",
     "is_blacklisted",
     "get_blacklist",
     # Constants
@@ -21,11 +21,17 @@ from pathlib import Path
 from uuid import uuid4
 from functools import wraps
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from flasgger import Swagger
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # ReCog imports
 from recog_engine import (
     # Tier 0
@@ -119,7 +125,7 @@ from recog_engine.injection_detector import (
     InjectionRisk,
 )
 from ingestion import detect_file, ingest_file
-from db import init_database, check_database
+from db import init_database, check_database, ConnectionPool, immediate_transaction
 
 # =============================================================================
 # CONFIGURATION
@@ -320,6 +326,9 @@ timeline_store = TimelineStore(Config.DB_PATH)
 state_machine = CaseStateMachine(Config.DB_PATH)
 cost_estimator = CostEstimator(Config.DB_PATH)
 
+# Shared connection pool for hot request paths
+db_pool = ConnectionPool(Config.DB_PATH)
+
 # Response cache for LLM results (v0.9)
 if Config.CACHE_ENABLED:
     response_cache = init_response_cache(
@@ -434,6 +443,26 @@ def api_response(data=None, error=None, status=200):
     return jsonify(response), status
 
 
+def fast_api_response(data=None, error=None, status=200):
+    """
+    api_response() serialised with orjson, for hot endpoints returning
+    large lists of plain JSON values (str, int, float, bool, None).
+
+    Falls back to api_response() when orjson is not installed.
+    """
+    if not HAS_ORJSON:
+        return api_response(data, error=error, status=status)
+    response = {
+        "success": error is None,
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+    if data is not None:
+        response["data"] = data
+    if error is not None:
+        response["error"] = error
+    return Response(orjson.dumps(response), status=status, mimetype="application/json")
+
+
 def require_json(f):
     """Decorator to require JSON body."""
     @wraps(f)
@@ -568,6 +597,7 @@ def health():
         db_status = check_database(Config.DB_PATH)
         db_info["tables"] = db_status.get("total_tables", 0)
         db_info["rows"] = db_status.get("total_rows", 0)
+        db_info["journal_mode"] = db_status.get("journal_mode")
 
         # Test write capability
         conn = _get_db_connection()
@@ -2869,6 +2899,71 @@ def validate_entities():
 # ENTITY BLACKLIST (False Positive Management)
 # =============================================================================
 
+# Hot blacklist queries are kept as module constants so every request
+# passes the same SQL to the pooled connections' statement caches.
+_SQL_UPSERT_BLACKLIST = """
+    INSERT INTO entity_blacklist (
+        entity_type, raw_value, normalised_value,
+        rejection_reason, rejected_by, source_context,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, 'user', ?, ?, ?)
+    ON CONFLICT(entity_type, normalised_value) DO UPDATE SET
+        rejection_count = entity_blacklist.rejection_count + 1,
+        updated_at = excluded.updated_at
+"""
+
+_SQL_SELECT_REGISTRY_ENTITY = """
+    SELECT id, entity_type, raw_value, normalised_value
+    FROM entity_registry
+    WHERE id = ?
+"""
+
+_SQL_DELETE_REGISTRY_ENTITY = "DELETE FROM entity_registry WHERE id = ?"
+
+# Most ids one bulk reject may name; keeps the IN (...) lookup well under
+# SQLite's bound-parameter limit
+_BULK_REJECT_MAX_IDS = 500
+
+
+def _blacklist_params(entity, reason: str, now: str) -> tuple:
+    """
+    _SQL_UPSERT_BLACKLIST parameters for rejecting a registry row.
+
+    Both reject routes go through here so a missing normalised_value falls
+    back to the same key (Python's Unicode-aware lower(), not SQLite's
+    ASCII-only one) and repeat rejections land on one blacklist row.
+    """
+    normalised = entity["normalised_value"] or entity["raw_value"].lower()
+    return (entity["entity_type"], entity["raw_value"], normalised, reason, None, now, now)
+
+_SQL_LIST_BLACKLIST = """
+    SELECT id, entity_type, raw_value, normalised_value,
+           rejection_reason, rejected_by, rejection_count,
+           created_at, updated_at
+    FROM entity_blacklist
+    WHERE entity_type = ?
+    ORDER BY rejection_count DESC, created_at DESC, id DESC
+    LIMIT ?
+"""
+
+# Keyset page: resumes strictly after the last row of the previous page
+_SQL_LIST_BLACKLIST_AFTER = """
+    SELECT id, entity_type, raw_value, normalised_value,
+           rejection_reason, rejected_by, rejection_count,
+           created_at, updated_at
+    FROM entity_blacklist
+    WHERE entity_type = ?
+      AND (rejection_count, created_at, id) < (?, ?, ?)
+    ORDER BY rejection_count DESC, created_at DESC, id DESC
+    LIMIT ?
+"""
+
+_SQL_DELETE_BLACKLIST_ENTRY = """
+    DELETE FROM entity_blacklist WHERE id = ?
+    RETURNING entity_type, normalised_value
+"""
+
+
 @app.route("/api/entities/<int:entity_id>/reject", methods=["POST"])
 @require_json
 def reject_entity(entity_id: int):
@@ -2906,58 +3001,121 @@ def reject_entity(entity_id: int):
     reason = data.get("reason", "not_a_person")
     delete_entity = data.get("delete_entity", True)
     
-    # Get entity details first
-    entity = entity_registry.get_entity_by_id(entity_id)
-    if not entity:
+    now = datetime.now(timezone.utc).isoformat() + "Z"
+    
+    with db_pool.borrow() as conn:
+        # Read the registry row, blacklist it (or bump its rejection count)
+        # and optionally delete it, in a single transaction
+        with immediate_transaction(conn):
+            entity = conn.execute(_SQL_SELECT_REGISTRY_ENTITY, (entity_id,)).fetchone()
+            
+            if entity is not None:
+                params = _blacklist_params(entity, reason, now)
+                conn.execute(_SQL_UPSERT_BLACKLIST, params)
+                if delete_entity:
+                    conn.execute(_SQL_DELETE_REGISTRY_ENTITY, (entity_id,))
+    
+    if entity is None:
         return api_response(error="Entity not found", status=404)
     
-    now = datetime.now(timezone.utc).isoformat() + "Z"
+    entity_type, raw_value, normalised, *_ = params
     
-    conn = _get_db_connection()
-    try:
-        # Add to blacklist
-        try:
-            conn.execute("""
-                INSERT INTO entity_blacklist (
-                    entity_type, raw_value, normalised_value,
-                    rejection_reason, rejected_by, source_context,
-                    created_at, updated_at
-                ) VALUES (?, ?, ?, ?, 'user', ?, ?, ?)
-            """, (
-                entity.get("entity_type"),
-                entity.get("raw_value"),
-                entity.get("normalised_value") or entity.get("raw_value", "").lower(),
-                reason,
-                None,  # Could store source context
-                now, now
-            ))
-        except Exception:
-            # Already blacklisted - increment count
-            conn.execute("""
-                UPDATE entity_blacklist 
-                SET rejection_count = rejection_count + 1, updated_at = ?
-                WHERE entity_type = ? AND normalised_value = ?
-            """, (now, entity.get("entity_type"), entity.get("normalised_value")))
-        
-        # Optionally delete from registry
-        if delete_entity:
-            conn.execute("DELETE FROM entity_registry WHERE id = ?", (entity_id,))
-        
-        conn.commit()
-        
-        # Update runtime blacklist
+    # Update runtime blacklist (tier0 only screens person names)
+    if entity_type == "person":
         from recog_engine.tier0 import add_to_blacklist
-        add_to_blacklist(entity.get("normalised_value") or entity.get("raw_value"))
-        
-        return api_response({
-            "rejected": True,
-            "entity_id": entity_id,
-            "value": entity.get("raw_value"),
-            "reason": reason,
-            "deleted": delete_entity,
-        })
-    finally:
-        conn.close()
+        add_to_blacklist(normalised)
+    
+    return api_response({
+        "rejected": True,
+        "entity_id": entity_id,
+        "value": raw_value,
+        "reason": reason,
+        "deleted": delete_entity,
+    })
+
+
+@app.route("/api/entities/blacklist/bulk", methods=["POST"])
+@require_json
+def bulk_reject_entities():
+    """
+    Reject many entities as false positives in one transaction.
+    ---
+    tags:
+      - Entities
+    requestBody:
+      content:
+        application/json:
+          schema:
+            type: object
+            required: [entity_ids]
+            properties:
+              entity_ids:
+                type: array
+                maxItems: 500
+                items:
+                  type: integer
+              reason:
+                type: string
+                enum: [not_a_person, common_word, false_positive]
+                default: not_a_person
+              delete_entity:
+                type: boolean
+                default: true
+    responses:
+      200:
+        description: Entities rejected and blacklisted
+      400:
+        description: entity_ids missing, invalid or longer than 500
+    """
+    data = request.get_json() or {}
+    entity_ids = data.get("entity_ids")
+    reason = data.get("reason", "not_a_person")
+    delete_entity = data.get("delete_entity", True)
+    
+    # bool is a subclass of int, so true/false must be turned away explicitly
+    if (not isinstance(entity_ids, list) or not entity_ids
+            or not all(isinstance(i, int) and not isinstance(i, bool) for i in entity_ids)):
+        return api_response(error="entity_ids must be a non-empty list of integers", status=400)
+    
+    entity_ids = list(dict.fromkeys(entity_ids))
+    if len(entity_ids) > _BULK_REJECT_MAX_IDS:
+        return api_response(
+            error=f"entity_ids may name at most {_BULK_REJECT_MAX_IDS} entities per request",
+            status=400,
+        )
+    
+    now = datetime.now(timezone.utc).isoformat() + "Z"
+    placeholders = ",".join("?" * len(entity_ids))
+    
+    with db_pool.borrow() as conn:
+        # Read inside the write transaction so a concurrent delete or merge
+        # cannot change the rows between the lookup and the upsert
+        with immediate_transaction(conn):
+            entities = conn.execute(
+                f"SELECT id, entity_type, raw_value, normalised_value FROM entity_registry WHERE id IN ({placeholders})",
+                entity_ids,
+            ).fetchall()
+            
+            rows = [_blacklist_params(entity, reason, now) for entity in entities]
+            conn.executemany(_SQL_UPSERT_BLACKLIST, rows)
+            if delete_entity:
+                conn.executemany(_SQL_DELETE_REGISTRY_ENTITY, [(entity["id"],) for entity in entities])
+    
+    # Update runtime blacklist (tier0 only screens person names)
+    from recog_engine.tier0 import add_to_blacklist
+    for entity_type, _, normalised, *_ in rows:
+        if entity_type == "person":
+            add_to_blacklist(normalised)
+    
+    found = {entity["id"] for entity in entities}
+    
+    return api_response({
+        "rejected": len(rows),
+        "entity_ids": [i for i in entity_ids if i in found],
+        "not_found": [i for i in entity_ids if i not in found],
+        "reason": reason,
+        "deleted": delete_entity,
+    })
 
 
 @app.route("/api/entities/blacklist", methods=["GET"])
@@ -2978,44 +3136,53 @@ def list_blacklist():
         schema:
           type: integer
           default: 100
+      - name: after_count
+        in: query
+        description: Cursor from the previous page's next_cursor
+        schema:
+          type: integer
+      - name: after_created_at
+        in: query
+        schema:
+          type: string
+      - name: after_id
+        in: query
+        schema:
+          type: integer
     responses:
       200:
-        description: Blacklisted entities
+        description: Blacklisted entities, with next_cursor when more may follow
     """
     entity_type = request.args.get("type", "person")
     limit = int(request.args.get("limit", 100))
-    
-    conn = _get_db_connection()
-    try:
-        cursor = conn.execute("""
-            SELECT id, entity_type, raw_value, normalised_value,
-                   rejection_reason, rejected_by, rejection_count,
-                   created_at, updated_at
-            FROM entity_blacklist
-            WHERE entity_type = ?
-            ORDER BY rejection_count DESC, created_at DESC
-            LIMIT ?
-        """, (entity_type, limit))
+    after_count = request.args.get("after_count", type=int)
+    after_created_at = request.args.get("after_created_at")
+    after_id = request.args.get("after_id", type=int)
+    
+    with db_pool.borrow() as conn:
+        if after_count is not None and after_created_at and after_id is not None:
+            cursor = conn.execute(
+                _SQL_LIST_BLACKLIST_AFTER,
+                (entity_type, after_count, after_created_at, after_id, limit),
+            )
+        else:
+            cursor = conn.execute(_SQL_LIST_BLACKLIST, (entity_type, limit))
+        items = [dict(row) for row in cursor]
         
-        items = []
-        for row in cursor.fetchall():
-            items.append({
-                "id": row["id"],
-                "entity_type": row["entity_type"],
-                "raw_value": row["raw_value"],
-                "normalised_value": row["normalised_value"],
-                "rejection_reason": row["rejection_reason"],
-                "rejected_by": row["rejected_by"],
-                "rejection_count": row["rejection_count"],
-                "created_at": row["created_at"],
-            })
+        next_cursor = None
+        if items and len(items) == limit:
+            last = items[-1]
+            next_cursor = {
+                "after_count": last["rejection_count"],
+                "after_created_at": last["created_at"],
+                "after_id": last["id"],
+            }
         
-        return api_response({
+        return fast_api_response({
             "blacklist": items,
             "count": len(items),
+            "next_cursor": next_cursor,
         })
-    finally:
-        conn.close()
 
 
 @app.route("/api/entities/blacklist/<int:blacklist_id>", methods=["DELETE"])
@@ -3037,31 +3204,31 @@ def remove_from_blacklist(blacklist_id: int):
       404:
         description: Entry not found
     """
-    conn = _get_db_connection()
-    try:
-        row = conn.execute(
-            "SELECT normalised_value FROM entity_blacklist WHERE id = ?",
-            (blacklist_id,)
-        ).fetchone()
+    with db_pool.borrow() as conn:
+        with immediate_transaction(conn):
+            row = conn.execute(_SQL_DELETE_BLACKLIST_ENTRY, (blacklist_id,)).fetchone()
         
         if not row:
             return api_response(error="Blacklist entry not found", status=404)
         
-        conn.execute("DELETE FROM entity_blacklist WHERE id = ?", (blacklist_id,))
-        conn.commit()
+        # Update runtime blacklist
+        if row["entity_type"] == "person":
+            from recog_engine.tier0 import discard_from_blacklist
+            discard_from_blacklist(row["normalised_value"])
         
         return api_response({
             "removed": True,
             "blacklist_id": blacklist_id,
         })
-    finally:
-        conn.close()
 
 
 @app.route("/api/entities/blacklist/reload", methods=["POST"])
 def reload_blacklist():
     """
     Reload blacklist from database into runtime memory.
+
+    Reject and remove keep the runtime blacklist in sync, so this is only
+    needed after the table is changed outside the API.
     ---
     tags:
       - Entities
@@ -11,6 +11,7 @@ as they use Flask's test client.
 
 import sys
 import json
+import sqlite3
 import tempfile
 from pathlib import Path
 
@@ -34,6 +35,22 @@ def client():
         yield client
 
 
+@pytest.fixture
+def blacklist_db(tmp_path, monkeypatch):
+    """Point the entity/blacklist routes at a throwaway database."""
+    import server
+    from db import ConnectionPool, init_database
+    from recog_engine import EntityRegistry
+
+    db_path = init_database(tmp_path / "recog.db")
+    pool = ConnectionPool(db_path, size=1)
+    registry = EntityRegistry(db_path)
+    monkeypatch.setattr(server, "db_pool", pool)
+    monkeypatch.setattr(server, "entity_registry", registry)
+    yield registry
+    pool.close()
+
+
 @pytest.fixture
 def sample_text():
     """Sample text for analysis."""
@@ -189,6 +206,153 @@ def test_entities_unknown(client):
     assert 'entities' in data['data']
 
 
+# =============================================================================
+# ENTITY BLACKLIST TESTS
+# =============================================================================
+
+def test_blacklist_list(client):
+    """Blacklist endpoint should return blacklisted values."""
+    response = client.get('/api/entities/blacklist?type=person&limit=10')
+
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['success'] is True
+    assert 'blacklist' in data['data']
+    assert data['data']['count'] == len(data['data']['blacklist'])
+
+
+def test_reject_entity_upserts_blacklist(client, blacklist_db):
+    """Rejecting the same value twice should bump its rejection count."""
+    for _ in range(2):
+        entity_id, _ = blacklist_db.register_entity("person", "Quentaris")
+        response = client.post(
+            f'/api/entities/{entity_id}/reject',
+            json={'reason': 'common_word'},
+        )
+        assert response.status_code == 200
+        assert blacklist_db.get_entity_by_id(entity_id) is None
+
+    data = json.loads(client.get('/api/entities/blacklist?type=person').data)
+    assert data['data']['count'] == 1
+    entry = data['data']['blacklist'][0]
+    assert entry['normalised_value'] == 'Quentaris'
+    assert entry['rejection_count'] == 2
+
+
+def test_reject_routes_share_unicode_key(client, blacklist_db):
+    """Single and bulk rejects should fold a non-ASCII name to one entry."""
+    def register_unnormalised():
+        entity_id, _ = blacklist_db.register_entity("person", "Élodie")
+        conn = sqlite3.connect(str(blacklist_db.db_path))
+        conn.execute("UPDATE entity_registry SET normalised_value = NULL WHERE id = ?", (entity_id,))
+        conn.commit()
+        conn.close()
+        return entity_id
+
+    client.post(f'/api/entities/{register_unnormalised()}/reject', json={})
+    client.post('/api/entities/blacklist/bulk', json={'entity_ids': [register_unnormalised()]})
+
+    data = json.loads(client.get('/api/entities/blacklist?type=person').data)
+    assert data['data']['count'] == 1
+    entry = data['data']['blacklist'][0]
+    assert entry['normalised_value'] == 'élodie'
+    assert entry['rejection_count'] == 2
+
+
+def test_remove_from_blacklist(client, blacklist_db):
+    """Removing a blacklist entry should delete it exactly once."""
+    from recog_engine.tier0 import is_blacklisted
+
+    entity_id, _ = blacklist_db.register_entity("person", "Quentaris")
+    client.post(f'/api/entities/{entity_id}/reject', json={})
+    entry = json.loads(client.get('/api/entities/blacklist').data)['data']['blacklist'][0]
+
+    assert is_blacklisted("Quentaris")
+
+    response = client.delete(f"/api/entities/blacklist/{entry['id']}")
+    assert response.status_code == 200
+    assert json.loads(response.data)['data']['removed'] is True
+    assert not is_blacklisted("Quentaris")
+
+    response = client.delete(f"/api/entities/blacklist/{entry['id']}")
+    assert response.status_code == 404
+
+
+def test_bulk_reject_entities(client, blacklist_db):
+    """Bulk reject should blacklist and delete every known entity."""
+    ids = [blacklist_db.register_entity("person", name)[0] for name in ("Quentaris", "Velmora")]
+
+    response = client.post(
+        '/api/entities/blacklist/bulk',
+        json={'entity_ids': ids + [999999], 'reason': 'common_word'},
+    )
+
+    assert response.status_code == 200
+    result = json.loads(response.data)['data']
+    assert result['rejected'] == 2
+    assert result['not_found'] == [999999]
+    assert all(blacklist_db.get_entity_by_id(i) is None for i in ids)
+
+    data = json.loads(client.get('/api/entities/blacklist?type=person').data)
+    assert {e['normalised_value'] for e in data['data']['blacklist']} == {'Quentaris', 'Velmora'}
+
+
+def test_blacklist_keyset_pagination(client, blacklist_db):
+    """Following next_cursor should walk every entry exactly once."""
+    names = ["Quentaris", "Velmora", "Orlanth", "Brisk", "Tamsin"]
+    ids = [blacklist_db.register_entity("person", name)[0] for name in names]
+    client.post('/api/entities/blacklist/bulk', json={'entity_ids': ids})
+
+    seen = []
+    params = {'type': 'person', 'limit': 2}
+    while True:
+        page = json.loads(client.get('/api/entities/blacklist', query_string=params).data)['data']
+        seen.extend(entry['normalised_value'] for entry in page['blacklist'])
+        if page['next_cursor'] is None:
+            break
+        params.update(page['next_cursor'])
+
+    assert sorted(seen) == sorted(names)
+
+
+def test_bulk_reject_requires_ids(client, blacklist_db):
+    """Bulk reject should reject a missing or malformed id list."""
+    for body in ('"all"', '[true]', json.dumps(list(range(1, 502)))):
+        response = client.post('/api/entities/blacklist/bulk', json={'entity_ids': json.loads(body)})
+        assert response.status_code == 400, body
+
+    response = client.post('/api/entities/blacklist/bulk', data='null', content_type='application/json')
+    assert response.status_code == 400
+
+
+def test_reject_unknown_entity(client, blacklist_db):
+    """Rejecting a missing entity should return 404."""
+    response = client.post('/api/entities/999999/reject', json={})
+
+    assert response.status_code == 404
+
+
+def test_blacklist_list_without_orjson(client, monkeypatch):
+    """Blacklist listing should fall back to the stdlib encoder."""
+    import server
+    monkeypatch.setattr(server, "HAS_ORJSON", False)
+
+    response = client.get('/api/entities/blacklist')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.data)['success'] is True
+
+
+def test_blacklist_remove_unknown(client):
+    """Removing a missing blacklist entry should return 404."""
+    response = client.delete('/api/entities/blacklist/999999999')
+
+    assert response.status_code == 404
+    data = json.loads(response.data)
+    assert data['success'] is False
+
+
 # =============================================================================
 # INSIGHTS ENDPOINTS TESTS
 # =============================================================================
@@ -0,0 +1,751 @@
+"""
+ReCog Archive Parser Tests - ZIP/TAR Handling
+
+Tests extraction, generic archive processing and platform export detection.
+
+Run with: pytest tests/test_archive.py -v
+"""
+
+import io
+import json
+import os
+import sys
+import tarfile
+import types
+import zipfile
+import zlib
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingestion.parsers import archive as archive_module
+from ingestion.parsers.archive import ArchiveParser, ArchiveSecurityError
+from ingestion.types import ParsedContent
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+GENERIC_FILES = {
+    "notes/a.md": "# Title\n\nSome markdown here.\n",
+    "notes/b.txt": "Plain text file.\nLine two.\n",
+    "img/pic.jpg": b"\xff\xd8\xff" + b"0" * 50,
+    "data/x.csv": "name,age\nbob,3\nalice,4\n",
+    "weird.xyz": "unknown",
+    "z.md": "# Z",
+}
+
+
+def _as_bytes(content):
+    return content if isinstance(content, bytes) else content.encode("utf-8")
+
+
+def make_zip(path: Path, files: dict) -> Path:
+    """Write a ZIP archive containing the given files."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return path
+
+
+def make_tar(path: Path, files: dict, mode: str = "w:gz") -> Path:
+    """Write a TAR archive containing the given files."""
+    with tarfile.open(path, mode) as tf:
+        for name, content in files.items():
+            data = _as_bytes(content)
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+
+def make_tree(base: Path, files: dict) -> Path:
+    """Write files under a directory."""
+    for name, content in files.items():
+        target = base / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(_as_bytes(content))
+    return base
+
+
+# =============================================================================
+# GENERIC ARCHIVES
+# =============================================================================
+
+@pytest.mark.parametrize("name", ["bundle.zip", "bundle.tar", "bundle.tar.gz"])
+def test_generic_archive_processes_supported_files(tmp_path, name):
+    """Supported files are parsed in path order; media is skipped."""
+    if name.endswith(".zip"):
+        archive = make_zip(tmp_path / name, GENERIC_FILES)
+    else:
+        mode = "w:gz" if name.endswith(".gz") else "w"
+        archive = make_tar(tmp_path / name, GENERIC_FILES, mode)
+
+    result = ArchiveParser().parse(archive)
+
+    inventory = result.metadata["inventory"]
+    assert inventory["total_files"] == 6
+    assert inventory["skipped_files"] == 1
+    paths = [f["path"] for f in result.metadata["processed_files"]]
+    assert paths == sorted(paths)
+    assert "notes/a.md" in paths
+    assert "img/pic.jpg" not in paths
+    assert "FILE: notes/b.txt" in result.text
+
+
+def test_generic_archive_records_parse_errors_in_order(tmp_path, monkeypatch):
+    """A failing file is reported in place without stopping the others."""
+    from ingestion.parsers.markdown import MarkdownParser
+
+    original = MarkdownParser.parse
+
+    def flaky_parse(self, path):
+        if path.name == "a.md":
+            raise ValueError("boom")
+        return original(self, path)
+
+    monkeypatch.setattr(MarkdownParser, "parse", flaky_parse)
+    archive = make_zip(tmp_path / "bundle.zip", GENERIC_FILES)
+
+    processed = ArchiveParser().parse(archive).metadata["processed_files"]
+
+    assert [f["path"] for f in processed] == ["data/x.csv", "notes/a.md", "notes/b.txt", "z.md"]
+    assert processed[1] == {"path": "notes/a.md", "type": "error", "error": "boom"}
+    assert processed[3]["type"] == "markdown"
+
+
+def test_generic_archive_batches_by_parser(tmp_path, monkeypatch):
+    """Files of one parser type go through parse_batch() in bounded chunks."""
+    from ingestion.parsers.base import BaseParser
+
+    batches = []
+    original = BaseParser.parse_batch
+
+    def recording_batch(self, paths):
+        batches.append((type(self).__name__, [p.name for p in paths]))
+        return original(self, paths)
+
+    monkeypatch.setattr(BaseParser, "parse_batch", recording_batch)
+    files = {f"doc{n}.csv": "a,b\n1,2\n" for n in range(5)}
+    archive = make_tar(tmp_path / "bundle.tar.gz", dict(files, **{"notes.markdown": "# N"}))
+    parser = ArchiveParser()
+    parser.PARSE_BATCH_SIZE = 2
+    parser.MAX_PARSE_WORKERS = 1
+
+    result = parser.parse(archive)
+
+    assert sorted(len(names) for _, names in batches) == [1, 1, 2, 2]
+    assert sorted(name for _, names in batches for name in names) == sorted(files) + ["notes.markdown"]
+    assert [f["path"] for f in result.metadata["processed_files"]] == sorted(files) + ["notes.markdown"]
+
+
+def test_generic_archive_output_budget(tmp_path):
+    """Past the output budget remaining files are dropped with a marker."""
+    archive = make_zip(tmp_path / "bundle.zip", GENERIC_FILES)
+    parser = ArchiveParser()
+    parser.MAX_OUTPUT_CHARS = 10
+
+    result = parser.parse(archive)
+
+    processed = result.metadata["processed_files"]
+    assert [f["path"] for f in processed] == ["data/x.csv"]
+    assert "Processed: 1" in result.text
+    assert result.text.endswith("[... truncated: 3 additional files not shown ...]")
+    assert result.metadata["inventory"]["supported_files"] == 4
+
+
+def test_generic_zip_streams_members(tmp_path, monkeypatch):
+    """Generic ZIPs match the extracted result but only extract what gets parsed."""
+    files = dict(GENERIC_FILES, **{"README": "Read me\r\nplease", "notes/c.markdown": "# C\n\nbody"})
+    zip_path = make_zip(tmp_path / "bundle.zip", files)
+    tgz_path = make_tar(tmp_path / "bundle.tgz", files)
+
+    extracted = []
+    original_extract = zipfile.ZipFile.extract
+
+    def recording_extract(self, member, *args, **kwargs):
+        extracted.append(getattr(member, "filename", member))
+        return original_extract(self, member, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, "extract", recording_extract)
+
+    streamed = ArchiveParser().parse(zip_path)
+    reference = ArchiveParser().parse(tgz_path)
+
+    assert streamed.text == reference.text.replace("bundle.tgz", "bundle.zip")
+    assert streamed.metadata["processed_files"] == reference.metadata["processed_files"]
+    assert streamed.metadata["inventory"] == reference.metadata["inventory"]
+    # Media and unknown members are never written out
+    assert sorted(extracted) == [
+        "README", "data/x.csv", "notes/a.md", "notes/b.txt", "notes/c.markdown", "z.md",
+    ]
+
+
+def test_generic_tar_streams_members(tmp_path):
+    """Plain TARs are read member by member with the same result."""
+    files = dict(GENERIC_FILES, **{"README": "Read me\r\nplease", "notes/c.markdown": "# C\n\nbody"})
+    tar_path = make_tar(tmp_path / "bundle.tar", files, "w")
+    tgz_path = make_tar(tmp_path / "bundle.tgz", files)
+
+    streamed = ArchiveParser().parse(tar_path)
+    reference = ArchiveParser().parse(tgz_path)
+
+    assert streamed.text == reference.text.replace("bundle.tgz", "bundle.tar")
+    assert streamed.metadata["processed_files"] == reference.metadata["processed_files"]
+    assert streamed.metadata["inventory"] == reference.metadata["inventory"]
+
+
+def test_inventory_counts_types(tmp_path):
+    """Inventory tallies supported, skipped and unknown files."""
+    directory = make_tree(tmp_path, GENERIC_FILES)
+    inventory = ArchiveParser()._build_inventory(directory)
+
+    assert inventory["total_files"] == 6
+    assert inventory["supported_files"] == 4
+    assert inventory["by_type"]["media/binary"] == 1
+    assert inventory["by_type"]["unknown"] == 1
+
+
+def test_parser_lookup_cached_only_for_suffix_decided_types(tmp_path):
+    """Suffix caching must not leak a content-sniffed parser to other files."""
+    directory = make_tree(tmp_path, {
+        "chat.json": '{"messages": [{"role": "user", "content": "hi"}]}',
+        "config.json": '{"debug": true}',
+        "a.csv": "x,y\n1,2\n",
+        "b.csv": "x,y\n3,4\n",
+    })
+    parser = ArchiveParser()
+    cache = parser._new_suffix_cache()
+
+    resolved = {
+        name: parser._resolve_parser(directory / name, Path(name).suffix, cache)
+        for name in ("chat.json", "config.json", "a.csv", "b.csv")
+    }
+
+    assert type(resolved["config.json"]) is not type(resolved["chat.json"])
+    assert resolved["b.csv"] is resolved["a.csv"]
+    assert ".json" not in cache
+
+
+def test_inventory_collectors_match_by_level(tmp_path):
+    """Collectors pick files at the pattern's depth below their folder."""
+    directory = make_tree(tmp_path, {
+        "Connections.csv": "a,b\n",
+        "Profile.csv": "a,b\n",
+        "nested/Other.csv": "a,b\n",
+        "messages/inbox/bob_1/message_1.json": "{}",
+        "messages/inbox/bob_1/photos/p.jpg": b"x",
+    })
+
+    inventory = ArchiveParser()._build_inventory(directory, collectors={
+        "csv": ("", "*.csv"),
+        "threads": ("messages/inbox", "*/*"),
+    })
+
+    names = {key: [Path(p).name for p in paths] for key, paths in inventory["collectors"].items()}
+    assert names == {"csv": ["Connections.csv", "Profile.csv"], "threads": ["message_1.json"]}
+    assert inventory["total_files"] == 5
+
+
+def test_scandir_walk_matches_sorted_rglob(tmp_path):
+    """The sorted walk lists regular files in sorted(rglob()) order."""
+    directory = make_tree(tmp_path, {
+        "b.txt": "b", "a/z.TXT": "z", "a/b/c/deep.md": "d", "a/b/c2.md": "c",
+        "a0.txt": "a", "c/x.json": "{}",
+    })
+    (directory / "empty").mkdir()
+
+    walked = [(path, suffix) for path, _, suffix in ArchiveParser()._scandir_files(directory, sort=True)]
+
+    expected = [(str(p), p.suffix.lower()) for p in sorted(directory.rglob("*")) if p.is_file()]
+    assert walked == expected
+
+
+def test_count_entries(tmp_path):
+    """Directory entries are counted, optionally by suffix; missing dirs are empty."""
+    directory = make_tree(tmp_path, {"a.json": "{}", "b.json": "{}", "c.txt": "", "sub/d.json": "{}"})
+    parser = ArchiveParser()
+
+    assert parser._count_entries(str(directory)) == 4
+    assert parser._count_entries(str(directory), ".json") == 2
+    assert parser._count_entries(str(directory / "missing")) == 0
+
+
+# =============================================================================
+# PLATFORM EXPORTS
+# =============================================================================
+
+@pytest.mark.parametrize("files, expected", [
+    ({"messages/inbox/bob/message_1.json": "{}"}, "facebook"),
+    ({"posts/your_posts_1.json": "[]"}, "facebook"),
+    ({"Takeout/Mail/all.mbox": "From x"}, "google_takeout"),
+    ({"data/tweets.js": "window.YTD.tweet.part0 = []"}, "twitter"),
+    ({"content/posts_1.json": "[]"}, "instagram"),
+    ({"Connections.csv": "a,b\n"}, "linkedin"),
+    ({"data/other.js": "[]", "messages/sent.json": "{}"}, None),
+    ({"random/file.txt": "hi"}, None),
+    ({"Connections.csv": "a,b\n", "posts/your_posts_1.json": "[]"}, "facebook"),
+    ({"data/tweet.js": "[]", "Takeout/x.txt": "x"}, "google_takeout"),
+])
+def test_detect_export_format(tmp_path, files, expected):
+    """Signature files identify the export platform; table order breaks ties."""
+    directory = make_tree(tmp_path / "tree", files)
+    parser = ArchiveParser()
+    assert parser._detect_export_format(directory) == expected
+
+    with zipfile.ZipFile(make_zip(tmp_path / "export.zip", files)) as zf:
+        assert parser._detect_zip_export_format(zf) == expected
+
+
+def test_detect_export_format_lists_only_signature_folders(tmp_path, monkeypatch):
+    """Detection reads directory listings, never stat()ing each signature."""
+    directory = make_tree(tmp_path / "tree", {
+        "data/other.js": "[]", "notes/a.txt": "a", "media/b.txt": "b",
+    })
+    listed = []
+    original_scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(os.path.relpath(path, directory))
+        return original_scandir(path)
+
+    def no_stat(*args, **kwargs):
+        raise AssertionError("signature probed with a stat() call")
+
+    monkeypatch.setattr(archive_module.os, "scandir", recording_scandir)
+    monkeypatch.setattr(archive_module.os.path, "exists", no_stat)
+
+    assert ArchiveParser()._detect_export_format(directory) is None
+    assert sorted(listed) == [".", "data"]
+
+
+def test_facebook_export_reads_threads(tmp_path):
+    """Facebook exports report threads and fix Meta's mojibake."""
+    thread = {
+        "title": "Bob",
+        "participants": [{"name": "Bob"}, {"name": "Me"}],
+        "messages": [{"sender_name": "Bob", "content": "cafÃ©"}],
+    }
+    archive = make_zip(tmp_path / "fb.zip", {
+        "messages/inbox/bob_1/message_1.json": json.dumps(thread),
+        "posts/your_posts_1.json": json.dumps([{"data": [{"post": "hello"}]}]),
+    })
+
+    result = ArchiveParser().parse(archive)
+
+    assert result.metadata["detected_format"] == "facebook"
+    assert result.metadata["message_count"] == 1
+    assert "Message Threads: 1" in result.text
+    assert "Bob: café" in result.text
+    assert "Post: hello" in result.text
+
+
+def test_meta_json_recoded_before_parsing(tmp_path):
+    """Meta's escaped mojibake is fixed at load; other escapes are untouched."""
+    path = tmp_path / "message_1.json"
+    path.write_text(json.dumps({
+        "title": "cafÃ©",
+        "names": ["æ\x97¥æ\x9c¬", "Ã"],
+        "literal": "\\u00e9 and a trailing \\",
+    }), encoding="utf-8")
+
+    data = ArchiveParser()._load_meta_json(path)
+
+    assert data["title"] == "café"
+    assert data["names"] == ["日本", "Ã"]
+    assert data["literal"] == "\\u00e9 and a trailing \\"
+
+
+@pytest.mark.parametrize("loads", ["default", "stdlib"])
+def test_twitter_js_wrapper_is_skipped(tmp_path, monkeypatch, loads):
+    """Twitter data files parse once the window.YTD assignment is skipped."""
+    if loads == "stdlib":
+        monkeypatch.setattr(archive_module, "_json_loads", json.loads)
+    path = tmp_path / "tweets.js"
+    path.write_text('window.YTD.tweet.part0 = [{"tweet": {"full_text": "héllo"}}]', encoding="utf-8")
+    parser = ArchiveParser()
+
+    assert parser._parse_twitter_js(path) == [{"tweet": {"full_text": "héllo"}}]
+
+    path.write_text("window.YTD.tweet.part0 = [oops", encoding="utf-8")
+    assert parser._parse_twitter_js(path) == []
+
+
+@pytest.mark.parametrize("chunk", [1, 5, 7, 64])
+def test_meta_recode_reader_matches_whole_file_fix(chunk):
+    """Streaming the Meta fix gives the same bytes at any read size."""
+    raw = json.dumps({
+        "a": "cafÃ©",
+        "b": "æ\x97¥æ\x9c¬ end",
+        "c": "\\u00e9\\\\",
+        "d": "Ã",
+    }).encode()
+    reader = archive_module._MetaRecodeReader(io.BytesIO(raw))
+
+    streamed = b"".join(iter(lambda: reader.read(chunk), b""))
+
+    assert streamed == archive_module._META_ESCAPE_RUN.sub(archive_module._fix_meta_run, raw)
+
+
+def test_large_meta_files_are_sampled_with_ijson(tmp_path, monkeypatch):
+    """Streamed sampling of big Meta files matches loading them whole."""
+    pytest.importorskip("ijson")
+    thread = {
+        "participants": [{"name": "BÃ¸b"}, {"name": "Me"}],
+        "messages": [
+            {"sender_name": "BÃ¸b", "content": f"message {n}", "timestamp_ms": n, "reactions": [{"r": "x"}]}
+            for n in range(8)
+        ],
+        "title": "BÃ¸b",
+    }
+    archive = make_zip(tmp_path / "fb.zip", {
+        "messages/inbox/bob_1/message_1.json": json.dumps(thread),
+        "posts/your_posts_1.json": json.dumps([{"data": [{"post": f"p{n}"}]} for n in range(5)]),
+    })
+
+    loaded = ArchiveParser().parse(archive)
+    monkeypatch.setattr(ArchiveParser, "META_STREAM_MIN_SIZE", 0)
+    streamed = ArchiveParser().parse(archive)
+
+    assert streamed.text == loaded.text
+    assert streamed.metadata == loaded.metadata
+    assert "--- Thread: Bøb ---" in streamed.text
+    assert "Messages: 8" in streamed.text
+    assert "Post: p2" in streamed.text and "Post: p3" not in streamed.text
+
+
+def test_platform_export_results_are_cached(tmp_path, monkeypatch):
+    """Unchanged platform exports are served from the cache; generic ones never are."""
+    files = {"Connections.csv": "a,b\n", "Profile.csv": "a,b\n"}
+    archive = make_zip(tmp_path / "linkedin.zip", files)
+    generic = make_zip(tmp_path / "bundle.zip", GENERIC_FILES)
+    parser = ArchiveParser()
+    parser.CACHE_DIR = str(tmp_path / "cache")
+
+    first = parser.parse(archive)
+    parser.parse(generic)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    def no_extract(*args, **kwargs):
+        raise AssertionError("archive was extracted")
+
+    monkeypatch.setattr(ArchiveParser, "_extract_zip_members", no_extract)
+    assert parser.parse(archive) == first
+
+    make_zip(archive, dict(files, **{"Positions.csv": "a,b\n"}))
+    monkeypatch.undo()
+    assert parser.parse(archive).metadata["csv_files"] == ["Connections.csv", "Positions.csv", "Profile.csv"]
+
+
+@pytest.mark.parametrize("files, limit", [
+    ({"Connections.csv": "a,b\n"}, None),
+    (GENERIC_FILES, 1),
+])
+def test_zip_members_are_checked_once(tmp_path, monkeypatch, files, limit):
+    """Exports and over-limit ZIPs reuse parse()'s member check and handle."""
+    archive = make_zip(tmp_path / "export.zip", files)
+    parser = ArchiveParser()
+    if limit is not None:
+        parser.MAX_EXTRACTED_SIZE = limit
+
+    checks = []
+    original_check = ArchiveParser._check_zip_members
+
+    def counting_check(self, zf, dest):
+        checks.append(zf)
+        return original_check(self, zf, dest)
+
+    def no_reopen(*args, **kwargs):
+        raise AssertionError("archive was opened again for extraction")
+
+    monkeypatch.setattr(ArchiveParser, "_check_zip_members", counting_check)
+    monkeypatch.setattr(ArchiveParser, "_extract_archive", no_reopen)
+
+    result = parser.parse(archive)
+    assert len(checks) == 1
+    assert result.metadata.get("error") == ("archive_too_large" if limit else None)
+
+
+def test_archive_cache_is_versioned_and_cleans_up(tmp_path, monkeypatch):
+    """A new CACHE_VERSION misses old entries; failed writes leave no temp file."""
+    archive = make_zip(tmp_path / "linkedin.zip", {"Connections.csv": "a,b\n", "Profile.csv": "a,b\n"})
+    cache_dir = tmp_path / "cache"
+    parser = ArchiveParser()
+    parser.CACHE_DIR = str(cache_dir)
+
+    old_entry = parser._cache_file(archive)
+    parser.CACHE_VERSION += 1
+    assert parser._cache_file(archive) != old_entry
+
+    unserialisable = ParsedContent(text="x", metadata={"bad": object()})
+    parser._store_cached(parser._cache_file(archive), unserialisable)
+    assert list(cache_dir.iterdir()) == []
+
+
+# =============================================================================
+# SECURITY
+# =============================================================================
+
+@pytest.mark.parametrize("name", ["evil.zip", "evil.tar"])
+def test_path_traversal_is_rejected(tmp_path, name):
+    """Members escaping the extraction directory are refused."""
+    files = {"../../evil.txt": "x"}
+    if name.endswith(".zip"):
+        archive = make_zip(tmp_path / name, files)
+    else:
+        archive = make_tar(tmp_path / name, files, "w")
+
+    result = ArchiveParser().parse(archive)
+
+    assert result.metadata["error"] == "security_risk"
+    assert not (tmp_path.parent / "evil.txt").exists()
+
+
+def test_tar_member_names_checked_by_component(tmp_path):
+    """Dots inside a name are fine; absolute names are refused."""
+    parser = ArchiveParser()
+    dest = tmp_path / "out"
+    dest.mkdir()
+
+    ok = make_tar(tmp_path / "ok.tar", {"notes/foo..bar.txt": "x"}, "w")
+    parser._extract_archive(ok, dest)
+    assert (dest / "notes" / "foo..bar.txt").read_text() == "x"
+
+    absolute = make_tar(tmp_path / "abs.tar", {"/etc/evil.txt": "x"}, "w")
+    assert parser.parse(absolute).metadata["error"] == "security_risk"
+
+
+def test_tar_gz_extracts_in_one_streaming_pass(tmp_path, monkeypatch):
+    """.tar.gz is read as a stream: no member listing, no seeking back."""
+    def no_listing(self):
+        raise AssertionError("getmembers() needs a second pass")
+
+    monkeypatch.setattr(tarfile.TarFile, "getmembers", no_listing)
+    archive = make_tar(tmp_path / "bundle.tgz", GENERIC_FILES)
+
+    result = ArchiveParser().parse(archive)
+
+    assert result.metadata["inventory"]["total_files"] == len(GENERIC_FILES)
+    assert len(result.metadata["processed_files"]) == 4
+
+
+def test_tar_over_size_limit_stops_early(tmp_path):
+    """A TAR past the size budget is reported without full extraction."""
+    archive = make_tar(tmp_path / "big.tar.gz", {
+        "a.txt": "a" * 400,
+        "b.txt": "b" * 400,
+        "c.txt": "c" * 400,
+    })
+    parser = ArchiveParser()
+    parser.MAX_EXTRACTED_SIZE = 500
+
+    dest = tmp_path / "out"
+    dest.mkdir()
+    size = parser._extract_archive(archive, dest)
+
+    assert size > parser.MAX_EXTRACTED_SIZE
+    assert (dest / "a.txt").exists()
+    assert not (dest / "b.txt").exists()
+    assert parser.parse(archive).metadata["error"] == "archive_too_large"
+
+
+def test_tar_file_count_limit(tmp_path):
+    """Archives with too many members are refused."""
+    archive = make_tar(tmp_path / "many.tar", {f"f{i}.txt": "x" for i in range(5)}, "w")
+    parser = ArchiveParser()
+    parser.MAX_FILE_COUNT = 3
+
+    assert parser.parse(archive).metadata["error"] == "security_risk"
+
+
+@pytest.mark.parametrize("payload", [b"not gzip at all", "truncated"])
+def test_corrupt_tar_gz_is_reported(tmp_path, payload):
+    """Damaged gzip data surfaces as a corrupted TAR, not a crash."""
+    if payload == "truncated":
+        good = make_tar(tmp_path / "good.tar.gz", {"a.txt": "a" * 5000})
+        payload = good.read_bytes()[:40]
+    archive = tmp_path / "bad.tar.gz"
+    archive.write_bytes(payload)
+
+    result = ArchiveParser().parse(archive)
+
+    assert result.metadata == {"error": "corrupted_archive", "format": "tar"}
+
+
+@pytest.mark.parametrize("tar_format", [tarfile.GNU_FORMAT, tarfile.PAX_FORMAT])
+def test_tar_long_name_headers_are_not_members(tmp_path, tar_format):
+    """Long-name and PAX header records do not count against the limits."""
+    long_name = "deep/" + "n" * 150 + ".txt"
+    archive = tmp_path / "long.tar"
+    with tarfile.open(archive, "w", format=tar_format, pax_headers={"comment": "x"}) as tf:
+        info = tarfile.TarInfo(long_name)
+        info.size = 5
+        tf.addfile(info, io.BytesIO(b"hello"))
+    parser = ArchiveParser()
+    parser.MAX_FILE_COUNT = 1
+    parser.MAX_EXTRACTED_SIZE = 5
+
+    dest = tmp_path / "out"
+    dest.mkdir()
+
+    assert parser._extract_archive(archive, dest) == 5
+    assert (dest / long_name).read_text() == "hello"
+
+
+def test_zip_over_size_limit_extracts_nothing(tmp_path):
+    """A ZIP past the size budget is rejected before any extraction."""
+    archive = make_zip(tmp_path / "big.zip", {"a.txt": "a" * 400, "b.txt": "b" * 400})
+    parser = ArchiveParser()
+    parser.MAX_EXTRACTED_SIZE = 500
+
+    dest = tmp_path / "out"
+    dest.mkdir()
+
+    assert parser._extract_archive(archive, dest) > parser.MAX_EXTRACTED_SIZE
+    assert list(dest.iterdir()) == []
+
+
+@pytest.mark.filterwarnings("ignore:Duplicate name")
+def test_zip_extraction_keeps_last_duplicate(tmp_path):
+    """Parallel ZIP extraction builds the tree a serial one would."""
+    archive = tmp_path / "dupes.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("empty/", "")
+        zf.writestr("a/b/c.txt", "first")
+        zf.writestr("a/d.txt", "d")
+        zf.writestr("a/b/c.txt", "second")
+
+    dest = tmp_path / "out"
+    dest.mkdir()
+    ArchiveParser()._extract_archive(archive, dest)
+
+    assert (dest / "a" / "b" / "c.txt").read_text() == "second"
+    assert (dest / "a" / "d.txt").read_text() == "d"
+    assert (dest / "empty").is_dir()
+
+
+def test_zip_bomb_rejected_from_central_directory(tmp_path):
+    """A ZIP past the compression ratio is refused before extracting anything."""
+    archive = make_zip(tmp_path / "bomb.zip", {f"zero{n}.txt": "\0" * 200_000 for n in range(3)})
+    parser = ArchiveParser()
+
+    dest = tmp_path / "out"
+    dest.mkdir()
+    with pytest.raises(ArchiveSecurityError, match="compression ratio"):
+        parser._extract_archive(archive, dest)
+    assert list(dest.iterdir()) == []
+
+    result = parser.parse(archive)
+    assert result.metadata["error"] == "security_risk"
+
+
+def test_safe_extract_path_uses_normalised_prefix(tmp_path):
+    """Member paths are checked by string prefix against the resolved destination."""
+    parser = ArchiveParser()
+    prefix = parser._base_prefix(tmp_path)
+
+    assert parser._safe_extract_path("a/./b.txt", prefix) == str(tmp_path.resolve() / "a" / "b.txt")
+    assert parser._safe_extract_path("./", prefix) == str(tmp_path.resolve())
+    for name in ("a/../../x.txt", "/etc/passwd", "../" + tmp_path.name + "x/y"):
+        with pytest.raises(ArchiveSecurityError):
+            parser._safe_extract_path(name, prefix)
+
+
+def test_nested_archive_parsed_and_discarded(tmp_path, monkeypatch):
+    """Nested archives are parsed at the next depth and deleted afterwards."""
+    inner = make_zip(tmp_path / "inner.zip", {"deep.txt": "deep content"})
+    outer = make_tar(tmp_path / "outer.tar.gz", {"inner.zip": inner.read_bytes(), "top.txt": "top"})
+
+    unlinked = []
+    original_unlink = os.unlink
+
+    def recording_unlink(path, *args, **kwargs):
+        unlinked.append(os.path.basename(path))
+        return original_unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr(archive_module.os, "unlink", recording_unlink)
+
+    result = ArchiveParser().parse(outer)
+
+    assert "deep content" in result.text
+    assert [f["path"] for f in result.metadata["processed_files"]] == ["inner.zip", "top.txt"]
+    # Removed straight after its own parse, before the outer scratch space
+    assert unlinked.index("inner.zip") < unlinked.index("top.txt")
+
+
+@pytest.mark.parametrize("isal_installed", [False, True])
+def test_zip_members_inflate_with_or_without_isal(tmp_path, monkeypatch, isal_installed):
+    """Deflated members read back intact, through isal_zlib when installed."""
+    content = "lorem ipsum " * 5000
+    archive = make_zip(tmp_path / "bundle.zip", {"a.txt": content})
+
+    # Stand-in isal_zlib recording each swap, so both paths run either way
+    swapped = []
+
+    def decompressobj(wbits):
+        swapped.append(wbits)
+        return zlib.decompressobj(wbits)
+
+    monkeypatch.setattr(archive_module, "HAS_ISAL", isal_installed)
+    monkeypatch.setattr(archive_module, "isal_zlib",
+                        types.SimpleNamespace(decompressobj=decompressobj), raising=False)
+
+    with archive_module._ArchiveZipFile(archive) as zf:
+        with zf.open("a.txt") as fileobj:
+            assert fileobj.read().decode() == content
+
+    assert swapped == ([-15] if isal_installed else [])
+
+
+def test_isal_swap_skips_unknown_zip_internals(tmp_path, monkeypatch):
+    """A ZipExtFile without the expected private attributes is left as-is."""
+    archive = make_zip(tmp_path / "bundle.zip", {"a.txt": "hello"})
+    monkeypatch.setattr(archive_module, "HAS_ISAL", True)
+    monkeypatch.setattr(zipfile.ZipFile, "open", lambda self, *args, **kwargs: io.BytesIO(b"hello"))
+
+    with archive_module._ArchiveZipFile(archive) as zf:
+        assert zf.open("a.txt").read() == b"hello"
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("a.ZIP", "zip"),
+    ("a.tar", "tar"),
+    ("a.Tar.Gz", "tar.gz"),
+    ("a.tgz", "tar.gz"),
+    ("a.gz", None),
+    (".zip", None),
+    ("a.tar.gz.bak", None),
+])
+def test_archive_type_by_suffix(name, expected):
+    """can_parse and type detection share one suffix table."""
+    parser = ArchiveParser()
+    assert parser.can_parse(Path(name)) == (expected is not None)
+    assert parser._detect_archive_type(Path(name)) == (expected or "zip")
+
+
+def test_zip_member_bomb_cannot_hide_behind_average(tmp_path):
+    """One highly compressed member is refused even when the total ratio is fine."""
+    archive = make_zip(tmp_path / "mixed.zip", {
+        "zeros.txt": b"\0" * (2 * 1024 * 1024),
+        "noise.bin": os.urandom(1024 * 1024),
+    })
+
+    result = ArchiveParser().parse(archive)
+
+    assert result.metadata["error"] == "security_risk"
+    assert "zeros.txt" in result.metadata["details"]
+
+
+def test_member_size_limit(tmp_path):
+    """No single ZIP or TAR member may exceed MAX_MEMBER_SIZE."""
+    files = {"small.txt": "x" * 10, "big.txt": os.urandom(600)}
+    parser = ArchiveParser()
+    parser.MAX_MEMBER_SIZE = 500
+
+    for archive in (make_zip(tmp_path / "a.zip", files), make_tar(tmp_path / "a.tgz", files)):
+        result = parser.parse(archive)
+        assert result.metadata["error"] == "security_risk"
+        assert "big.txt" in result.metadata["details"]
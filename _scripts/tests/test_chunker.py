@@ -0,0 +1,120 @@
+"""
+ReCog Chunker Tests - Document Chunking
+
+Tests chunk boundaries, context windows and page tracking.
+
+Run with: pytest tests/test_chunker.py -v
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingestion.chunker import Chunker
+from ingestion.types import ParsedContent
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def make_chunker(**kwargs):
+    """Small chunker so short test strings still split."""
+    kwargs.setdefault("target_tokens", 25)
+    kwargs.setdefault("overlap_tokens", 0)
+    kwargs.setdefault("context_chars", 20)
+    return Chunker(**kwargs)
+
+
+# =============================================================================
+# BREAK POINTS
+# =============================================================================
+
+def test_break_prefers_paragraph():
+    """A paragraph break wins over later sentence breaks."""
+    text = "First para here.\n\nSecond one. More words. Even more"
+    chunker = make_chunker()
+    assert chunker._find_break_point(text, 0, len(text)) == text.index("Second")
+
+
+def test_break_falls_back_to_sentence():
+    """Without a paragraph break the last sentence end is used."""
+    text = "One sentence. Two sentence! Three"
+    chunker = make_chunker()
+    assert chunker._find_break_point(text, 0, len(text)) == text.index("Three")
+
+
+def test_break_falls_back_to_newline_then_word():
+    """Single newlines beat word breaks; words beat a hard cut."""
+    chunker = make_chunker()
+    text = "alpha beta\ngamma delta"
+    assert chunker._find_break_point(text, 0, len(text)) == text.index("gamma")
+    text = "alpha beta gamma"
+    assert chunker._find_break_point(text, 0, len(text)) == text.index("gamma")
+    text = "x" * 40
+    assert chunker._find_break_point(text, 0, 30) == 30
+
+
+# =============================================================================
+# CHUNKING
+# =============================================================================
+
+def test_small_text_is_single_chunk():
+    """Text under the target size comes back whole."""
+    chunks = make_chunker().chunk_text("  short text  ")
+    assert len(chunks) == 1
+    assert chunks[0].content == "short text"
+    assert chunks[0].end_char == len("short text")
+
+
+def test_chunks_cover_text_in_order():
+    """Chunks are contiguous without overlap and carry context."""
+    text = " ".join(f"Sentence number {n}." for n in range(60))
+    chunks = make_chunker().chunk_text(text)
+    assert len(chunks) > 1
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+    for prev, cur in zip(chunks, chunks[1:]):
+        assert cur.start_char == prev.end_char
+        assert cur.preceding_context
+    assert chunks[-1].end_char == len(text)
+    assert chunks[-1].following_context == ""
+
+
+def test_overlap_never_stalls():
+    """Overlap larger than a break step still makes progress."""
+    text = "word " * 400
+    chunks = make_chunker(target_tokens=10, overlap_tokens=9).chunk_text(text)
+    starts = [c.start_char for c in chunks]
+    assert starts == sorted(set(starts))
+    assert chunks[-1].end_char == len(text.strip())
+
+
+# =============================================================================
+# PAGES
+# =============================================================================
+
+def test_parsed_pages_keep_offsets():
+    """Paged content is joined with newlines and tagged with pages."""
+    pages = [f"Page {n} text. " * 8 for n in range(5)]
+    parsed = ParsedContent(text="\n".join(pages), pages=pages)
+    chunks = make_chunker().chunk_parsed_content(parsed)
+    full_text = "\n".join(pages).strip()
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.content == full_text[chunk.start_char:chunk.end_char].strip()
+        assert chunk.page_number is not None
+    page_numbers = [c.page_number for c in chunks]
+    assert page_numbers == sorted(page_numbers)
+
+
+def test_page_number_lookup():
+    """Positions map to the 0-indexed page whose start precedes them."""
+    chunker = make_chunker()
+    boundaries = [0, 10, 25, 40]
+    assert chunker._get_page_number(0, boundaries) == 0
+    assert chunker._get_page_number(9, boundaries) == 0
+    assert chunker._get_page_number(10, boundaries) == 1
+    assert chunker._get_page_number(39, boundaries) == 2
+    assert chunker._get_page_number(500, boundaries) == 3
+    assert chunker._get_page_number(5, None) is None
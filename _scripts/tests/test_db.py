@@ -0,0 +1,448 @@
+"""
+ReCog Database Utility Tests
+
+Tests db.py helpers (initialisation, migrations, connection pool)
+against throwaway databases.
+
+Run with: pytest tests/test_db.py -v
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import db
+from db import (
+    ConnectionPool,
+    apply_migrations,
+    check_database,
+    embed_migrations,
+    immediate_transaction,
+    init_database,
+    _migration_sort_key,
+)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Freshly initialised database in a temp directory."""
+    return init_database(tmp_path / "recog.db")
+
+
+# =============================================================================
+# INITIALISATION TESTS
+# =============================================================================
+
+def test_init_database_enables_wal(db_path):
+    """New databases should be created in WAL mode."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+    finally:
+        conn.close()
+
+
+def test_check_database_reports_journal_mode(db_path):
+    """check_database should surface the journal mode."""
+    result = check_database(db_path)
+
+    assert result["journal_mode"] == "wal"
+    assert "entity_blacklist" in result["tables"]
+
+
+def test_check_database_counts_rows(db_path):
+    """Exact counts should reflect inserted rows."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "INSERT INTO entity_blacklist (entity_type, raw_value, normalised_value, created_at, updated_at) "
+        "VALUES ('person', 'Monday', 'monday', 'now', 'now')"
+    )
+    conn.commit()
+    conn.close()
+
+    result = check_database(db_path)
+
+    assert result["tables"]["entity_blacklist"] == 1
+    assert result["total_rows"] == sum(result["tables"].values())
+    assert not any(name.startswith("sqlite_") for name in result["tables"])
+
+
+def test_check_database_parallel_matches_serial(db_path):
+    """Parallel counting should give the same result as a single query."""
+    parallel = check_database(db_path, workers=4)
+    serial = check_database(db_path, workers=1)
+
+    assert len(parallel["tables"]) >= 16
+    assert parallel == serial
+
+
+def test_check_database_counts_past_compound_select_limit(db_path):
+    """More tables than one compound SELECT allows should still be counted."""
+    conn = sqlite3.connect(str(db_path))
+    for i in range(520):
+        conn.execute(f"CREATE TABLE extra_{i} (x)")
+    conn.execute("INSERT INTO extra_519 VALUES (1)")
+    conn.commit()
+    conn.close()
+
+    result = check_database(db_path, workers=1)
+
+    assert result["tables"]["extra_519"] == 1
+    assert len(result["tables"]) > 520
+
+
+def test_check_database_approximate_uses_stat1(db_path):
+    """Approximate mode should report ANALYZE estimates where present."""
+    conn = sqlite3.connect(str(db_path))
+    conn.executemany(
+        "INSERT INTO entity_blacklist (entity_type, raw_value, normalised_value, created_at, updated_at) "
+        "VALUES ('person', ?, ?, 'now', 'now')",
+        [(f"Word{i}", f"word{i}") for i in range(5)],
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.execute(
+        "INSERT INTO entity_blacklist (entity_type, raw_value, normalised_value, created_at, updated_at) "
+        "VALUES ('person', 'Late', 'late', 'now', 'now')"
+    )
+    conn.commit()
+    conn.close()
+
+    assert check_database(db_path, approximate=True)["tables"]["entity_blacklist"] == 5
+    assert check_database(db_path)["tables"]["entity_blacklist"] == 6
+
+
+def test_migrations_sorted_by_version():
+    """Migrations should run in version order, not filename order."""
+    names = [
+        "migration_v0_10_extraction_runs.sql",
+        "migration_v0_2_synth.sql",
+        "migration_v0_5_1_timeline_fix.sql",
+        "migration_v0_5_cases.sql",
+        "migration_v0_2_blacklist.sql",
+    ]
+    ordered = sorted(names, key=_migration_sort_key)
+
+    assert ordered == [
+        "migration_v0_2_blacklist.sql",
+        "migration_v0_2_synth.sql",
+        "migration_v0_5_cases.sql",
+        "migration_v0_5_1_timeline_fix.sql",
+        "migration_v0_10_extraction_runs.sql",
+    ]
+
+
+def test_migrations_are_recorded_once(db_path):
+    """A second run against an up-to-date database should apply nothing."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        recorded = {row[0] for row in conn.execute("SELECT name FROM schema_migrations")}
+    finally:
+        conn.close()
+
+    assert "migration_v0_2_blacklist.sql" in recorded
+    assert apply_migrations(db_path) == []
+
+
+def test_applied_migrations_are_not_read(db_path, monkeypatch):
+    """Up-to-date databases should not open any migration file."""
+    def fail_read(self, *args, **kwargs):
+        raise AssertionError(f"read {self.name}")
+
+    monkeypatch.setattr(Path, "read_text", fail_read)
+
+    assert apply_migrations(db_path) == []
+
+
+def test_failed_migration_rolls_back(db_path, tmp_path, monkeypatch):
+    """A failing migration should leave earlier pending migrations unapplied."""
+    migrations_dir = tmp_path / "migrations"
+    migrations_dir.mkdir()
+    (migrations_dir / "migration_v9_0_good.sql").write_text(
+        "CREATE TABLE rollback_probe (id INTEGER);", encoding="utf-8"
+    )
+    (migrations_dir / "migration_v9_1_bad.sql").write_text(
+        "ALTER TABLE missing_table ADD COLUMN x TEXT;", encoding="utf-8"
+    )
+    monkeypatch.setattr(db, "get_migrations_dir", lambda: migrations_dir)
+
+    with pytest.raises(sqlite3.OperationalError):
+        apply_migrations(db_path)
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        recorded = {row[0] for row in conn.execute("SELECT name FROM schema_migrations")}
+    finally:
+        conn.close()
+
+    assert "rollback_probe" not in tables
+    assert "migration_v9_0_good.sql" not in recorded
+
+
+def test_embedded_migrations_replace_sql_files(tmp_path, monkeypatch):
+    """Once embedded, migrations should apply without the .sql files."""
+    migrations_dir = tmp_path / "migrations"
+    migrations_dir.mkdir()
+    (migrations_dir / "migration_v9_0_probe.sql").write_text(
+        "CREATE TABLE embed_probe (id INTEGER);", encoding="utf-8"
+    )
+    monkeypatch.setattr(db, "get_migrations_dir", lambda: migrations_dir)
+
+    embed_migrations()
+    (migrations_dir / "migration_v9_0_probe.sql").unlink()
+
+    db_path = tmp_path / "probe.db"
+    assert apply_migrations(db_path) == ["migration_v9_0_probe.sql"]
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    finally:
+        conn.close()
+    assert "embed_probe" in tables
+
+
+def test_legacy_database_is_adopted(db_path):
+    """Databases migrated before tracking should be recorded without errors."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("DROP TABLE schema_migrations")
+    conn.commit()
+    conn.close()
+
+    apply_migrations(db_path)
+
+    assert apply_migrations(db_path) == []
+
+
+def test_legacy_database_surfaces_failing_new_migration(db_path, tmp_path, monkeypatch):
+    """Migrations newer than tracking should run atomically on legacy databases."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("DROP TABLE schema_migrations")
+    conn.commit()
+    conn.close()
+
+    migrations_dir = tmp_path / "migrations"
+    migrations_dir.mkdir()
+    (migrations_dir / "migration_v0_2_blacklist.sql").write_bytes(
+        (db.get_migrations_dir() / "migration_v0_2_blacklist.sql").read_bytes()
+    )
+    (migrations_dir / "migration_v9_0_bad.sql").write_text(
+        "CREATE TABLE half_applied (a); INSERT INTO missing_table VALUES (1);", encoding="utf-8"
+    )
+    monkeypatch.setattr(db, "get_migrations_dir", lambda: migrations_dir)
+
+    for _ in range(2):
+        with pytest.raises(sqlite3.OperationalError):
+            apply_migrations(db_path)
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        recorded = {row[0] for row in conn.execute("SELECT name FROM schema_migrations")}
+    finally:
+        conn.close()
+
+    assert "half_applied" not in tables
+    assert recorded == {"migration_v0_2_blacklist.sql"}
+
+
+def test_blacklist_listing_uses_covering_index(db_path):
+    """Blacklist pages should be served from the keyset index without sorting."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        plan = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT id, entity_type, raw_value, normalised_value,
+                   rejection_reason, rejected_by, rejection_count,
+                   created_at, updated_at
+            FROM entity_blacklist
+            WHERE entity_type = ?
+              AND (rejection_count, created_at, id) < (?, ?, ?)
+            ORDER BY rejection_count DESC, created_at DESC, id DESC
+            LIMIT ?
+        """, ("person", 5, "now", 10, 10)).fetchall()
+        indexes = {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+                "AND tbl_name = 'entity_blacklist'"
+            )
+        }
+    finally:
+        conn.close()
+
+    # Built once, on the rebuilt table; no superseded listing indexes
+    assert indexes == {"idx_blacklist_keyset", "idx_blacklist_normalised"}
+
+    detail = " ".join(row[3] for row in plan)
+    assert "COVERING INDEX idx_blacklist_keyset" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_ranked_insights_and_patterns_skip_sort(db_path):
+    """Report ordering by significance/strength should walk an index."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        for query in (
+            "SELECT * FROM insights ORDER BY significance DESC",
+            "SELECT * FROM patterns ORDER BY strength DESC",
+        ):
+            plan = conn.execute("EXPLAIN QUERY PLAN " + query).fetchall()
+            assert "TEMP B-TREE" not in " ".join(row[3] for row in plan)
+    finally:
+        conn.close()
+
+
+def test_blacklist_is_without_rowid_with_stable_ids(db_path):
+    """entity_blacklist should be keyed by value but still hand out ids."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'entity_blacklist'"
+        ).fetchone()[0]
+        assert "WITHOUT ROWID" in sql
+
+        for value in ("monday", "research", "monday"):
+            conn.execute("""
+                INSERT INTO entity_blacklist (entity_type, raw_value, normalised_value, created_at, updated_at)
+                VALUES ('person', ?, ?, 'now', 'now')
+                ON CONFLICT(entity_type, normalised_value) DO UPDATE SET
+                    rejection_count = rejection_count + 1
+            """, (value, value))
+        conn.commit()
+
+        rows = conn.execute(
+            "SELECT normalised_value, id, rejection_count FROM entity_blacklist ORDER BY id"
+        ).fetchall()
+        assert rows == [("monday", 1, 2), ("research", 2, 1)]
+
+        # Ids of deleted entries are never handed out again
+        conn.execute("DELETE FROM entity_blacklist WHERE id = 2")
+        conn.execute("""
+            INSERT INTO entity_blacklist (entity_type, raw_value, normalised_value, created_at, updated_at)
+            VALUES ('person', 'agenda', 'agenda', 'now', 'now')
+        """)
+        assert conn.execute(
+            "SELECT id FROM entity_blacklist WHERE normalised_value = 'agenda'"
+        ).fetchone()[0] == 3
+    finally:
+        conn.close()
+
+
+def test_blacklist_rebuild_continues_autoincrement_ids(tmp_path):
+    """The rebuilt table continues from the old AUTOINCREMENT counter."""
+    conn = sqlite3.connect(str(tmp_path / "old.db"))
+    try:
+        conn.executescript("""
+            CREATE TABLE entity_blacklist (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                entity_type TEXT NOT NULL,
+                raw_value TEXT NOT NULL,
+                normalised_value TEXT NOT NULL,
+                rejection_reason TEXT,
+                rejected_by TEXT DEFAULT 'user',
+                source_context TEXT,
+                rejection_count INTEGER DEFAULT 1,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                UNIQUE(entity_type, normalised_value)
+            );
+            INSERT INTO entity_blacklist (entity_type, raw_value, normalised_value, created_at, updated_at)
+            VALUES ('person', 'a', 'a', 'now', 'now'), ('person', 'b', 'b', 'now', 'now'),
+                   ('person', 'c', 'c', 'now', 'now');
+            DELETE FROM entity_blacklist WHERE id = 3;
+        """)
+        sql = (db.get_migrations_dir() / "migration_v0_12_blacklist_without_rowid.sql").read_text(encoding="utf-8")
+        conn.executescript(sql)
+        conn.execute("""
+            INSERT INTO entity_blacklist (entity_type, raw_value, normalised_value, created_at, updated_at)
+            VALUES ('person', 'd', 'd', 'now', 'now')
+        """)
+
+        rows = conn.execute("SELECT normalised_value, id FROM entity_blacklist ORDER BY id").fetchall()
+        assert rows == [("a", 1), ("b", 2), ("d", 4)]
+    finally:
+        conn.close()
+
+
+# =============================================================================
+# CONNECTION POOL TESTS
+# =============================================================================
+
+def test_pool_reuses_connections(db_path):
+    """Borrowed connections should go back into the pool, not be closed."""
+    pool = ConnectionPool(db_path, size=1)
+    try:
+        with pool.borrow() as first:
+            first.execute("SELECT 1")
+        with pool.borrow() as second:
+            assert second is first
+            assert second.execute("SELECT 1").fetchone()[0] == 1
+    finally:
+        pool.close()
+
+
+def test_pool_connections_use_row_factory(db_path):
+    """Pooled connections should return sqlite3.Row objects."""
+    pool = ConnectionPool(db_path, size=1)
+    try:
+        with pool.borrow() as conn:
+            row = conn.execute("SELECT 1 AS one").fetchone()
+            assert isinstance(row, sqlite3.Row)
+            assert row["one"] == 1
+    finally:
+        pool.close()
+
+
+def test_pool_rolls_back_abandoned_transaction(db_path):
+    """An uncommitted write should not leak to the next borrower."""
+    pool = ConnectionPool(db_path, size=1)
+    try:
+        with pytest.raises(RuntimeError):
+            with pool.borrow() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT INTO entity_blacklist (entity_type, raw_value, normalised_value, created_at, updated_at) "
+                    "VALUES ('person', 'Monday', 'monday', 'now', 'now')"
+                )
+                raise RuntimeError("request failed")
+
+        with pool.borrow() as conn:
+            assert not conn.in_transaction
+            count = conn.execute("SELECT COUNT(*) FROM entity_blacklist").fetchone()[0]
+            assert count == 0
+    finally:
+        pool.close()
+
+
+def test_immediate_transaction_commits_and_rolls_back(db_path):
+    """Writes should commit on success and roll back when the block raises."""
+    pool = ConnectionPool(db_path, size=1)
+    insert = (
+        "INSERT INTO entity_blacklist (entity_type, raw_value, normalised_value, created_at, updated_at) "
+        "VALUES ('person', ?, ?, 'now', 'now')"
+    )
+    try:
+        with pool.borrow() as conn:
+            with immediate_transaction(conn):
+                conn.execute(insert, ("Monday", "monday"))
+
+            with pytest.raises(RuntimeError):
+                with immediate_transaction(conn):
+                    conn.execute(insert, ("Research", "research"))
+                    raise RuntimeError("request failed")
+
+            values = [row[0] for row in conn.execute("SELECT normalised_value FROM entity_blacklist")]
+            assert values == ["monday"]
+            assert not conn.in_transaction
+    finally:
+        pool.close()
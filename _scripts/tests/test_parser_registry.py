@@ -25,6 +25,7 @@ from recog_engine.parsers.registry import (
     LegacyParserWrapper,
     register_parser,
     get_registry,
+    _register_builtin_parsers,
 )
 
 
@@ -858,3 +859,19 @@ class TestRegistryIntegration:
 
             parser = registry.get_parser(generic_zip)
             assert isinstance(parser, GenericZipParser)
+
+    def test_builtin_extensions_match_parsers(self):
+        """Built-in parsers register exactly the extensions they declare."""
+        registry = ParserRegistry()
+        _register_builtin_parsers(registry)
+
+        registered = {}
+        for ext, wrapper in registry._extension_parsers.items():
+            registered.setdefault(type(wrapper._legacy).__name__, []).append(ext)
+
+        assert registered["ICSParser"] == [".ics", ".ical"]
+        assert "NotionParser" not in registered
+        assert type(registry._extension_parsers[".md"]._legacy).__name__ == "MarkdownParser"
+        for wrapper in registry._extension_parsers.values():
+            exts = registered[type(wrapper._legacy).__name__]
+            assert exts == wrapper._legacy.get_extensions()
@@ -6,11 +6,14 @@ Tests all document parsers with sample content.
 Run with: pytest tests/test_parsers.py -v
 """
 
+import subprocess
 import sys
 import tempfile
 import json
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ingestion.parsers import (
@@ -110,6 +113,37 @@ SAMPLE_SMS_XML = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
 </smses>
 """
 
+SAMPLE_ICS = """BEGIN:VCALENDAR
+VERSION:2.0
+X-WR-TIMEZONE:Pacific Standard Time
+BEGIN:VEVENT
+UID:standup@example.com
+SUMMARY:Standup
+DTSTART:20240305T090000Z
+DTEND:20240305T091500Z
+LOCATION:Room 1
+ATTENDEE;CN=Sarah:mailto:sarah@example.com
+ATTENDEE:MAILTO:john@example.com
+ORGANIZER;CN=John:mailto:john@example.com
+RRULE:FREQ=WEEKLY;COUNT=4
+END:VEVENT
+BEGIN:VEVENT
+UID:holiday@example.com
+SUMMARY:Holiday
+DTSTART;VALUE=DATE:20240101
+STATUS:CANCELLED
+END:VEVENT
+BEGIN:VEVENT
+UID:review@example.com
+SUMMARY:Review
+DTSTART;TZID=Europe/Berlin:20240610T140000
+DURATION:PT1H
+LOCATION:Room 2
+STATUS:TENTATIVE
+END:VEVENT
+END:VCALENDAR
+"""
+
 
 # =============================================================================
 # HELPER FUNCTIONS
@@ -141,6 +175,128 @@ def test_get_all_parsers():
     assert all(hasattr(p, 'parse') for p in parsers), "All should have parse method"
 
 
+def test_parser_instances_are_shared():
+    """Repeat lookups reuse one instance per parser instead of rebuilding it."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+        f.write("plain words")
+        temp_file = Path(f.name)
+    try:
+        assert get_parser(temp_file) is get_parser(temp_file)
+    finally:
+        temp_file.unlink()
+
+    first, second = get_all_parsers(), get_all_parsers()
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_parser_classes_import_lazily():
+    """Importing the package should not import parser modules."""
+    code = (
+        "import sys, ingestion.parsers as p; "
+        "assert 'ingestion.parsers.pdf' not in sys.modules; "
+        "assert p.PDFParser.__name__ == 'PDFParser'; "
+        "assert 'ingestion.parsers.pdf' in sys.modules"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_parsers_take_extensions_from_registry():
+    """Registered parsers get EXTENSIONS from the registry, not their own copy."""
+    from ingestion.parsers.base import _PARSER_REGISTRY, _get_parser_class
+
+    for name, (_, extensions) in _PARSER_REGISTRY.items():
+        parser_class = _get_parser_class(name)
+        assert "get_extensions" not in vars(parser_class), name
+        assert parser_class.EXTENSIONS is extensions, name
+        assert parser_class().get_extensions() == list(extensions), name
+
+
+def test_get_parser_for_calendar_and_archive():
+    """Calendar and archive suffixes reach their parsers, not plaintext."""
+    from ingestion.parsers.archive import ArchiveParser
+    from ingestion.parsers.calendar import ICSParser
+
+    assert isinstance(get_parser(Path("x.ics")), ICSParser)
+    assert isinstance(get_parser(Path("x.zip")), ArchiveParser)
+
+
+def test_suffix_index_matches_full_probe(tmp_path):
+    """Indexed dispatch picks the same parser as probing every parser."""
+    samples = {
+        "notes.md": SAMPLE_MARKDOWN,
+        "notes.txt": SAMPLE_PLAINTEXT,
+        "README": SAMPLE_PLAINTEXT,
+        "chat.json": json.dumps([{"role": "user", "content": "hi"}]),
+        "backup.tar.gz": "not really gzip",
+        "bundle.zip": "",
+        "table.csv": "a,b\n1,2\n",
+        "picture.png": "",
+        "mystery.xyz": "",
+    }
+    paths = [tmp_path]
+    for name, content in samples.items():
+        paths.append(tmp_path / name)
+        paths[-1].write_text(content, encoding="utf-8")
+    for folder in ("folder.zip", "Export-1234.xyz"):
+        (tmp_path / folder).mkdir()
+        paths.append(tmp_path / folder)
+
+    for path in paths:
+        expected = next(
+            (p for p in get_all_parsers() if p.can_parse(path)), None
+        )
+        assert get_parser(path) is expected, path.name
+        assert get_parser(path) is expected, path.name  # Cached by suffix
+
+
+def test_unknown_suffix_file_skips_probing(tmp_path, monkeypatch):
+    """A file with an unregistered suffix is rejected without any can_parse()."""
+    from ingestion.parsers import base
+
+    path = tmp_path / "mystery.xyz"
+    path.write_bytes(b"PK\x03\x04")
+    monkeypatch.setattr(base, "_get_parser_instance", lambda name: pytest.fail(name))
+    assert get_parser(path) is None
+    assert get_parser(tmp_path / "missing.xyz") is None
+
+
+def test_suffix_only_parsers_are_cached(tmp_path, monkeypatch):
+    """Files whose parser follows from the suffix are probed once per suffix."""
+    from ingestion.parsers import base
+
+    monkeypatch.setattr(base, "_FILE_PARSER_CACHE", {})
+    first = get_parser(tmp_path / "a.csv")
+    assert first is not None
+    get_parser(tmp_path / "c.json")
+
+    monkeypatch.setattr(base, "_get_parser_instance", lambda name: pytest.fail(name))
+    assert get_parser(tmp_path / "b.CSV") is first
+    assert ".json" not in base._FILE_PARSER_CACHE
+
+
+def test_ics_can_parse_sniffs_header_bytes(tmp_path):
+    """ICS detection matches the raw marker and ignores other suffixes."""
+    from ingestion.parsers.calendar import ICSParser
+
+    parser = ICSParser()
+    calendar = tmp_path / "cal.ics"
+    calendar.write_bytes(b"\xef\xbb\xbfBEGIN:VCALENDAR\r\nVERSION:2.0\r\n")
+    other = tmp_path / "notes.ics"
+    other.write_bytes(b"\xff\xfe not a calendar")
+    renamed = tmp_path / "cal.txt"
+    renamed.write_bytes(calendar.read_bytes())
+
+    assert parser.can_parse(calendar)
+    assert not parser.can_parse(other)
+    assert not parser.can_parse(renamed)
+
+
 def test_get_supported_extensions():
     """Should return list of supported file extensions."""
     extensions = get_supported_extensions()
@@ -150,6 +306,10 @@ def test_get_supported_extensions():
     assert ".json" in extensions, "Should support .json"
     assert ".pdf" in extensions, "Should support .pdf"
 
+    # Cached, but callers still get their own list to mutate
+    extensions.append(".bogus")
+    assert ".bogus" not in get_supported_extensions()
+
 
 def test_get_parser_for_markdown():
     """Should return MarkdownParser for .md files."""
@@ -355,6 +515,135 @@ def test_json_parser_rejects_non_chat():
         temp_file.unlink()
 
 
+# =============================================================================
+# CALENDAR PARSER TESTS
+# =============================================================================
+
+def test_calendar_parser_events_and_metadata():
+    """ICSParser should list events in order and summarise them."""
+    pytest.importorskip("icalendar")
+    from ingestion.parsers.calendar import ICSParser
+
+    temp_file = create_temp_file(SAMPLE_ICS, ".ics")
+    try:
+        result = ICSParser().parse(temp_file)
+    finally:
+        temp_file.unlink()
+
+    assert result.text.index("Holiday") < result.text.index("Standup") < result.text.index("Review")
+    assert "Date: 2024-01-01 (All Day)" in result.text
+    assert "Date: 2024-03-05 09:00 UTC - 09:15" in result.text
+    assert "Attendees: sarah@example.com, john@example.com" in result.text
+
+    metadata = result.metadata
+    assert metadata["event_count"] == 3
+    assert metadata["calendar_timezone"] == "America/Los_Angeles"
+    assert metadata["earliest_event"] == "2024-01-01T00:00:00+00:00"
+    assert metadata["latest_event"] == "2024-06-10T12:00:00+00:00"
+    assert metadata["recurring_events"] == 1
+    assert metadata["recurring_by_frequency"] == {"WEEKLY": 1}
+    assert metadata["top_locations"] == ["Room 1", "Room 2"]
+    assert metadata["unique_attendees"] == 2
+    assert metadata["all_day_events"] == 1
+    assert metadata["cancelled_events"] == 1
+    assert metadata["events_by_status"] == {"CANCELLED": 1, "CONFIRMED": 1, "TENTATIVE": 1}
+
+
+def test_calendar_events_without_start_sort_first():
+    """Events with no DTSTART are listed before dated ones."""
+    pytest.importorskip("icalendar")
+    from ingestion.parsers.calendar import ICSParser
+
+    content = SAMPLE_ICS.replace(
+        "END:VCALENDAR", "BEGIN:VEVENT\nSUMMARY:Someday\nEND:VEVENT\nEND:VCALENDAR"
+    )
+    temp_file = create_temp_file(content, ".ics")
+    try:
+        result = ICSParser().parse(temp_file)
+    finally:
+        temp_file.unlink()
+
+    assert result.text.index("Someday") < result.text.index("Holiday")
+    assert result.metadata["event_count"] == 4
+
+
+def test_calendar_fast_path_matches_icalendar(monkeypatch):
+    """The line tokenizer should give the same result as icalendar."""
+    pytest.importorskip("icalendar")
+    from ingestion.parsers.calendar import ICSParser
+
+    temp_file = create_temp_file(SAMPLE_ICS, ".ics")
+    try:
+        parser = ICSParser()
+        assert parser._parse_fast(temp_file.read_bytes()) is not None
+        fast = parser.parse(temp_file)
+        monkeypatch.setattr(ICSParser, "_parse_fast", lambda self, data: None)
+        full = parser.parse(temp_file)
+    finally:
+        temp_file.unlink()
+
+    assert fast.text == full.text
+    assert fast.metadata == full.metadata
+
+
+def test_calendar_fast_path_defers_to_icalendar():
+    """Values the tokenizer cannot vouch for go through icalendar."""
+    pytest.importorskip("icalendar")
+    from ingestion.parsers.calendar import ICSParser
+
+    content = SAMPLE_ICS.replace("TZID=Europe/Berlin", "TZID=W. Europe Standard Time")
+    temp_file = create_temp_file(content, ".ics")
+    try:
+        parser = ICSParser()
+        assert parser._parse_fast(temp_file.read_bytes()) is None
+        result = parser.parse(temp_file)
+    finally:
+        temp_file.unlink()
+
+    assert result.metadata["event_count"] == 3
+    assert "Review" in result.text
+
+
+def test_calendar_long_description_is_truncated():
+    """Escaped descriptions are cut to the same text on both paths."""
+    icalendar = pytest.importorskip("icalendar")
+    from ingestion.parsers.calendar import ICSParser
+
+    data = SAMPLE_ICS.replace(
+        "SUMMARY:Review", "SUMMARY:Review\nDESCRIPTION:" + "a\\,b\\n" * 400
+    ).encode("utf-8")
+    parser = ICSParser()
+    _, fast_events = parser._parse_fast(data)
+    full_events = [
+        parser._extract_event(component)
+        for component in icalendar.Calendar.from_ical(data).walk("VEVENT")
+    ]
+
+    expected = ("a,b\n" * 400)[:ICSParser.DESCRIPTION_MAX_CHARS]
+    assert [e.get("description") for e in fast_events] == [None, None, expected]
+    assert fast_events == full_events
+
+
+def test_calendar_memory_mapped_read_matches(monkeypatch):
+    """Large calendars are memory-mapped with the same result."""
+    pytest.importorskip("icalendar")
+    from ingestion.parsers.calendar import ICSParser
+
+    folded = SAMPLE_ICS.replace("SUMMARY:Review", "SUMMARY:Re\n view")
+    temp_file = create_temp_file(folded.replace("\n", "\r\n"), ".ics")
+    try:
+        parser = ICSParser()
+        read = parser.parse(temp_file)
+        monkeypatch.setattr(ICSParser, "MMAP_MIN_SIZE", 0)
+        mapped = parser.parse(temp_file)
+    finally:
+        temp_file.unlink()
+
+    assert "Review" in mapped.text
+    assert mapped.text == read.text
+    assert mapped.metadata == read.metadata
+
+
 # =============================================================================
 # PARSED CONTENT TESTS
 # =============================================================================
@@ -413,6 +702,22 @@ def test_parser_handles_binary_in_text():
         temp_file.unlink()
 
 
+def test_ingest_batch_keeps_order_and_errors():
+    """Batch ingestion returns documents in input order plus errors."""
+    from ingestion.universal import UniversalDetector
+
+    temp_files = [create_temp_file(f"Note number {n}", ".txt") for n in range(4)]
+    missing = temp_files[0].with_name("missing-note.txt")
+    try:
+        documents, errors = UniversalDetector().ingest_batch(temp_files[:2] + [missing] + temp_files[2:])
+    finally:
+        for temp_file in temp_files:
+            temp_file.unlink()
+
+    assert [doc.source_ref for doc in documents] == [str(f) for f in temp_files]
+    assert [error["path"] for error in errors] == [str(missing)]
+
+
 # =============================================================================
 # STANDALONE RUNNER
 # =============================================================================